@@ -0,0 +1 @@
+"""Provisioning and reset throughput benchmarks; run `python -m benchmarks --help`."""
@@ -0,0 +1,178 @@
+"""Run the benchmarks and write comparable JSON results.
+
+    python -m benchmarks --pg-bin /usr/lib/postgresql/16/bin --output results.json
+    python -m benchmarks --host localhost --port 5432 --compare baseline.json
+
+Docker benchmarks run against the fake Engine API of the tests (no daemon, no Docker Hub),
+and the PostgreSQL ones against either a throwaway `LocalPostgresCluster` (`--pg-bin`) or a
+running server.
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import sys
+from collections.abc import Iterator
+from importlib import metadata
+from typing import Any
+
+import psycopg
+from tests.fake_docker_engine import FakeDockerEngine, serve
+
+from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.postgres.local_postgres_cluster import LocalPostgresCluster
+from testing_containers.postgres.postgres_manager import PostgresManager
+
+from . import suite
+
+# Compared across runs; lower is better for both
+_METRICS = ("median_ms", "wall_s")
+
+
+def _parse_args(argv: list[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    target = parser.add_argument_group("PostgreSQL server")
+    target.add_argument("--pg-bin", help="Directory with initdb/pg_ctl: run a throwaway cluster")
+    target.add_argument("--host", default="localhost")
+    target.add_argument("--port", type=int, default=5432)
+    target.add_argument("--user", default="postgres")
+    target.add_argument("--password", default="")
+    parser.add_argument("--repeat", type=int, default=20, help="Samples per benchmark")
+    parser.add_argument("--tables", type=int, default=50, help="Tables in the migrated schema")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent worker processes")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to each fake Docker API call"
+    )
+    parser.add_argument("--skip-docker", action="store_true")
+    parser.add_argument("--skip-postgres", action="store_true")
+    parser.add_argument("--output", help="Write the results as JSON to this file")
+    parser.add_argument("--compare", help="A previous JSON result to compare against")
+    return parser.parse_args(argv)
+
+
+@contextlib.contextmanager
+def _postgres(args: argparse.Namespace) -> Iterator[DBConfig]:
+    if args.pg_bin:
+        cluster = LocalPostgresCluster(ContainerOptions(pg_bin_dir=args.pg_bin))
+        with contextlib.redirect_stdout(io.StringIO()):
+            cluster.ensure_postgres_is_ready()
+        try:
+            yield cluster.master_db
+        finally:
+            cluster.stop_container()
+    else:
+        yield DBConfig(
+            host=args.host,
+            name="postgres",
+            user=args.user,
+            password=args.password,
+            port=args.port,
+        )
+
+
+def _server_version(master_db: DBConfig) -> str:
+    with psycopg.connect(
+        dbname=master_db.name,
+        user=master_db.user,
+        password=master_db.password,
+        host=master_db.host,
+        port=master_db.port,
+    ) as conn:
+        row = conn.execute("SHOW server_version").fetchone()
+        return str(row[0]) if row else "unknown"
+
+
+def _run(name: str, results: dict[str, Any], benchmark: Any, *args: Any) -> None:
+    print(f"⏱️  {name} ...", end=" ", flush=True, file=sys.stderr)
+    # The library reports its progress with print(); keep it out of the way
+    with contextlib.redirect_stdout(io.StringIO()):
+        results[name] = benchmark(*args)
+    result = results[name]
+    summary = (
+        f"{result['median_ms']:.2f} ms" if "median_ms" in result else f"{result['wall_s']:.2f} s"
+    )
+    print(summary, file=sys.stderr)
+
+
+def _run_docker(args: argparse.Namespace, results: dict[str, Any]) -> None:
+    with serve(FakeDockerEngine(latency=args.latency)) as engine:
+        _run("docker.cold_start", results, suite.docker_cold_start, engine.socket_path, args.repeat)
+        _run("docker.warm_reuse", results, suite.docker_warm_reuse, engine.socket_path, args.repeat)
+
+
+def _run_postgres(args: argparse.Namespace, master_db: DBConfig, results: dict[str, Any]) -> None:
+    _run("readiness.probe", results, suite.readiness_probe, master_db, args.repeat)
+    _run("readiness.wait", results, suite.readiness_wait, master_db, args.repeat)
+    manager = PostgresManager(master_db, name="bench_testdb")
+    try:
+        _run("postgres.create_drop", results, suite.create_drop, manager, args.repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.setup_template(suite.schema(args.tables))
+        _run("postgres.clone", results, suite.clone, manager, args.repeat)
+        _run("postgres.reset", results, suite.reset, manager, args.repeat, args.tables, False)
+        _run(
+            "postgres.reset_tracked", results, suite.reset, manager, args.repeat, args.tables, True
+        )
+    finally:
+        with contextlib.redirect_stdout(io.StringIO()):
+            manager.destroy()
+            manager.close()
+    _run(
+        "postgres.concurrent_workers",
+        results,
+        suite.concurrent_workers,
+        master_db,
+        args.workers,
+        args.tables,
+        args.repeat,
+    )
+
+
+def _compare(results: dict[str, Any], baseline_path: str) -> None:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\n📊 Compared with {baseline_path} (ratio < 1 is faster):", file=sys.stderr)
+    for name, result in results.items():
+        for metric in _METRICS:
+            before = baseline.get(name, {}).get(metric)
+            if metric in result and before:
+                ratio = result[metric] / before
+                print(
+                    f"   {name:<30} {before:>10.2f} → {result[metric]:>10.2f}  x{ratio:.2f}",
+                    file=sys.stderr,
+                )
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _parse_args(argv)
+    results: dict[str, Any] = {}
+    meta: dict[str, Any] = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "testing_containers": metadata.version("testing-containers"),
+        "args": {k: v for k, v in vars(args).items() if k not in ("password", "output", "compare")},
+    }
+    if not args.skip_docker:
+        _run_docker(args, results)
+    if not args.skip_postgres:
+        with _postgres(args) as master_db:
+            meta["postgres"] = _server_version(master_db)
+            _run_postgres(args, master_db, results)
+
+    report = json.dumps({"meta": meta, "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(report + "\n")
+        print(f"✅ Results written to {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
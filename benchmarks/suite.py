@@ -0,0 +1,209 @@
+"""The benchmarks themselves. Each one returns a summary of its samples."""
+
+import io
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import psycopg
+
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.postgres.postgres_docker_container import PostgresDockerContainer
+from testing_containers.postgres.postgres_manager import PostgresManager
+from testing_containers.readiness import is_postgres_accepting
+
+Result = dict[str, Any]
+
+
+def summarize(samples: list[float]) -> Result:
+    """Latency (ms) percentiles and the matching throughput (ops/s) of timed samples."""
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        "samples": len(ordered),
+        "median_ms": median * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "min_ms": ordered[0] * 1000,
+        "ops_per_s": 1 / median if median else None,
+    }
+
+
+def measure(
+    operation: Callable[[int], object],
+    repeat: int,
+    before: Callable[[int], None] | None = None,
+    after: Callable[[int], object] | None = None,
+) -> Result:
+    """Time `operation(i)` `repeat` times; `before`/`after` run untimed around it."""
+    samples = []
+    for i in range(repeat):
+        if before is not None:
+            before(i)
+        started = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - started)
+        if after is not None:
+            after(i)
+    return summarize(samples)
+
+
+# --- Docker (against the fake Engine API) -----------------------------------
+
+
+def _container(socket_path: str, name: str) -> DockerContainer:
+    return DockerContainer(
+        image="postgres:16.3",
+        container_name=name,
+        expose_ports=["5433:5432"],
+        env={"POSTGRES_PASSWORD": "password"},
+        transport="api",
+        socket_path=socket_path,
+    )
+
+
+def docker_cold_start(socket_path: str, repeat: int) -> Result:
+    """Create and start a container that does not exist yet (image already pulled)."""
+    _container(socket_path, "bench-pull").start_container()  # pulls the image
+    _container(socket_path, "bench-pull").remove_container()
+    return measure(
+        lambda i: _container(socket_path, f"bench-cold-{i}").start_container(),
+        repeat,
+        after=lambda i: _container(socket_path, f"bench-cold-{i}").remove_container(),
+    )
+
+
+def docker_warm_reuse(socket_path: str, repeat: int) -> Result:
+    """start_container() on an already running container, from a fresh client."""
+    _container(socket_path, "bench-warm").start_container()
+    result = measure(lambda i: _container(socket_path, "bench-warm").start_container(), repeat)
+    _container(socket_path, "bench-warm").remove_container()
+    return result
+
+
+# --- PostgreSQL ------------------------------------------------------------------
+
+
+def readiness_probe(master_db: DBConfig, repeat: int) -> Result:
+    """One host-side readiness probe (startup-message handshake) of a running server."""
+    return measure(
+        lambda i: is_postgres_accepting(master_db.host, master_db.port, user=master_db.user),
+        repeat,
+    )
+
+
+def readiness_wait(master_db: DBConfig, repeat: int) -> Result:
+    """PostgresDockerContainer.is_postgres_ready() against a server that is already up."""
+    container = PostgresDockerContainer(options=ContainerOptions(), port=master_db.port)
+    container.master_db = master_db
+    return measure(lambda i: container.is_postgres_ready(), repeat)
+
+
+def create_drop(manager: PostgresManager, repeat: int) -> Result:
+    """CREATE DATABASE + DROP DATABASE of an empty database."""
+
+    def _operation(i: int) -> None:
+        manager.create_database(f"bench_db_{i}")
+        manager.drop_database(f"bench_db_{i}")
+
+    return measure(_operation, repeat)
+
+
+def schema(tables: int) -> Callable[[DBConfig], None]:
+    """A migration creating `tables` tables with serial keys, in parent/child pairs.
+
+    Pairs rather than one long chain of foreign keys: TRUNCATE ... CASCADE on the head of
+    a chain would empty every table, so untouched tables could never be skipped.
+    """
+
+    def migrate(db: DBConfig) -> None:
+        statements = [
+            f"CREATE TABLE t{n} (id serial PRIMARY KEY, v text"
+            + (f", parent int REFERENCES t{n - 1})" if n % 2 else ")")
+            for n in range(tables)
+        ]
+        with psycopg.connect(
+            dbname=db.name,
+            user=db.user,
+            password=db.password,
+            host=db.host,
+            port=db.port,
+            autocommit=True,
+        ) as conn:
+            conn.execute("; ".join(statements))
+
+    return migrate
+
+
+def clone(manager: PostgresManager, repeat: int) -> Result:
+    """clone_database() from the migrated template."""
+    return measure(
+        lambda i: manager.clone_database(f"bench_clone_{i}"),
+        repeat,
+        after=lambda i: manager.drop_database(f"bench_clone_{i}"),
+    )
+
+
+def _dirty(db: DBConfig, tables: int) -> None:
+    with psycopg.connect(
+        dbname=db.name, user=db.user, password=db.password, host=db.host, port=db.port
+    ) as conn:
+        conn.execute("INSERT INTO t0 (v) VALUES ('x')")
+        conn.execute(f"INSERT INTO t{min(1, tables - 1)} (v) VALUES ('x')")
+
+
+def reset(manager: PostgresManager, repeat: int, tables: int, tracked: bool) -> Result:
+    """reset() of the test database after a test wrote into two tables."""
+    manager.setup_testdb()
+    if tracked:
+        manager.track_changes()
+    manager.reset()  # catalog lookup, not timed
+    result = measure(
+        lambda i: manager.reset(),
+        repeat,
+        before=lambda i: _dirty(manager.testdb, tables),
+    )
+    if tracked:
+        manager.untrack_changes()
+    return result
+
+
+# --- Concurrent (pytest-xdist-like) workers -----------------------------------
+
+
+def _worker(index: int, run_id: str, master_db: dict[str, Any], tables: int, clones: int) -> None:
+    os.environ["PYTEST_XDIST_WORKER"] = f"gw{index}"
+    os.environ["PYTEST_XDIST_TESTRUNUID"] = run_id
+    sys.stdout = io.StringIO()  # the library reports its progress with print()
+    manager = PostgresManager(DBConfig(**master_db), name="bench_testdb")
+    manager.setup_template(schema(tables))
+    manager.setup_testdb()
+    for n in range(clones):
+        manager.clone_database(f"{manager.testdb.name}_{n}")
+        manager.drop_database(f"{manager.testdb.name}_{n}")
+    manager.destroy()
+    manager.close()
+
+
+def concurrent_workers(master_db: DBConfig, workers: int, tables: int, clones: int) -> Result:
+    """Wall time for `workers` processes to share a template and each set up their databases."""
+    context = multiprocessing.get_context("spawn")
+    run_id = uuid.uuid4().hex
+    processes = [
+        context.Process(target=_worker, args=(i, run_id, master_db.model_dump(), tables, clones))
+        for i in range(workers)
+    ]
+    started = time.perf_counter()
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - started
+    if any(process.exitcode for process in processes):
+        raise RuntimeError("A benchmark worker failed.")
+    return {"workers": workers, "clones_per_worker": clones, "wall_s": elapsed}
@@ -1,7 +1,3 @@
-from .docker_container import DockerContainer
-from .models import ContainerOptions, DBConfig
-from .postgres.testing_postgres import TestingPostgres
-
 """
 testing_services
 ~~~~~~~~~~~~~~~~
@@ -19,11 +15,88 @@ Example usage:
 
 Subpackages:
     postgres    -- Postgres-specific manager and testing helpers
+    redis       -- Redis-specific manager and testing helpers
+
+The public classes are imported on first access (PEP 562), so that importing the
+package does not load pydantic, psycopg or asyncio until they are needed.
 """
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_docker_container import AsyncDockerContainer
+    from .container_group import ContainerGroup
+    from .docker_container import DockerContainer
+    from .models import ContainerOptions, DBConfig, RedisConfig, RedisOptions
+    from .postgres.async_testing_postgres import AsyncTestingPostgres
+    from .postgres.connection_pool import ConnectionPool
+    from .postgres.database_pool import DatabasePool
+    from .postgres.savepoint_isolation import SavepointIsolation
+    from .postgres.testing_postgres import TestingPostgres
+    from .redis.testing_redis import TestingRedis
+    from .wait_strategies import (
+        WaitForCommand,
+        WaitForHealthcheck,
+        WaitForHttp,
+        WaitForLog,
+        WaitForPort,
+        WaitStrategy,
+    )
+
+# Public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "AsyncDockerContainer": ".async_docker_container",
+    "ContainerGroup": ".container_group",
+    "DockerContainer": ".docker_container",
+    "ContainerOptions": ".models",
+    "DBConfig": ".models",
+    "RedisConfig": ".models",
+    "RedisOptions": ".models",
+    "AsyncTestingPostgres": ".postgres.async_testing_postgres",
+    "ConnectionPool": ".postgres.connection_pool",
+    "DatabasePool": ".postgres.database_pool",
+    "SavepointIsolation": ".postgres.savepoint_isolation",
+    "TestingPostgres": ".postgres.testing_postgres",
+    "TestingRedis": ".redis.testing_redis",
+    "WaitStrategy": ".wait_strategies",
+    "WaitForCommand": ".wait_strategies",
+    "WaitForHealthcheck": ".wait_strategies",
+    "WaitForHttp": ".wait_strategies",
+    "WaitForLog": ".wait_strategies",
+    "WaitForPort": ".wait_strategies",
+}
+
 __all__ = [
+    "AsyncDockerContainer",
+    "AsyncTestingPostgres",
+    "ConnectionPool",
+    "DatabasePool",
+    "SavepointIsolation",
     "DockerContainer",
+    "ContainerGroup",
     "TestingPostgres",
     "DBConfig",
     "ContainerOptions",
+    "TestingRedis",
+    "RedisConfig",
+    "RedisOptions",
+    "WaitStrategy",
+    "WaitForCommand",
+    "WaitForHealthcheck",
+    "WaitForHttp",
+    "WaitForLog",
+    "WaitForPort",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -0,0 +1,124 @@
+import asyncio
+import os
+import shutil
+import subprocess
+from typing import Any
+
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerState
+
+
+class AsyncDockerContainer:
+    """Asyncio facade over a `DockerContainer`.
+
+    Docker CLI calls go through `asyncio.create_subprocess_exec`; Engine API calls (quick
+    round-trips on the daemon socket) run in a worker thread. Either way the event loop
+    is never blocked, so several containers can be started with `asyncio.gather`.
+    """
+
+    def __init__(self, container: DockerContainer):
+        self.container = container
+        self.container_name = container.container_name
+
+    async def _uses_api(self) -> bool:
+        return await asyncio.to_thread(self.container._engine) is not None
+
+    async def _run_command(
+        self, command: list[str], env: dict[str, str] | None = None
+    ) -> subprocess.CompletedProcess[str]:
+        """Runs a command without blocking the event loop and returns the completed process."""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env={**os.environ, **(env or {})},
+        )
+        stdout, stderr = await process.communicate()
+        return subprocess.CompletedProcess(
+            command, process.returncode or 0, stdout.decode(), stderr.decode()
+        )
+
+    async def is_docker_ready(self) -> bool:
+        """Ensures Docker is ready to use."""
+        if await self._uses_api():
+            return await asyncio.to_thread(self.container.is_docker_ready)
+
+        if (
+            shutil.which("docker") is None
+            or (await self._run_command(["docker", "--version"])).returncode != 0
+        ):
+            print("⚠️  Docker is not installed. Please install Docker.")
+            return False
+
+        if (await self._run_command(["docker", "info"])).returncode != 0:
+            print("⚠️  Docker daemon is not running. Please start Docker.")
+            return False
+        return True
+
+    async def get_state(self) -> ContainerState:
+        """Looks the container up with a single inspect call."""
+        if await self._uses_api():
+            return await asyncio.to_thread(self.container.get_state, True)
+
+        info: dict[str, Any] | None = self.container._parse_inspect(
+            await self._run_command(self.container._inspect_command())
+        )
+        return ContainerState.from_inspect(self.container_name, info)
+
+    async def exec(self, command: list[str]) -> subprocess.CompletedProcess[str]:
+        if await self._uses_api():
+            return await asyncio.to_thread(self.container.exec, command)
+        return await self._run_command(["docker", "exec", self.container_name, *command])
+
+    async def start_container(self) -> None:
+        """Starts the container if it's not running."""
+        if await self._uses_api():
+            await asyncio.to_thread(self.container.start_container)
+            return
+
+        state = await self.get_state()
+        if self.container._recreates(state):
+            await self._run_command(self.container._remove_drifted_command(state))
+            state = ContainerState(name=self.container_name)
+        if state.running:
+            print(f"Container {self.container_name} is already running.")
+            await asyncio.to_thread(self.container._ensure_ready)
+            return
+
+        if state.exists:
+            print(f"▶️ Starting existing container: {self.container_name}...")
+        else:
+            print(f"🚀 Creating and starting new container: {self.container_name}...")
+        result = await self._run_command(self.container._start_command(state.exists))
+        if self.container._check_start_result(result):
+            result = await self._run_command(self.container._start_command(exists=True))
+            self.container._check_start_result(result)
+            # Its creator may be starting it too: usable once it runs and publishes its ports
+            await asyncio.to_thread(self.container.wait_until_started)
+        print(
+            f"✅ Container '{self.container_name}' started on ports {self.container.expose_ports}"
+        )
+        await asyncio.to_thread(self.container._ensure_ready)
+
+    async def stop_container(self) -> None:
+        """Stops the container if it's running."""
+        if await self._uses_api():
+            await asyncio.to_thread(self.container.stop_container)
+            return
+
+        if (await self.get_state()).running:
+            print(f"Stopping container: {self.container_name}...")
+            await self._run_command(["docker", "stop", self.container_name])
+            print(f"✅ Container {self.container_name} has been stopped.")
+        else:
+            print(f"Container {self.container_name} is not running.")
+
+    async def remove_container(self) -> None:
+        """Stops (if needed) and removes the container."""
+        if await self._uses_api():
+            await asyncio.to_thread(self.container.remove_container)
+            return
+
+        await self.stop_container()
+        await self._run_command(["docker", "rm", self.container_name])
+        print(f"✅ Container {self.container_name} has been stopped and removed.")
@@ -0,0 +1,178 @@
+"""Start several services at once, each as soon as the services it depends on are ready.
+
+    group = ContainerGroup()
+    group.add("postgres", TestingPostgres, stop=TestingPostgres.stop)
+    group.add("redis", TestingRedis, stop=TestingRedis.stop)
+    group.add_container(localstack)  # a DockerContainer, ready once its `wait_for` passes
+    group.add("app", lambda: start_app(group["postgres"]), depends_on=["postgres"])
+
+    with group:
+        ...
+
+Independent services boot concurrently on threads, so starting the group takes as long as
+its slowest chain of dependencies instead of the sum of every boot. Stopping runs the other
+way round: a service is stopped before the services it depends on.
+"""
+
+import contextvars
+import graphlib
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, NamedTuple
+
+from testing_containers import timing
+from testing_containers.docker_container import DockerContainer
+
+
+class _Service(NamedTuple):
+    start: Callable[[], Any]
+    stop: Callable[[Any], None] | None
+    depends_on: tuple[str, ...]
+
+
+class ContainerGroup:
+    def __init__(self, max_workers: int | None = None):
+        # Threads booting services at once; one per service by default
+        self.max_workers = max_workers
+        self._services: dict[str, _Service] = {}
+        self._started: dict[str, Any] = {}  # name -> what its `start` returned
+        self._lock = threading.Lock()
+
+    def add(
+        self,
+        name: str,
+        start: Callable[[], Any],
+        stop: Callable[[Any], None] | None = None,
+        depends_on: Iterable[str] = (),
+    ) -> "ContainerGroup":
+        """Adds a service: `start()` boots it and returns once it is ready.
+
+        What `start` returns is passed to `stop` and available as `group[name]`, e.g. to
+        the `start` of the services depending on it.
+        """
+        if name in self._services:
+            raise ValueError(f"Service {name!r} is already in the group.")
+        self._services[name] = _Service(start, stop, tuple(depends_on))
+        return self
+
+    def add_container(
+        self,
+        container: DockerContainer,
+        depends_on: Iterable[str] = (),
+        name: str | None = None,
+        remove: bool = False,
+    ) -> "ContainerGroup":
+        """Adds a `DockerContainer`, named after the container unless `name` is given.
+
+        It is ready once `start_container()` returns, i.e. once its `wait_for` strategies
+        pass. It is stopped with the group, and removed too if `remove`.
+        """
+
+        def _start() -> DockerContainer:
+            container.start_container()
+            return container
+
+        stop = DockerContainer.remove_container if remove else DockerContainer.stop_container
+        return self.add(name or container.container_name, _start, stop, depends_on)
+
+    def __getitem__(self, name: str) -> Any:
+        with self._lock:
+            if name not in self._started:
+                raise KeyError(f"Service {name!r} is not started.")
+            return self._started[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._services
+
+    def __enter__(self) -> "ContainerGroup":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.stop()
+
+    def _dependencies(self) -> dict[str, tuple[str, ...]]:
+        for name, service in self._services.items():
+            unknown = [dependency for dependency in service.depends_on if dependency not in self]
+            if unknown:
+                raise ValueError(f"Service {name!r} depends on unknown services: {unknown}")
+        return {name: service.depends_on for name, service in self._services.items()}
+
+    @timing.timed("container_group.start")
+    def start(self) -> None:
+        """Boots every service, independent ones concurrently.
+
+        When one fails, the services depending on it are not started, the others already
+        started are stopped, and its error is raised.
+        """
+        errors = self._run(self._dependencies(), self._start_service, keep_going=False)
+        if errors:
+            failed, error = errors[0]
+            print(f"⚠️  {failed} failed to start, stopping the group.")
+            self.stop()
+            raise error
+
+    @timing.timed("container_group.stop")
+    def stop(self) -> None:
+        """Stops the started services concurrently, each before the ones it depends on."""
+        with self._lock:
+            started = set(self._started)
+        dependents: dict[str, list[str]] = {name: [] for name in started}
+        for name in started:
+            for dependency in self._services[name].depends_on:
+                if dependency in started:
+                    dependents[dependency].append(name)
+        errors = self._run(dependents, self._stop_service, keep_going=True)
+        if errors:
+            raise errors[0][1]
+
+    def _start_service(self, name: str) -> None:
+        with timing.span("container_group.start_service", service=name):
+            value = self._services[name].start()
+        with self._lock:
+            self._started[name] = value
+
+    def _stop_service(self, name: str) -> None:
+        with self._lock:
+            value = self._started.pop(name)
+        stop = self._services[name].stop
+        if stop is not None:
+            with timing.span("container_group.stop_service", service=name):
+                stop(value)
+
+    def _run(
+        self,
+        graph: Mapping[str, Iterable[str]],
+        action: Callable[[str], None],
+        keep_going: bool,
+    ) -> list[tuple[str, BaseException]]:
+        """Runs `action` on every node of `graph` on a thread, once its predecessors are done.
+
+        Without `keep_going`, nothing new is scheduled after an error. Returns the errors.
+        """
+        sorter = graphlib.TopologicalSorter(graph)
+        sorter.prepare()  # raises graphlib.CycleError (a ValueError)
+        errors: list[tuple[str, BaseException]] = []
+        running: dict[Future[None], str] = {}
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers or max(len(graph), 1),
+            thread_name_prefix="container-group",
+        ) as pool:
+            while sorter.is_active():
+                if keep_going or not errors:
+                    for name in sorter.get_ready():
+                        # The spans of the service nest under the group's one
+                        context = contextvars.copy_context()
+                        running[pool.submit(context.run, action, name)] = name
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        errors.append((name, error))
+                    if error is None or keep_going:
+                        sorter.done(name)
+        return errors
@@ -1,20 +1,109 @@
+import json
 import os
+import queue
+import shutil
 import subprocess
 import sys
+import threading
+import time
+from collections.abc import Generator
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Literal
+
+from testing_containers import timing, workers
+from testing_containers.docker_engine import (
+    DEFAULT_SOCKET_PATH,
+    DockerEngineClient,
+    DockerEngineError,
+    parse_size,
+    socket_path_from_env,
+)
+from testing_containers.fingerprint import fingerprint
+from testing_containers.models import ContainerState
+from testing_containers.readiness import Backoff, wait_until
+
+if TYPE_CHECKING:
+    from testing_containers.wait_strategies import WaitStrategy
+
+Transport = Literal["auto", "api", "cli"]
+
+# Hash of the configuration a container was created with, to tell whether it can be reused
+CONFIG_HASH_LABEL = "testing-containers.config-hash"
+# How long (in seconds) a container created by another process may take to be started
+STARTED_TIMEOUT = 30.0
 
 
 class DockerContainer:
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         image: str,
         container_name: str,
         expose_ports: list[str] | None = None,
         env: dict[str, str] | None = None,
+        *,
+        transport: Transport = "auto",
+        socket_path: str | None = None,
+        state_ttl: float = 0.0,
+        command: list[str] | None = None,
+        tmpfs: dict[str, str] | None = None,
+        shm_size: str | None = None,
+        run_args: list[str] | None = None,
+        recreate_on_drift: bool = True,
+        wait_for: "WaitStrategy | list[WaitStrategy] | None" = None,
+        fingerprint: str | None = None,
+        run_scoped: bool = False,
     ):
         self.image = image
+        # The image configured, when `image` is a snapshot of it (see use_snapshot)
+        self._config_image: str | None = None
+        # Of what the container's data is built from (e.g. the migrations of a snapshot)
+        self.fingerprint = fingerprint
         self.container_name = container_name
         self.expose_ports = expose_ports or []
         self.env = env or {}
+        # Overrides the image's CMD, e.g. ["postgres", "-c", "fsync=off"]
+        self.command = command or []
+        # Container path -> mount options (e.g. {"/var/lib/postgresql/data": "rw"})
+        self.tmpfs = tmpfs or {}
+        self.shm_size = shm_size
+        # Extra `docker run` arguments; they have no Engine API equivalent, so they imply the CLI
+        self.run_args = run_args or []
+        if self.run_args:
+            if transport == "api":
+                raise ValueError("run_args can only be passed to the docker CLI (transport='cli').")
+            transport = "cli"
+        # "api" talks to the Docker Engine API over its unix socket, "cli" spawns the docker
+        # CLI and "auto" uses the API when the socket answers, falling back to the CLI.
+        self.transport = transport
+        self.socket_path = socket_path
+        self._api: DockerEngineClient | None = None
+        self._api_resolved = False
+        # What start_container() waits for before returning (see wait_strategies)
+        if wait_for is None:
+            wait_for = []
+        self.wait_for = wait_for if isinstance(wait_for, list) else [wait_for]
+        # Remove and recreate an existing container whose configuration is not this one
+        self.recreate_on_drift = recreate_on_drift
+        # A container of this test run only (see ContainerOptions.run_scoped): while it
+        # runs, the other pytest-xdist workers of the run are using it
+        self.run_scoped = run_scoped
+        # How long (in seconds) a looked up ContainerState may be reused; 0 disables caching
+        self.state_ttl = state_ttl
+        self._state: ContainerState | None = None
+        self._state_at = 0.0
+
+    def _engine(self) -> DockerEngineClient | None:
+        """The Docker Engine API client, or None when the CLI has to be used."""
+        if not self._api_resolved:
+            self._api_resolved = True
+            if self.transport == "api":
+                socket_path = self.socket_path or socket_path_from_env() or DEFAULT_SOCKET_PATH
+                self._api = DockerEngineClient(socket_path)
+            elif self.transport == "auto":
+                client = DockerEngineClient.from_env(self.socket_path)
+                if client is not None and client.ping():
+                    self._api = client
+        return self._api
 
     def _run_command(
         self, command: list[str], check: bool = False, env: dict[str, str] | None = None
@@ -35,16 +124,124 @@ class DockerContainer:
             print(f"Command failed: {e}")
             sys.exit(1)
 
+    def _port_mappings(self) -> list[tuple[str, str]]:
+        """(host port, container port) of `expose_ports`; an empty host port lets Docker pick.
+
+        "5433:5432" publishes on 5433, "5432" (or ":5432") on a free port chosen by Docker.
+        """
+        mappings = []
+        for p in self.expose_ports:
+            host_port, _, container_port = p.rpartition(":")
+            mappings.append((host_port, container_port))
+        return mappings
+
+    def config_hash(self) -> str:
+        """Hash of everything the container is created with (image, env, ports, command...)."""
+        config = {
+            "image": self._config_image or self.image,
+            "env": self.env,
+            "ports": self.expose_ports,
+            "command": self.command,
+            "tmpfs": self.tmpfs,
+            "shm_size": self.shm_size,
+            "run_args": self.run_args,
+        }
+        if self.fingerprint:
+            config["fingerprint"] = self.fingerprint
+        return fingerprint([], json.dumps(config, sort_keys=True))
+
+    def use_snapshot(self, image: str) -> None:
+        """Creates the container from `image`, a snapshot of the configured image.
+
+        The config hash does not change: a container created before the snapshot was taken
+        is still reused.
+        """
+        self._config_image = self._config_image or self.image
+        self.image = image
+
+    def _has_drifted(self, state: ContainerState) -> bool:
+        """Whether an existing container was created with another configuration (or unlabeled)."""
+        return (
+            self.recreate_on_drift
+            and state.exists
+            and state.labels.get(CONFIG_HASH_LABEL) != self.config_hash()
+        )
+
+    def _recreates(self, state: ContainerState) -> bool:
+        """Whether an existing container has drifted, so it is to be removed and recreated.
+
+        A running one is stopped for that, unless other processes may be using it: the
+        other pytest-xdist workers, for a run-scoped container or under xdist. It is then
+        reused as is.
+        """
+        if not self._has_drifted(state):
+            return False
+        if state.running and (self.run_scoped or workers.worker_id() is not None):
+            print(
+                f"⚠️  Container {self.container_name} has another configuration but is running, "
+                "reusing it as is: stop it to have it recreated."
+            )
+            return False
+        print(f"♻️  Container {self.container_name} has another configuration, recreating it...")
+        return True
+
+    def _remove_drifted_command(self, state: ContainerState) -> list[str]:
+        # By id: if a parallel worker already replaced it, its new container is left alone.
+        # A stopped one without --force: if it was started meanwhile, it is reused.
+        force = ["--force"] if state.running else []
+        return ["docker", "rm", *force, state.id or self.container_name]
+
+    def _remove_drifted(self, state: ContainerState) -> None:
+        api = self._engine()
+        if api is None:
+            self._run_command(self._remove_drifted_command(state))
+            return
+        try:
+            api.remove_container(state.id or self.container_name, force=state.running)
+        except DockerEngineError as e:
+            # Already removed, or started meanwhile (then reused)
+            if e.status not in (HTTPStatus.NOT_FOUND, HTTPStatus.CONFLICT):
+                raise
+
+    def _create_config(self) -> dict[str, Any]:
+        """The Engine API equivalent of the `docker run` options."""
+        port_bindings: dict[str, list[dict[str, str]]] = {}
+        for host_port, container_port in self._port_mappings():
+            port_bindings[f"{container_port}/tcp"] = [{"HostPort": host_port}]
+        host_config: dict[str, Any] = {"PortBindings": port_bindings}
+        if self.tmpfs:
+            host_config["Tmpfs"] = self.tmpfs
+        if self.shm_size:
+            host_config["ShmSize"] = parse_size(self.shm_size)
+        config: dict[str, Any] = {
+            "Image": self.image,
+            "Env": [f"{k}={v}" for k, v in self.env.items()],
+            "ExposedPorts": {port: {} for port in port_bindings},
+            "HostConfig": host_config,
+            "Labels": {CONFIG_HASH_LABEL: self.config_hash()},
+        }
+        if self.command:
+            config["Cmd"] = self.command
+        return config
+
     def is_docker_installed(self) -> bool:
         """Checks if Docker is installed."""
+        if self._engine() is not None:
+            return True
+        if shutil.which("docker") is None:  # e.g. a CI runner without Docker
+            return False
         result = self._run_command(["docker", "--version"])
         return result.returncode == 0
 
     def is_docker_running(self) -> bool:
         """Checks if the Docker daemon is running."""
+        api = self._engine()
+        if api is not None:
+            return api.ping()
         result = self._run_command(["docker", "info"])
         return result.returncode == 0
 
+    @timing.timed("docker.is_docker_ready")
     def is_docker_ready(self) -> bool:
         """Ensures Docker is ready to use."""
         if not self.is_docker_installed():
@@ -56,81 +253,289 @@ class DockerContainer:
             return False
         return True
 
+    @timing.timed("docker.inspect")
+    def _inspect(self) -> dict[str, Any] | None:
+        api = self._engine()
+        if api is not None:
+            return api.inspect_container(self.container_name)
+
+        return self._parse_inspect(self._run_command(self._inspect_command()))
+
+    def _inspect_command(self) -> list[str]:
+        return ["docker", "inspect", "--type", "container", self.container_name]
+
+    @staticmethod
+    def _parse_inspect(result: subprocess.CompletedProcess[str]) -> dict[str, Any] | None:
+        if result.returncode != 0:
+            return None
+        info: list[dict[str, Any]] = json.loads(result.stdout)
+        return info[0] if info else None
+
+    def get_state(self, refresh: bool = False) -> ContainerState:
+        """Looks the container up with a single inspect call (cached for `state_ttl` seconds)."""
+        now = time.monotonic()
+        if refresh or self._state is None or now - self._state_at >= self.state_ttl:
+            self._state = ContainerState.from_inspect(self.container_name, self._inspect())
+            self._state_at = now
+        return self._state
+
+    def host_port(self, container_port: int | str) -> int | None:
+        """The host port actually published for `container_port` (e.g. one Docker picked)."""
+        return self.get_state(refresh=True).host_port(container_port)
+
+    def _invalidate_state(self) -> None:
+        self._state = None
+
     def is_container_running(self) -> bool:
         """Checks if the specified container is running."""
-        result = self._run_command(
-            ["docker", "ps", "--filter", f"name={self.container_name}", "--format", "{{.Names}}"]
-        )
-        return self.container_name in result.stdout.strip()
+        return self.get_state().running
 
     def container_exists(self) -> bool:
         """Checks if the container exists (running or stopped)."""
-        result = self._run_command(
-            [
-                "docker",
-                "ps",
-                "-a",
-                "--filter",
-                f"name={self.container_name}",
-                "--format",
-                "{{.Names}}",
-            ]
-        )
-        return self.container_name in result.stdout.strip()
+        return self.get_state().exists
 
+    @timing.timed("docker.exec")
     def exec(self, command: list[str]) -> subprocess.CompletedProcess[str]:
+        api = self._engine()
+        if api is not None:
+            returncode, stdout, stderr = api.exec(self.container_name, command)
+            return subprocess.CompletedProcess(command, returncode, stdout, stderr)
         return self._run_command(["docker", "exec", self.container_name, *command])
 
+    @timing.timed("docker.image_exists")
+    def image_exists(self, image: str | None = None) -> bool:
+        """Checks if the image (the container's own by default) is available locally."""
+        image = image or self.image
+        api = self._engine()
+        if api is not None:
+            return api.inspect_image(image) is not None
+        return self._run_command(["docker", "image", "inspect", image]).returncode == 0
+
+    @timing.timed("docker.commit")
+    def commit(self, image: str) -> None:
+        """Saves the container's filesystem (volumes and tmpfs mounts excluded) as `image`."""
+        api = self._engine()
+        if api is not None:
+            api.commit_container(self.container_name, image)
+        else:
+            self._run_command(["docker", "commit", self.container_name, image], check=True)
+
+    def follow_logs(self, timeout: float | None = None) -> Generator[str, None, None]:
+        """The output lines (stdout and stderr) of the container, streamed as they are written.
+
+        Starts from the first line the container ever wrote. Raises TimeoutError when
+        nothing is written for `timeout` seconds.
+        """
+        api = self._engine()
+        if api is not None:
+            pending = b""
+            for chunk in api.follow_logs(self.container_name, timeout):
+                *complete, pending = (pending + chunk).split(b"\n")
+                yield from (line.decode(errors="replace") for line in complete)
+            if pending:
+                yield pending.decode(errors="replace")
+            return
+
+        process = subprocess.Popen(
+            ["docker", "logs", "--follow", self.container_name],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        lines: queue.Queue[str | None] = queue.Queue()
+
+        def _read() -> None:
+            for line in process.stdout or []:
+                lines.put(line.rstrip("\n"))
+            lines.put(None)
+
+        threading.Thread(target=_read, name="docker-logs", daemon=True).start()
+        try:
+            while (line := lines.get(timeout=timeout)) is not None:
+                yield line
+        except queue.Empty:
+            raise TimeoutError(f"No output from {self.container_name} in {timeout}s.") from None
+        finally:
+            process.kill()
+            process.wait()
+
+    @timing.timed("docker.wait_ready")
+    def wait_until_ready(self) -> bool:
+        """Waits for every strategy of `wait_for`, in order; False if one of them timed out."""
+        for strategy in self.wait_for:
+            print(f"Waiting for {self.container_name}: {strategy}...")
+            if not strategy.wait(self):
+                print(f"⚠️  {self.container_name} is not ready: {strategy} timed out.")
+                return False
+        return True
+
+    def _start_with_api(self, api: DockerEngineClient, exists: bool) -> bool:
+        """Creates (unless `exists`) and starts it; True if another process created it first."""
+        concurrent = False
+        try:
+            if not exists:
+                try:
+                    api.create_container(
+                        self.container_name,
+                        self._create_config(),
+                        pull=lambda image: self._pull_image(api, image),
+                    )
+                except DockerEngineError as e:
+                    if e.status != HTTPStatus.CONFLICT:
+                        raise
+                    concurrent = True
+                    self._print_created_concurrently()
+            # Answers 304 (not an error) if it is already started
+            api.start_container(self.container_name)
+        except DockerEngineError as e:
+            print(f"Command failed: {e}")
+            sys.exit(1)
+        return concurrent
+
+    def _pull_image(self, api: DockerEngineClient, image: str) -> None:
+        try:
+            api.pull_image(image)
+        except DockerEngineError as e:
+            # The API pulls anonymously: the CLI has the credentials of `docker login`
+            if shutil.which("docker") is None:
+                raise
+            print(f"Pulling {image} through the Docker API failed ({e.message}), using the CLI...")
+            self._run_command(["docker", "pull", image], check=True)
+
+    def _print_created_concurrently(self) -> None:
+        # Another process (e.g. a parallel pytest-xdist worker) created it first
+        print(f"Container {self.container_name} was created concurrently, starting it.")
+
+    def _start_command(self, exists: bool) -> list[str]:
+        if exists:
+            return ["docker", "start", self.container_name]
+
+        env_options = []
+        for k, v in self.env.items():
+            env_options += ["-e", f"{k}={v}"]
+
+        port_options = []
+        for host_port, container_port in self._port_mappings():
+            port_options += ["-p", f"{host_port}:{container_port}" if host_port else container_port]
+
+        mount_options = []
+        for path, options in self.tmpfs.items():
+            mount_options += ["--tmpfs", f"{path}:{options}" if options else path]
+        if self.shm_size:
+            mount_options += ["--shm-size", self.shm_size]
+
+        return [
+            "docker",
+            "run",
+            "--name",
+            self.container_name,
+            "--label",
+            f"{CONFIG_HASH_LABEL}={self.config_hash()}",
+            *env_options,
+            *port_options,
+            *mount_options,
+            *self.run_args,
+            "-d",
+            self.image,
+            *self.command,
+        ]
+
+    def _check_start_result(self, result: subprocess.CompletedProcess[str]) -> bool:
+        """Exits if `docker run`/`start` failed; True if the container was created concurrently.
+
+        It then still has to be started (`docker start` is a no-op if it already is).
+        """
+        if result.returncode == 0:
+            return False
+        if "is already in use" not in result.stderr:
+            print(f"Command failed: {result.stderr.strip()}")
+            sys.exit(1)
+        self._print_created_concurrently()
+        return True
+
+    def wait_until_started(
+        self, timeout: float = STARTED_TIMEOUT, backoff: Backoff | None = None
+    ) -> ContainerState:
+        """Polls the container until it runs and publishes its ports; exits after `timeout`."""
+        ports = [container_port for _, container_port in self._port_mappings()]
+        states: list[ContainerState] = []
+
+        def _started() -> bool:
+            states.append(state := self.get_state(refresh=True))
+            return state.running and all(state.host_port(port) is not None for port in ports)
+
+        if not wait_until(_started, timeout, backoff):
+            print(f"⚠️  Container {self.container_name} is not started after {timeout}s.")
+            sys.exit(1)
+        return states[-1]
+
+    @timing.timed("docker.start_container")
     def start_container(self) -> None:
         """Starts the container using `docker run` if it's not running."""
-        if self.is_container_running():
+        state = self.get_state()
+        if self._recreates(state):
+            self._remove_drifted(state)
+            state = ContainerState(name=self.container_name)
+        if state.running:
             print(f"Container {self.container_name} is already running.")
+            self._ensure_ready()
             return
 
-        if self.container_exists():
+        exists = state.exists
+        self._invalidate_state()
+        if exists:
             print(f"▶️ Starting existing container: {self.container_name}...")
-            command = ["docker", "start", self.container_name]
         else:
             print(f"🚀 Creating and starting new container: {self.container_name}...")
-            env_options = []
-            for k, v in self.env.items():
-                env_options += ["-e", f"{k}={v}"]
-
-            port_options = []
-            for p in self.expose_ports:
-                expose_port = p.split(":")
-                port_options += ["-p", f"{expose_port[0]}:{expose_port[1]}"]
-
-            command = [
-                "docker",
-                "run",
-                "--name",
-                self.container_name,
-                *env_options,
-                *port_options,
-                "-d",
-                self.image,
-            ]
-
-        self._run_command(command, check=True)
+
+        api = self._engine()
+        if api is not None:
+            concurrent = self._start_with_api(api, exists)
+        else:
+            concurrent = self._check_start_result(self._run_command(self._start_command(exists)))
+            if concurrent:
+                self._check_start_result(self._run_command(self._start_command(exists=True)))
+        if concurrent:
+            # Its creator may be starting it too: usable once it runs and publishes its ports
+            self.wait_until_started()
         print(f"✅ Container '{self.container_name}' started on ports {self.expose_ports}")
+        self._ensure_ready()
+
+    def _ensure_ready(self) -> None:
+        if self.wait_for and not self.wait_until_ready():
+            sys.exit(1)
 
+    def _stop(self) -> None:
+        self._invalidate_state()
+        api = self._engine()
+        if api is not None:
+            api.stop_container(self.container_name)
+        else:
+            self._run_command(["docker", "stop", self.container_name], check=True)
+
+    @timing.timed("docker.stop_container")
     def stop_container(self) -> None:
         """Stops and removes the container if it's running."""
-        if self.is_container_running():
+        if self.get_state().running:
             print(f"Stopping container: {self.container_name}...")
-            self._run_command(["docker", "stop", self.container_name], check=True)
+            self._stop()
             print(f"✅ Container {self.container_name} has been stopped.")
         else:
             print(f"Container {self.container_name} is not running.")
 
+    @timing.timed("docker.remove_container")
     def remove_container(self) -> None:
         """Removes the container"""
-        if self.is_container_running():
+        if self.get_state().running:
             print(f"Stopping container: {self.container_name}...")
-            self._run_command(["docker", "stop", self.container_name], check=True)
+            self._stop()
         else:
             print(f"Container {self.container_name} is not running.")
 
-        self._run_command(["docker", "rm", self.container_name], check=True)
+        self._invalidate_state()
+        api = self._engine()
+        if api is not None:
+            api.remove_container(self.container_name)
+        else:
+            self._run_command(["docker", "rm", self.container_name], check=True)
         print(f"✅ Container {self.container_name} has been stopped and removed.")
@@ -0,0 +1,257 @@
+"""Minimal Docker Engine API client talking HTTP over the daemon's unix socket.
+
+Only the standard library is used. A single HTTP/1.1 connection is kept open and
+reused for every request, which avoids forking a `docker` CLI process per call.
+"""
+
+import http.client
+import json
+import os
+import socket
+import struct
+from collections.abc import Callable, Iterator
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import quote, urlencode
+
+from testing_containers import timing
+
+DEFAULT_SOCKET_PATH = "/var/run/docker.sock"
+_STDERR_STREAM = 2
+_FRAME_HEADER_SIZE = 8
+_SIZE_UNITS = {"b": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+class DockerEngineError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Docker Engine API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+
+def _error(status: int, data: bytes) -> DockerEngineError:
+    """The error of a failed request, with the message of its JSON body."""
+    try:
+        message = json.loads(data).get("message", "")
+    except ValueError:
+        message = data.decode(errors="replace")
+    return DockerEngineError(status, message)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        sock.connect(self.socket_path)
+        self.sock = sock
+
+
+def socket_path_from_env() -> str | None:
+    """The daemon socket to use according to DOCKER_HOST, or None for non-unix hosts."""
+    docker_host = os.environ.get("DOCKER_HOST")
+    if not docker_host:
+        return DEFAULT_SOCKET_PATH
+    if docker_host.startswith("unix://"):
+        return docker_host.removeprefix("unix://")
+    return None
+
+
+def split_image(image: str) -> tuple[str, str]:
+    """Split an image reference into the `fromImage` and `tag` parameters of a pull."""
+    name, _, tag = image.rpartition(":")
+    if "@" in image:
+        return image, ""
+    if not name or "/" in tag:
+        return image, "latest"
+    return name, tag
+
+
+def parse_size(size: str) -> int:
+    """Convert a `docker run` size (e.g. "512m", "1gb") to bytes, as the Engine API expects."""
+    size = size.strip().lower()
+    if size[-2:-1] in _SIZE_UNITS and size.endswith("b"):
+        size = size[:-1]  # "512mb" is "512m" to docker run too
+    unit = size[-1:]
+    if unit in _SIZE_UNITS:
+        return int(float(size[:-1]) * _SIZE_UNITS[unit])
+    return int(size)
+
+
+def demux_stream(data: bytes) -> tuple[bytes, bytes]:
+    """Split a multiplexed (non-TTY) attach stream into stdout and stderr."""
+    stdout, stderr = bytearray(), bytearray()
+    offset = 0
+    while offset + 8 <= len(data):
+        stream_type, size = struct.unpack(">BxxxL", data[offset : offset + 8])
+        frame = data[offset + 8 : offset + 8 + size]
+        (stderr if stream_type == _STDERR_STREAM else stdout).extend(frame)
+        offset += 8 + size
+    return bytes(stdout), bytes(stderr)
+
+
+class DockerEngineClient:
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float | None = None):
+        self.socket_path = socket_path
+        self._conn = _UnixHTTPConnection(socket_path, timeout=timeout)
+
+    @classmethod
+    def from_env(cls, socket_path: str | None = None) -> "DockerEngineClient | None":
+        """Client for the local daemon socket, or None if there is no such socket."""
+        socket_path = socket_path or socket_path_from_env()
+        if socket_path is None or not os.path.exists(socket_path):
+            return None
+        return cls(socket_path)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def request(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        query: dict[str, str] | None = None,
+    ) -> tuple[int, bytes]:
+        """Send a request over the persistent connection; returns status and raw body."""
+        if query:
+            path = f"{path}?{urlencode(query)}"
+        payload = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if payload is not None else {}
+        try:
+            return self._send(method, path, payload, headers)
+        except (ConnectionError, http.client.HTTPException):
+            # The daemon closed the kept-alive connection: reconnect and retry once
+            self._conn.close()
+            return self._send(method, path, payload, headers)
+
+    def _send(
+        self, method: str, path: str, payload: bytes | None, headers: dict[str, str]
+    ) -> tuple[int, bytes]:
+        self._conn.request(method, path, body=payload, headers=headers)
+        response = self._conn.getresponse()
+        return response.status, response.read()
+
+    def _json(
+        self,
+        method: str,
+        path: str,
+        body: dict[str, Any] | None = None,
+        query: dict[str, str] | None = None,
+    ) -> Any:
+        status, data = self.request(method, path, body=body, query=query)
+        if status >= HTTPStatus.BAD_REQUEST:
+            raise _error(status, data)
+        return json.loads(data) if data else None
+
+    def ping(self) -> bool:
+        """Checks that the daemon answers on the socket."""
+        try:
+            status, _ = self.request("GET", "/_ping")
+        except (OSError, http.client.HTTPException):
+            return False
+        return status == HTTPStatus.OK
+
+    def inspect_container(self, name: str) -> dict[str, Any] | None:
+        """Low-level container information, or None if the container does not exist."""
+        try:
+            result: dict[str, Any] = self._json("GET", f"/containers/{quote(name)}/json")
+        except DockerEngineError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                return None
+            raise
+        return result
+
+    @timing.timed("docker.pull_image")
+    def pull_image(self, image: str) -> None:
+        """Pulls an image, waiting for the (streamed) progress output to finish."""
+        from_image, tag = split_image(image)
+        query = {"fromImage": from_image, **({"tag": tag} if tag else {})}
+        status, data = self.request("POST", "/images/create", query=query)
+        if status >= HTTPStatus.BAD_REQUEST:
+            raise _error(status, data)
+        for line in data.splitlines():
+            if line.strip() and "error" in (progress := json.loads(line)):
+                raise DockerEngineError(status, progress["error"])
+
+    def inspect_image(self, image: str) -> dict[str, Any] | None:
+        """Low-level image information, or None if the image is not available locally."""
+        try:
+            result: dict[str, Any] = self._json("GET", f"/images/{quote(image)}/json")
+        except DockerEngineError as e:
+            if e.status == HTTPStatus.NOT_FOUND:
+                return None
+            raise
+        return result
+
+    def commit_container(self, name: str, image: str) -> None:
+        """Saves the container's filesystem as a new image (the container is paused meanwhile)."""
+        repo, tag = split_image(image)
+        self._json("POST", "/commit", query={"container": name, "repo": repo, "tag": tag})
+
+    def create_container(
+        self, name: str, config: dict[str, Any], pull: Callable[[str], None] | None = None
+    ) -> str:
+        """Creates a container (pulling its image when missing) and returns its id.
+
+        The missing image is pulled with `pull`, `pull_image` by default.
+        """
+        try:
+            result = self._json("POST", "/containers/create", body=config, query={"name": name})
+        except DockerEngineError as e:
+            if e.status != HTTPStatus.NOT_FOUND:
+                raise
+            (pull or self.pull_image)(config["Image"])
+            result = self._json("POST", "/containers/create", body=config, query={"name": name})
+        return str(result["Id"])
+
+    def start_container(self, name: str) -> None:
+        self._json("POST", f"/containers/{quote(name)}/start")
+
+    def stop_container(self, name: str) -> None:
+        self._json("POST", f"/containers/{quote(name)}/stop")
+
+    def remove_container(self, name: str, force: bool = False) -> None:
+        """Removes a container (`force` kills it first if it is running)."""
+        query = {"force": "true"} if force else None
+        self._json("DELETE", f"/containers/{quote(name)}", query=query)
+
+    def follow_logs(self, name: str, timeout: float | None = None) -> Iterator[bytes]:
+        """Streams the output (stdout and stderr) of a container, from its start, as written.
+
+        A dedicated connection is used, so other requests are not held up meanwhile.
+        Reading gives up with TimeoutError after `timeout` seconds without output.
+        """
+        conn = _UnixHTTPConnection(self.socket_path, timeout=timeout)
+        try:
+            query = urlencode({"follow": "1", "stdout": "1", "stderr": "1"})
+            conn.request("GET", f"/containers/{quote(name)}/logs?{query}")
+            response = conn.getresponse()
+            if response.status >= HTTPStatus.BAD_REQUEST:
+                raise DockerEngineError(response.status, response.read().decode(errors="replace"))
+            # Multiplexed (non-TTY) stream: an 8-byte header before every frame
+            while len(header := response.read(_FRAME_HEADER_SIZE)) == _FRAME_HEADER_SIZE:
+                _, size = struct.unpack(">BxxxL", header)
+                yield response.read(size)
+        finally:
+            conn.close()
+
+    def exec(self, name: str, command: list[str]) -> tuple[int, str, str]:
+        """Runs a command inside a container; returns exit code, stdout and stderr."""
+        created = self._json(
+            "POST",
+            f"/containers/{quote(name)}/exec",
+            body={"AttachStdout": True, "AttachStderr": True, "Cmd": command},
+        )
+        exec_id = created["Id"]
+        status, data = self.request(
+            "POST", f"/exec/{exec_id}/start", body={"Detach": False, "Tty": False}
+        )
+        if status >= HTTPStatus.BAD_REQUEST:
+            raise DockerEngineError(status, data.decode(errors="replace"))
+        stdout, stderr = demux_stream(data)
+        exit_code = self._json("GET", f"/exec/{exec_id}/json")["ExitCode"]
+        return int(exit_code), stdout.decode(errors="replace"), stderr.decode(errors="replace")
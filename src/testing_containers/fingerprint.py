@@ -0,0 +1,32 @@
+"""Content hashes used to tell whether something derived from source files is stale."""
+
+import hashlib
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+_IGNORED = {"__pycache__", ".pytest_cache", ".mypy_cache"}
+
+
+def _files(source: Path) -> Iterator[tuple[str, Path]]:
+    """The files of `source` with the names they are hashed under."""
+    if source.is_file():
+        yield source.name, source
+        return
+    for path in sorted(source.rglob("*")):
+        if path.is_file() and not _IGNORED.intersection(path.parts) and path.suffix != ".pyc":
+            yield path.relative_to(source).as_posix(), path
+
+
+def fingerprint(sources: Iterable[str | Path], *extra: str) -> str:
+    """SHA-256 of the given files and directories (names and contents), plus `extra` strings."""
+    digest = hashlib.sha256()
+    for value in extra:
+        digest.update(value.encode() + b"\0")
+    for source in map(Path, sources):
+        if not source.exists():
+            raise FileNotFoundError(f"Fingerprint source not found: {source}")
+        for name, path in _files(source):
+            content = path.read_bytes()
+            digest.update(f"{name}\0{len(content)}\0".encode())
+            digest.update(content)
+    return digest.hexdigest()
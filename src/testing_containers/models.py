@@ -1,3 +1,5 @@
+from typing import Any, Literal
+
 from pydantic import BaseModel
 
 
@@ -15,3 +17,111 @@ class ContainerOptions(BaseModel):
     image: str | None = None
     should_stop: bool = False
     remove_on_stop: bool = False
+    # Host port the server is published on; None lets Docker pick a free one
+    port: int | None = 5433
+    # A container of this test run only: named after the namespace and run id, published on
+    # a free port and removed on stop, so that concurrent runs on one host do not collide
+    run_scoped: bool = False
+    # Throughput profile for disposable data: data directory on tmpfs, durability off
+    fast: bool = False
+    # Extra server settings, passed as `-c key=value` (e.g. {"log_min_duration_statement": "0"})
+    server_settings: dict[str, str] = {}
+    # Extra `docker run` arguments (e.g. ["--cpus", "2"])
+    run_args: list[str] = []
+    # Migration sources (files/directories): when set, the migrated server is snapshotted into
+    # a local image tagged with their hash, and later runs boot from it instead of migrating
+    snapshot_sources: list[str] = []
+    # "docker", "local" (a throwaway cluster run with the local initdb/pg_ctl, no Docker) or
+    # "auto": Docker when its daemon answers, the local binaries otherwise
+    backend: Literal["auto", "docker", "local"] = "auto"
+    # Where initdb/pg_ctl live, for the local backend (searched in PATH and usual places if unset)
+    pg_bin_dir: str | None = None
+
+
+class RedisConfig(BaseModel):
+    host: str = "localhost"
+    port: int
+    db: int = 0  # logical database index
+    password: str | None = None
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}{self.host}:{self.port}/{self.db}"
+
+
+class RedisOptions(BaseModel):
+    namespace: str | None = None
+    name: str | None = None
+    image: str | None = None
+    should_stop: bool = False
+    remove_on_stop: bool = False
+    # Host port the server is published on; None lets Docker pick a free one
+    port: int | None = 6380
+    # A container of this test run only (see `ContainerOptions.run_scoped`)
+    run_scoped: bool = False
+    # Logical databases of the server: index 0 keeps the leases, the others are leased out
+    databases: int = 64
+    # Extra server settings, passed as `--key value` (e.g. {"maxmemory": "256mb"})
+    server_settings: dict[str, str] = {}
+    # Extra `docker run` arguments (e.g. ["--cpus", "2"])
+    run_args: list[str] = []
+    # "docker", "local" (a throwaway `redis-server` run from the local binary, no Docker) or
+    # "auto": Docker when its daemon answers, the local binary otherwise
+    backend: Literal["auto", "docker", "local"] = "auto"
+    # The `redis-server` binary, for the local backend (searched in PATH if unset)
+    redis_server_bin: str | None = None
+
+
+class ContainerState(BaseModel):
+    """What a single `docker inspect` tells about a container."""
+
+    name: str
+    id: str | None = None
+    exists: bool = False
+    running: bool = False
+    status: str | None = None
+    health: str | None = None
+    ports: dict[str, int] = {}  # e.g. {"5432/tcp": 5433}
+    labels: dict[str, str] = {}
+    image_id: str | None = None
+
+    @classmethod
+    def from_inspect(cls, name: str, info: dict[str, Any] | None) -> "ContainerState":
+        """Build the state out of a `docker inspect` payload (None if there is no container)."""
+        if info is None:
+            return cls(name=name)
+
+        state = info.get("State") or {}
+        ports = {}
+        for port, bindings in ((info.get("NetworkSettings") or {}).get("Ports") or {}).items():
+            if bindings:
+                ports[port] = int(bindings[0]["HostPort"])
+        return cls(
+            name=name,
+            id=info.get("Id"),
+            exists=True,
+            running=bool(state.get("Running")),
+            status=state.get("Status"),
+            health=(state.get("Health") or {}).get("Status"),
+            ports=ports,
+            labels=(info.get("Config") or {}).get("Labels") or {},
+            image_id=info.get("Image"),
+        )
+
+    def host_port(self, container_port: int | str, protocol: str = "tcp") -> int | None:
+        """The host port published for the given container port, if any."""
+        return self.ports.get(f"{container_port}/{protocol}")
+
+
+class Span(BaseModel):
+    """How long one phase (e.g. "docker.start_container") took."""
+
+    id: int
+    parent_id: int | None = None
+    name: str
+    start: float  # seconds since the epoch
+    duration: float = 0.0  # seconds
+    thread: str
+    attributes: dict[str, Any] = {}
+    error: str | None = None  # type of the exception the phase raised, if any
@@ -1,5 +1,43 @@
-"""PostgreSQL-specific service managers and test helpers."""
+"""PostgreSQL-specific service managers and test helpers.
 
-from .testing_postgres import TestingPostgres
+The classes are imported on first access (PEP 562), like in the parent package.
+"""
 
-__all__ = ["TestingPostgres"]
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .async_testing_postgres import AsyncTestingPostgres
+    from .connection_pool import ConnectionPool
+    from .database_pool import DatabasePool
+    from .savepoint_isolation import SavepointIsolation
+    from .testing_postgres import TestingPostgres
+
+# Public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "AsyncTestingPostgres": ".async_testing_postgres",
+    "ConnectionPool": ".connection_pool",
+    "DatabasePool": ".database_pool",
+    "SavepointIsolation": ".savepoint_isolation",
+    "TestingPostgres": ".testing_postgres",
+}
+
+__all__ = [
+    "AsyncTestingPostgres",
+    "ConnectionPool",
+    "DatabasePool",
+    "SavepointIsolation",
+    "TestingPostgres",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
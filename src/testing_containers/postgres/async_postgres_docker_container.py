@@ -0,0 +1,36 @@
+import sys
+
+from testing_containers.models import ContainerOptions
+from testing_containers.readiness import Backoff, is_postgres_accepting_async
+from testing_containers.service_container import AsyncServiceDockerContainer
+
+from .postgres_docker_container import PostgresDockerContainer
+
+
+class AsyncPostgresDockerContainer(AsyncServiceDockerContainer):
+    """Asyncio counterpart of `PostgresDockerContainer`."""
+
+    def __init__(self, options: ContainerOptions, port: int | None = None):
+        # Reuse the synchronous definition (image, env, ports, master db) of the container
+        definition = PostgresDockerContainer(options=options, port=port)
+        super().__init__(definition)
+        self.master_db = definition.master_db
+
+    async def is_postgres_ready(
+        self, timeout: float = 60.0, backoff: Backoff | None = None
+    ) -> bool:
+        """Waits until PostgreSQL inside the Docker container accepts connections."""
+        return await self._wait_ready(
+            lambda: is_postgres_accepting_async(
+                self.master_db.host, self.master_db.port, user=self.master_db.user
+            ),
+            timeout,
+            backoff,
+        )
+
+    async def ensure_postgres_is_ready(self) -> None:
+        """Ensures Docker and PostgreSQL are ready to use."""
+        await self.start_container()
+
+        if not await self.is_postgres_ready():
+            sys.exit(1)
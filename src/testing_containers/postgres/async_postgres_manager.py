@@ -0,0 +1,169 @@
+import inspect
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from psycopg import AsyncConnection, sql
+
+from testing_containers import workers
+from testing_containers.models import DBConfig
+
+from .postgres_manager import TERMINATE_BACKENDS
+
+AsyncMigrate = Callable[[DBConfig], Awaitable[None] | None]
+
+
+class AsyncPostgresManager:
+    """Asyncio counterpart of `PostgresManager`, built on `psycopg.AsyncConnection`."""
+
+    template: DBConfig | None
+
+    def __init__(self, master_db: DBConfig, name: str = "tmp_testdb"):
+        self.master_db = master_db
+        self.name = name
+        self.testdb = self._db_config(workers.worker_scoped_name(name))
+        self.template = None
+        self._migrate: AsyncMigrate | None = None
+
+    def _db_config(self, db_name: str) -> DBConfig:
+        """Build the connection info of a database living on the master server."""
+        return DBConfig(
+            host=self.master_db.host,
+            name=db_name,
+            user=self.master_db.user,
+            password=self.master_db.password,
+            port=self.master_db.port,
+        )
+
+    async def _connect(self) -> AsyncConnection:
+        """Establish an (autocommit) connection to the master database."""
+        return await AsyncConnection.connect(
+            dbname=self.master_db.name,
+            user=self.master_db.user,
+            password=self.master_db.password,
+            host=self.master_db.host,
+            port=self.master_db.port,
+            autocommit=True,
+        )
+
+    @asynccontextmanager
+    async def _advisory_lock(self, key: str) -> AsyncIterator[None]:
+        """Hold a session-level advisory lock, serializing setup/teardown across workers."""
+        async with await self._connect() as conn:
+            await conn.execute("SELECT pg_advisory_lock(hashtext(%s))", (key,))
+            try:
+                yield
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock(hashtext(%s))", (key,))
+
+    async def _database_exists(self, db_name: str) -> bool:
+        async with await self._connect() as conn:
+            cur = await conn.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
+            return await cur.fetchone() is not None
+
+    async def _worker_databases(self) -> list[str]:
+        """Test databases of the xdist workers of this run that still exist."""
+        async with await self._connect() as conn:
+            cur = await conn.execute(
+                "SELECT datname FROM pg_database WHERE datname LIKE %s",
+                (workers.run_scoped_name(self.name) + r"\_gw%",),
+            )
+            return [row[0] for row in await cur.fetchall()]
+
+    async def is_postgres_ready(self) -> bool:
+        """Check if PostgreSQL is ready for connection."""
+        try:
+            async with await self._connect():
+                return True
+        except Exception as e:
+            print(f"⚠️  PostgreSQL not ready: {e}")
+            return False
+
+    async def create_database(self, db_name: str, template: str | None = None) -> None:
+        """Create a new database, optionally as a copy of a template database."""
+        try:
+            async with await self._connect() as conn:
+                if template is None:
+                    await conn.execute(
+                        sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name))
+                    )
+                else:
+                    # CREATE DATABASE ... TEMPLATE fails while anyone is connected to it
+                    await conn.execute(TERMINATE_BACKENDS, (template,))
+                    await conn.execute(
+                        sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                            sql.Identifier(db_name), sql.Identifier(template)
+                        )
+                    )
+            print(f"✅ Database {db_name} created successfully.")
+        except Exception as e:
+            print(f"⚠️  Error creating database {db_name}: {e}")
+
+    async def drop_database(self, db_name: str) -> None:
+        """Drop a database, terminating active connections if necessary."""
+        try:
+            async with await self._connect() as conn:
+                await conn.execute(TERMINATE_BACKENDS, (db_name,))
+                await conn.execute(
+                    sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name))
+                )
+            print(f"✅ Database {db_name} dropped successfully.")
+        except Exception as e:
+            print(f"Error dropping database {db_name}: {e}")
+
+    async def setup_template(
+        self, migrate: AsyncMigrate | None = None, name: str | None = None
+    ) -> DBConfig:
+        """Build the "golden" template database once, running `migrate` (sync or async) on it."""
+        template = self._db_config(name or f"{workers.run_scoped_name(self.name)}_template")
+        async with self._advisory_lock(template.name):
+            if workers.worker_id() is None or not await self._database_exists(template.name):
+                await self._build_template(template, migrate)
+        self.template = template
+        self._migrate = migrate
+        return template
+
+    async def _build_template(self, template: DBConfig, migrate: AsyncMigrate | None) -> None:
+        await self.drop_database(template.name)
+        await self.create_database(template.name)
+        if migrate is not None:
+            result = migrate(template)
+            if inspect.isawaitable(result):
+                await result
+
+    async def _clone_template(self, template: DBConfig, db_name: str) -> None:
+        """Create `db_name` from the template, holding the lock `destroy` drops it under."""
+        async with self._advisory_lock(template.name):
+            if not await self._database_exists(template.name):
+                print(f"Template {template.name} was dropped by another worker, building it again.")
+                await self._build_template(template, self._migrate)
+            await self.drop_database(db_name)
+            await self.create_database(db_name, template=template.name)
+
+    async def clone_database(self, db_name: str) -> DBConfig:
+        """Create `db_name` as a copy of the template database."""
+        if self.template is None:
+            raise RuntimeError("No template database. Call setup_template() first.")
+        await self._clone_template(self.template, db_name)
+        return self._db_config(db_name)
+
+    async def destroy(self) -> None:
+        if self.template is None:
+            await self.drop_database(self.testdb.name)
+            return
+
+        async with self._advisory_lock(self.template.name):
+            await self.drop_database(self.testdb.name)
+            # Under xdist the template is shared: the last worker of the run drops it
+            if workers.worker_id() is None or not await self._worker_databases():
+                await self.drop_database(self.template.name)
+
+    async def setup_testdb(self) -> None:
+        """Drop and recreate the testdb database (cloned from the template if there is one)."""
+        if await self.is_postgres_ready():
+            if self.template is None:
+                await self.drop_database(self.testdb.name)
+                await self.create_database(self.testdb.name)
+            else:
+                await self._clone_template(self.template, self.testdb.name)
+        else:
+            raise RuntimeError("PostgreSQL is not accessible. Check credentials and connection.")
@@ -0,0 +1,81 @@
+from types import TracebackType
+
+from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.service_container import (
+    container_options,
+    is_last_worker,
+    stop_service_async,
+)
+
+from .async_postgres_docker_container import AsyncPostgresDockerContainer
+from .async_postgres_manager import AsyncMigrate, AsyncPostgresManager
+from .postgres_docker_container import CONTAINER_NAME
+
+
+class AsyncTestingPostgres:
+    """Asyncio counterpart of `TestingPostgres`.
+
+    Nothing happens on construction; `await start()` (or `async with`) brings the
+    container and the test database up without blocking the event loop.
+    """
+
+    __test__ = False  # tell pytest this is not a test class
+    postgres: AsyncPostgresManager
+    _pg_container: AsyncPostgresDockerContainer | None
+
+    def __init__(
+        self,
+        master_db: DBConfig | None = None,
+        options: ContainerOptions | None = None,
+        migrate: AsyncMigrate | None = None,
+    ):
+        self.master_db = master_db
+        self.options = options or ContainerOptions()
+        self.migrate = migrate
+        self._pg_container = None
+
+    async def start(self) -> "AsyncTestingPostgres":
+        try:
+            if self.master_db is None:
+                raise ValueError("No masterdb provided")
+            self.postgres = await self._get_current_postgres(self.master_db)
+        except ValueError:
+            self._pg_container = await self._create_postgres_container(self.options)
+            self.postgres = AsyncPostgresManager(master_db=self._pg_container.master_db)
+        if self.migrate is not None:
+            await self.postgres.setup_template(self.migrate)
+        await self.postgres.setup_testdb()
+        return self
+
+    async def stop(self) -> None:
+        await self.postgres.destroy()
+        in_use = await self.postgres._worker_databases() if self.options.run_scoped else []
+        last_worker = is_last_worker(self.options.run_scoped, lambda: in_use)
+        await stop_service_async(self._pg_container, last_worker)
+
+    async def __aenter__(self) -> "AsyncTestingPostgres":
+        return await self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        await self.stop()
+
+    async def _create_postgres_container(
+        self, options: ContainerOptions
+    ) -> AsyncPostgresDockerContainer:
+        pg_container = AsyncPostgresDockerContainer(
+            options=container_options(options, CONTAINER_NAME)
+        )
+        await pg_container.ensure_postgres_is_ready()
+
+        return pg_container
+
+    async def _get_current_postgres(self, master_db: DBConfig) -> AsyncPostgresManager:
+        postgres = AsyncPostgresManager(master_db=master_db)
+        if await postgres.is_postgres_ready():
+            return postgres
+        raise ValueError(f"Postgres not available master_db={master_db}")
@@ -0,0 +1,165 @@
+"""COPY streaming and set-based foreign-key checks of `PostgresManager.load_data`.
+
+A data source is a CSV file (with a header row), a JSON Lines file (one object per
+line), either optionally gzipped, or an iterable of rows: mappings (column -> value)
+or sequences in the table's column order. CSV files are streamed to the server as is,
+without being parsed in Python.
+"""
+
+import csv
+import gzip
+import itertools
+import json
+import os
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import IO, Any
+
+from psycopg import Cursor, sql
+from psycopg.types.json import Jsonb
+
+DataSource = str | os.PathLike[str] | Iterable[Mapping[str, Any]] | Iterable[Sequence[Any]]
+
+COPY_BLOCK_SIZE = 1 << 20  # bytes of a CSV file sent per write
+
+# The foreign keys from or to the given tables, with their columns in key order
+FOREIGN_KEYS = """
+SELECT c.conname, c.conrelid::regclass::text, c.confrelid::regclass::text,
+       array_agg(a.attname ORDER BY k.n), array_agg(fa.attname ORDER BY k.n)
+FROM pg_constraint c
+CROSS JOIN LATERAL unnest(c.conkey, c.confkey) WITH ORDINALITY AS k(attnum, fattnum, n)
+JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = k.attnum
+JOIN pg_attribute fa ON fa.attrelid = c.confrelid AND fa.attnum = k.fattnum
+WHERE c.contype = 'f'
+  AND (c.conrelid = ANY(%(tables)s::regclass[]) OR c.confrelid = ANY(%(tables)s::regclass[]))
+GROUP BY c.oid, c.conname, c.conrelid, c.confrelid
+ORDER BY c.conname
+"""
+
+# The pairs of the given tables (by 1-based position) a foreign key links, child first
+LINKED_TABLES = """
+SELECT child.n, parent.n
+FROM unnest(%(tables)s::regclass[]) WITH ORDINALITY AS child(oid, n)
+JOIN pg_constraint c ON c.contype = 'f' AND c.conrelid = child.oid
+JOIN unnest(%(tables)s::regclass[]) WITH ORDINALITY AS parent(oid, n) ON parent.oid = c.confrelid
+"""
+
+
+def table_identifier(table: str) -> sql.Identifier:
+    """`table` ("name" or "schema.name") as a quoted identifier."""
+    return sql.Identifier(*table.split(".", 1))
+
+
+def _copy_statement(table: str, columns: Sequence[str] | None, options: str = "") -> sql.Composed:
+    target: sql.Composable = table_identifier(table)
+    if columns is not None:
+        target = sql.SQL("{} ({})").format(
+            target, sql.SQL(", ").join(sql.Identifier(column) for column in columns)
+        )
+    return sql.SQL("COPY {} FROM STDIN{}").format(target, sql.SQL(options))
+
+
+def _open(path: Path) -> IO[bytes] | gzip.GzipFile:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")
+    return path.open("rb")
+
+
+def copy_into(cur: Cursor[Any], table: str, source: DataSource) -> int:
+    """Streams `source` into `table` with COPY and returns the number of rows loaded."""
+    if not isinstance(source, str | os.PathLike):
+        return _copy_rows(cur, table, source)
+
+    path = Path(source)
+    formats = [suffix.lower() for suffix in path.suffixes if suffix.lower() != ".gz"]
+    kind = formats[-1] if formats else ""
+    if kind == ".csv":
+        return _copy_csv(cur, table, path)
+    if kind in (".jsonl", ".ndjson"):
+        return _copy_rows(cur, table, _json_lines(path))
+    raise ValueError(f"Unsupported data file {path.name}: expected .csv or .jsonl (or .gz).")
+
+
+def _copy_csv(cur: Cursor[Any], table: str, path: Path) -> int:
+    with _open(path) as f:
+        columns = next(csv.reader([f.readline().decode("utf-8-sig")]), None)
+        if not columns:
+            return 0
+        with cur.copy(_copy_statement(table, columns, " (FORMAT csv)")) as copy:
+            while block := f.read(COPY_BLOCK_SIZE):
+                copy.write(block)
+    return cur.rowcount
+
+
+def _json_lines(path: Path) -> Iterator[dict[str, Any]]:
+    with _open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _copy_rows(
+    cur: Cursor[Any], table: str, rows: Iterable[Mapping[str, Any]] | Iterable[Sequence[Any]]
+) -> int:
+    """Rows are mappings (their keys, those of the first row, name the columns) or sequences."""
+    iterator = iter(rows)
+    first = next(iterator, None)
+    if first is None:
+        return 0
+    columns = list(first) if isinstance(first, Mapping) else []
+    with cur.copy(_copy_statement(table, columns or None)) as copy:
+        for row in itertools.chain([first], iterator):
+            values = [row.get(column) for column in columns] if isinstance(row, Mapping) else row
+            # A nested object (e.g. from JSON Lines) goes into a json/jsonb column
+            copy.write_row([Jsonb(value) if isinstance(value, dict) else value for value in values])
+    return cur.rowcount
+
+
+def foreign_key_violations(cur: Cursor[Any], tables: Sequence[sql.Composable]) -> list[str]:
+    """Names of the foreign keys from or to `tables` that some row violates.
+
+    Every key is checked at once, set-based, in a single query: much cheaper than the
+    per-row triggers that enforce them while loading.
+    """
+    names = [table.as_string(cur) for table in tables]
+    keys = cur.execute(FOREIGN_KEYS, {"tables": names}).fetchall()
+    checks = []
+    for name, child, parent, columns, parent_columns in keys:
+        not_null = sql.SQL(" AND ").join(
+            sql.SQL("c.{} IS NOT NULL").format(sql.Identifier(column)) for column in columns
+        )
+        matches = sql.SQL(" AND ").join(
+            sql.SQL("p.{} = c.{}").format(sql.Identifier(parent_column), sql.Identifier(column))
+            for column, parent_column in zip(columns, parent_columns, strict=True)
+        )
+        checks.append(
+            sql.SQL(
+                "SELECT {} WHERE EXISTS (SELECT FROM {} c WHERE {} "
+                "AND NOT EXISTS (SELECT FROM {} p WHERE {}))"
+            ).format(sql.Literal(name), sql.SQL(child), not_null, sql.SQL(parent), matches)
+        )
+    if not checks:
+        return []
+    return [row[0] for row in cur.execute(sql.SQL(" UNION ALL ").join(checks)).fetchall()]
+
+
+def linked_groups(cur: Cursor[Any], tables: Sequence[str]) -> list[list[str]]:
+    """`tables` split into groups that no foreign key links to one another.
+
+    The tables of a group keep their given order. Loaded in one transaction, a group sees
+    the rows of its referenced tables; groups can load concurrently.
+    """
+    names = [table_identifier(table).as_string(cur) for table in tables]
+    parents = list(range(len(tables)))  # union-find forest of the table positions
+
+    def _root(i: int) -> int:
+        while parents[i] != i:
+            i = parents[i]
+        return i
+
+    for child, parent in cur.execute(LINKED_TABLES, {"tables": names}).fetchall():
+        parents[_root(child - 1)] = _root(parent - 1)
+    groups: dict[int, list[str]] = {}
+    for i, table in enumerate(tables):
+        groups.setdefault(_root(i), []).append(table)
+    return list(groups.values())
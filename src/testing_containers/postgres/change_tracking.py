@@ -0,0 +1,91 @@
+"""SQL of the dirty-table tracking used by `PostgresManager.reset`.
+
+Statement-level triggers record, in an unlogged table, which tables were written to
+(INSERT, UPDATE or DELETE) since the last reset, so that only those get truncated.
+"""
+
+SCHEMA = "testing_containers"
+
+# Idempotent: run it again to cover tables created since
+INSTALL = """
+CREATE SCHEMA IF NOT EXISTS testing_containers;
+
+CREATE UNLOGGED TABLE IF NOT EXISTS testing_containers.dirty_tables (relid regclass PRIMARY KEY);
+
+CREATE OR REPLACE FUNCTION testing_containers.mark_dirty() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    -- Writes straight into a partition dirty the partitioned table it belongs to
+    root regclass := coalesce(pg_partition_root(TG_RELID), TG_RELID);
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM testing_containers.dirty_tables WHERE relid = root) THEN
+        INSERT INTO testing_containers.dirty_tables VALUES (root) ON CONFLICT DO NOTHING;
+    END IF;
+    RETURN NULL;
+END $$;
+
+CREATE OR REPLACE FUNCTION testing_containers.reset_dirty(excluded text[]) RETURNS void
+LANGUAGE plpgsql AS $$
+DECLARE
+    tables text;
+BEGIN
+    SELECT string_agg(d.relid::text, ', ') INTO tables
+    FROM testing_containers.dirty_tables d
+    JOIN pg_class c ON c.oid = d.relid
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relname <> ALL (excluded) AND n.nspname || '.' || c.relname <> ALL (excluded);
+    IF tables IS NOT NULL THEN
+        EXECUTE 'TRUNCATE ' || tables || ' RESTART IDENTITY CASCADE';
+    END IF;
+    DELETE FROM testing_containers.dirty_tables;
+END $$;
+
+DO $$
+DECLARE
+    t regclass;
+BEGIN
+    FOR t IN
+        SELECT c.oid::regclass
+        FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname NOT IN ('information_schema', 'testing_containers')
+          AND n.nspname NOT LIKE 'pg\\_%'
+          AND NOT EXISTS (
+            SELECT 1 FROM pg_depend d
+            WHERE d.classid = 'pg_class'::regclass AND d.objid = c.oid AND d.deptype = 'e'
+          )
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS testing_containers_dirty ON %s', t);
+        EXECUTE format(
+            'CREATE TRIGGER testing_containers_dirty AFTER INSERT OR UPDATE OR DELETE ON %s '
+            'FOR EACH STATEMENT EXECUTE FUNCTION testing_containers.mark_dirty()',
+            t
+        );
+    END LOOP;
+END $$;
+
+DELETE FROM testing_containers.dirty_tables;
+"""
+
+# Writes that fire no trigger (e.g. a bulk load with session_replication_role = replica)
+MARK_DIRTY = """
+INSERT INTO testing_containers.dirty_tables
+SELECT coalesce(pg_partition_root(t), t) FROM unnest(%s::regclass[]) AS t
+ON CONFLICT DO NOTHING
+"""
+
+IS_INSTALLED = "SELECT to_regproc('testing_containers.reset_dirty') IS NOT NULL"
+
+UNINSTALL = """
+DO $$
+DECLARE
+    t regclass;
+BEGIN
+    FOR t IN SELECT tgrelid::regclass FROM pg_trigger WHERE tgname = 'testing_containers_dirty'
+    LOOP
+        EXECUTE format('DROP TRIGGER testing_containers_dirty ON %s', t);
+    END LOOP;
+END $$;
+
+DROP SCHEMA IF EXISTS testing_containers CASCADE;
+"""
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any
+
+from psycopg import Connection, connect
+from psycopg.pq import TransactionStatus
+
+from testing_containers.models import DBConfig
+
+
+class ConnectionPool:
+    """A minimal, thread-safe pool of psycopg connections to one database.
+
+    Modelled on `psycopg_pool.ConnectionPool`: `min_size` connections are opened
+    up front, more are opened on demand up to `max_size`, and `connection()` hands one
+    out and takes it back, rolling back whatever transaction was left open.
+    """
+
+    def __init__(
+        self,
+        db: DBConfig,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 30.0,
+        open: bool = True,
+        **kwargs: Any,
+    ):
+        if not 0 <= min_size <= max_size:
+            raise ValueError(f"Invalid pool sizes: min_size={min_size}, max_size={max_size}")
+        self.db = db
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.kwargs = kwargs  # passed to psycopg.connect, e.g. autocommit=True
+        self.closed = True
+        self._idle: deque[Connection] = deque()
+        self._size = 0  # idle + lent connections
+        self._cond = threading.Condition()
+        if open:
+            self.open()
+
+    def __enter__(self) -> "ConnectionPool":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _connect(self) -> Connection:
+        return connect(
+            dbname=self.db.name,
+            user=self.db.user,
+            password=self.db.password,
+            host=self.db.host,
+            port=self.db.port,
+            **self.kwargs,
+        )
+
+    def open(self) -> None:
+        """Open the pool and its first `min_size` connections."""
+        with self._cond:
+            self.closed = False
+            while self._size < self.min_size:
+                self._idle.append(self._connect())
+                self._size += 1
+
+    def getconn(self, timeout: float | None = None) -> Connection:
+        """Take a connection, opening one if there is room, else waiting for one to be returned."""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        with self._cond:
+            while True:
+                if self.closed:
+                    raise RuntimeError("The connection pool is closed.")
+                while self._idle:
+                    conn = self._idle.popleft()
+                    if not (conn.closed or conn.broken):
+                        return conn
+                    self._size -= 1  # e.g. terminated by the server meanwhile
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(
+                        f"No connection available after {timeout or self.timeout}s "
+                        f"(max_size={self.max_size})."
+                    )
+                self._cond.wait(remaining)
+        # Connect outside of the lock, so that other threads are not held up meanwhile
+        try:
+            return self._connect()
+        except BaseException:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn: Connection) -> None:
+        """Give a connection back, ending the transaction it may have left open."""
+        if not (conn.closed or conn.broken) and (
+            conn.info.transaction_status != TransactionStatus.IDLE
+        ):
+            try:
+                conn.rollback()
+            except Exception:
+                conn.close()
+        with self._cond:
+            if self.closed or conn.closed or conn.broken:
+                conn.close()
+                self._size -= 1
+            else:
+                self._idle.append(conn)
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None) -> Iterator[Connection]:
+        conn = self.getconn(timeout)
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def close(self) -> None:
+        """Close the idle connections; lent ones are closed when given back."""
+        with self._cond:
+            self.closed = True
+            while self._idle:
+                self._idle.popleft().close()
+                self._size -= 1
+            self._cond.notify_all()
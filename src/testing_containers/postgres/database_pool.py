@@ -0,0 +1,101 @@
+import itertools
+import queue
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+
+from testing_containers.models import DBConfig
+
+from .postgres_manager import PostgresManager
+
+# Refilling the pool is more urgent than dropping released databases
+_CREATE, _DROP, _STOP = 0, 1, 2
+
+
+class DatabasePool:
+    """Keeps `size` fresh databases ready to be leased, creating and dropping them in background.
+
+    Databases are copies of the manager's template when it has one (see
+    `PostgresManager.setup_template`), empty databases otherwise. Leasing one only costs
+    a queue hand-over; its replacement is created on the pool's thread.
+    """
+
+    def __init__(self, manager: PostgresManager, size: int = 4):
+        self.size = size
+        self.prefix = f"{manager.testdb.name}_pool"
+        # The pool's thread talks to Postgres over its own connection
+        self._manager = PostgresManager(master_db=manager.master_db, name=manager.name)
+        self._manager.template = manager.template
+        self._manager._migrate = manager._migrate  # to build the template again if dropped
+        self._ready: queue.Queue[DBConfig] = queue.Queue()
+        self._tasks: queue.PriorityQueue[tuple[int, int, str]] = queue.PriorityQueue()
+        self._names = itertools.count()
+        self._order = itertools.count()
+        self._thread = threading.Thread(
+            target=self._work, name="testing-postgres-pool", daemon=True
+        )
+
+    def __enter__(self) -> "DatabasePool":
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _schedule(self, action: int, db_name: str = "") -> None:
+        self._tasks.put((action, next(self._order), db_name))
+
+    def _schedule_create(self) -> None:
+        self._schedule(_CREATE, f"{self.prefix}_{next(self._names)}")
+
+    def _work(self) -> None:
+        while True:
+            action, _, db_name = self._tasks.get()
+            if action == _STOP:
+                return
+            if action == _DROP:
+                self._manager.drop_database(db_name)
+            elif self._manager.template is not None:
+                self._ready.put(self._manager.clone_database(db_name))
+            else:
+                self._manager.drop_database(db_name)
+                self._manager.create_database(db_name)
+                self._ready.put(self._manager._db_config(db_name))
+
+    def start(self) -> "DatabasePool":
+        """Start filling the pool."""
+        for _ in range(self.size):
+            self._schedule_create()
+        self._thread.start()
+        return self
+
+    def lease(self, timeout: float | None = None) -> DBConfig:
+        """Take a fresh database out of the pool (waiting for one if needed)."""
+        db = self._ready.get(timeout=timeout)
+        self._schedule_create()
+        return db
+
+    def release(self, db: DBConfig) -> None:
+        """Give a leased database back; it is dropped in background."""
+        self._schedule(_DROP, db.name)
+
+    @contextmanager
+    def leased(self, timeout: float | None = None) -> Iterator[DBConfig]:
+        db = self.lease(timeout)
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    def close(self) -> None:
+        """Stop the pool's thread once pending work is done and drop the unused databases."""
+        self._schedule(_STOP)
+        self._thread.join()
+        while not self._ready.empty():
+            self._manager.drop_database(self._ready.get().name)
+        self._manager.close()
@@ -0,0 +1,175 @@
+import atexit
+import glob
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from testing_containers import timing
+from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.readiness import Backoff, free_port, is_postgres_accepting, wait_until
+
+from .postgres_docker_container import FAST_SERVER_SETTINGS
+
+# Where distributions install the server binaries outside of PATH (Debian/Ubuntu, RHEL, Homebrew)
+PG_BIN_GLOBS = [
+    "/usr/lib/postgresql/*/bin",
+    "/usr/pgsql-*/bin",
+    "/opt/homebrew/opt/postgresql@*/bin",
+    "/usr/local/opt/postgresql@*/bin",
+]
+PG_BIN_ENV = "TESTING_CONTAINERS_PG_BIN"
+# A tmpfs on most Linux hosts: the cluster never touches a disk
+SHM_DIR = "/dev/shm"
+
+
+def find_pg_bin_dir(pg_bin_dir: str | None = None) -> Path | None:
+    """The directory holding `initdb` and `pg_ctl`, or None when they cannot be found.
+
+    Looked up in `pg_bin_dir`, then $TESTING_CONTAINERS_PG_BIN, then PATH, then the
+    usual install locations (newest version first).
+    """
+    candidates = [pg_bin_dir, os.environ.get(PG_BIN_ENV)]
+    initdb = shutil.which("initdb")
+    if initdb is not None:
+        candidates.append(os.path.dirname(initdb))
+    for pattern in PG_BIN_GLOBS:
+        installed: list[str] = sorted(glob.glob(pattern), key=_version_key, reverse=True)
+        candidates += installed
+    for candidate in candidates:
+        if candidate and all((Path(candidate) / tool).is_file() for tool in ("initdb", "pg_ctl")):
+            return Path(candidate)
+    return None
+
+
+def _version_key(path: str) -> tuple[int, ...]:
+    return tuple(int(part) for part in "".join(c if c.isdigit() else " " for c in path).split())
+
+
+class LocalPostgresCluster:
+    """A throwaway PostgreSQL cluster run from the local binaries, without Docker.
+
+    `initdb` writes the cluster into a temporary directory (on tmpfs when /dev/shm is
+    there) and `pg_ctl` starts it on a free port, with durability off. It is not shared
+    with other processes and is removed when stopped (or when the process exits).
+    It has the interface of `PostgresDockerContainer` that `TestingPostgres` uses.
+    """
+
+    # Each pytest-xdist worker runs its own cluster: stop it along with the worker
+    shared = False
+    # Snapshots are a Docker feature
+    fingerprint: str | None = None
+    from_snapshot = False
+
+    def __init__(self, options: ContainerOptions, bin_dir: Path | None = None):
+        self.options = options
+        found = bin_dir or find_pg_bin_dir(options.pg_bin_dir)
+        if found is None:
+            raise RuntimeError("initdb/pg_ctl not found: set pg_bin_dir or add them to PATH.")
+        self.bin_dir = found
+        self.master_db = DBConfig(
+            host="127.0.0.1",
+            name="postgres",
+            user="postgres",
+            password="",
+            port=free_port(),
+        )
+        self.server_settings = {
+            **FAST_SERVER_SETTINGS,
+            "listen_addresses": "127.0.0.1",
+            **options.server_settings,
+        }
+        self.data_dir: Path | None = None
+
+    @staticmethod
+    def is_available(options: ContainerOptions) -> bool:
+        """Whether the binaries are there and can be run (initdb refuses to run as root)."""
+        is_root = hasattr(os, "geteuid") and os.geteuid() == 0
+        return not is_root and find_pg_bin_dir(options.pg_bin_dir) is not None
+
+    def _run(self, *args: str | Path) -> None:
+        result = subprocess.run(
+            [str(arg) for arg in args], capture_output=True, text=True, check=False
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"{Path(args[0]).name} failed: {result.stderr.strip()}")
+
+    @timing.timed("local_postgres.initdb")
+    def _initdb(self) -> Path:
+        parent = SHM_DIR if os.access(SHM_DIR, os.W_OK) else None
+        data_dir = Path(tempfile.mkdtemp(prefix="testing-postgres-", dir=parent))
+        try:
+            self._run(
+                self.bin_dir / "initdb",
+                "--pgdata",
+                data_dir,
+                "--username",
+                self.master_db.user,
+                "--auth",
+                "trust",
+                "--encoding",
+                "UTF8",
+                "--no-sync",
+            )
+        except RuntimeError:
+            shutil.rmtree(data_dir, ignore_errors=True)
+            raise
+        return data_dir
+
+    @timing.timed("local_postgres.start")
+    def start_container(self) -> None:
+        self.data_dir = self._initdb()
+        atexit.register(self.stop_container)
+        # The unix socket goes into the data directory: /var/run/postgresql may not be writable
+        server_options = [f"-p {self.master_db.port}", f"-k {self.data_dir}"]
+        server_options += [f"-c {key}={value}" for key, value in self.server_settings.items()]
+        self._run(
+            self.bin_dir / "pg_ctl",
+            "--pgdata",
+            self.data_dir,
+            "--options",
+            " ".join(server_options),
+            "--log",
+            self.data_dir / "postgres.log",
+            "--wait",
+            "start",
+        )
+        print(f"🐘 Local PostgreSQL cluster started on port {self.master_db.port}")
+
+    @timing.timed("local_postgres.stop")
+    def stop_container(self) -> None:
+        """Stops the server and removes its data directory."""
+        if self.data_dir is None:
+            return
+        data_dir, self.data_dir = self.data_dir, None
+        atexit.unregister(self.stop_container)
+        subprocess.run(
+            [str(self.bin_dir / "pg_ctl"), "--pgdata", str(data_dir), "-m", "immediate", "stop"],
+            capture_output=True,
+            check=False,
+        )
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    def snapshot(self) -> None:
+        raise RuntimeError("Snapshots need the Docker backend.")
+
+    @timing.timed("local_postgres.wait_ready")
+    def is_postgres_ready(self, timeout: float = 30.0, backoff: Backoff | None = None) -> bool:
+        """Waits until the local server accepts connections."""
+        return wait_until(
+            lambda: is_postgres_accepting(
+                self.master_db.host, self.master_db.port, user=self.master_db.user
+            ),
+            timeout=timeout,
+            backoff=backoff,
+        )
+
+    def ensure_postgres_is_ready(self) -> None:
+        """Starts the cluster and makes sure it accepts connections."""
+        self.start_container()
+
+        if not self.is_postgres_ready():
+            print("⚠️  Local PostgreSQL cluster is not ready.")
+            sys.exit(1)
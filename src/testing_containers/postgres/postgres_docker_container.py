@@ -1,54 +1,109 @@
 import sys
-import time
 
+from testing_containers import timing
 from testing_containers.docker_container import DockerContainer
+from testing_containers.fingerprint import fingerprint
 from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.readiness import Backoff, is_postgres_accepting
+from testing_containers.service_container import ServiceDockerContainer, expose_port
 
+CONTAINER_NAME = "testing-postgres"
+POSTGRES_PORT = 5432
+PGDATA = "/var/lib/postgresql/data"
+# `docker commit` leaves volumes (the image declares one on PGDATA) and tmpfs mounts out
+SNAPSHOT_PGDATA = "/var/lib/postgresql/snapshot"
+SNAPSHOT_REPOSITORY = "testing-containers-postgres"
 
-class PostgresDockerContainer:
-    def __init__(self, options: ContainerOptions, port: int = 5433):
-        self.options = options
+# Test data is disposable: skip fsync/WAL work and give the server room for parallel tests
+FAST_SERVER_SETTINGS = {
+    "fsync": "off",
+    "synchronous_commit": "off",
+    "full_page_writes": "off",
+    "shared_buffers": "256MB",
+    "max_connections": "200",
+}
+FAST_SHM_SIZE = "1g"
+
+
+class PostgresDockerContainer(ServiceDockerContainer):
+    service = "postgres"
+    label = "PostgreSQL"
+    service_port = POSTGRES_PORT
+
+    def __init__(self, options: ContainerOptions, port: int | None = None):
+        # No port: Docker picks a free one, read back once the container is started
+        port = port or options.port
         self.master_db = DBConfig(
             name="postgres",
             user="postgres",
             password="password",
-            port=port,
+            port=port or 0,
         )
-        self.container = DockerContainer(
-            container_name=options.name or "testing-postgres",
-            image=options.image or "postgres:16.3",
-            expose_ports=[f"{self.master_db.port}:5432"],
+        server_settings = {
+            **(FAST_SERVER_SETTINGS if options.fast else {}),
+            **options.server_settings,
+        }
+        command = ["postgres"]
+        for key, value in server_settings.items():
+            command += ["-c", f"{key}={value}"]
+        image = options.image or "postgres:16.3"
+        self.fingerprint: str | None = None
+        self.snapshot_image: str | None = None
+        self.from_snapshot = False
+        pgdata = PGDATA
+        if options.snapshot_sources:
+            pgdata = SNAPSHOT_PGDATA
+            self.fingerprint = fingerprint(options.snapshot_sources, image, pgdata)
+            self.snapshot_image = f"{SNAPSHOT_REPOSITORY}:{self.fingerprint[:16]}"
+        container = DockerContainer(
+            container_name=options.name or CONTAINER_NAME,
+            image=image,
+            expose_ports=[expose_port(POSTGRES_PORT, port)],
             env={
                 "POSTGRES_DB": self.master_db.name,
                 "POSTGRES_USER": self.master_db.user,
                 "POSTGRES_PASSWORD": self.master_db.password,
+                "PGDATA": pgdata,
             },
+            command=command if server_settings else None,
+            # A snapshot has to live in the container's own filesystem, so no tmpfs then
+            tmpfs={PGDATA: "rw"} if options.fast and not self.snapshot_image else None,
+            shm_size=FAST_SHM_SIZE if options.fast else None,
+            run_args=options.run_args,
+            fingerprint=self.fingerprint,
+            run_scoped=options.run_scoped,
         )
+        super().__init__(options, container, self.master_db)
 
-    def stop_container(self) -> None:
-        if self.options.should_stop:
-            self.container.stop_container()
-            if self.options.remove_on_stop:
-                self.container.remove_container()
+    def _prepare_start(self) -> None:
+        if self.snapshot_image and self.container.image_exists(self.snapshot_image):
+            # initdb and migrations already ran in there
+            print(f"📸 Booting from snapshot {self.snapshot_image}")
+            self.container.use_snapshot(self.snapshot_image)
+            self.from_snapshot = True
 
-    def start_container(self) -> None:
-        if not self.container.is_docker_ready():
-            sys.exit(1)
+    @timing.timed("postgres_container.snapshot")
+    def snapshot(self) -> None:
+        """Saves the running server, data included, as the `snapshot_image` of this fingerprint."""
+        if not self.snapshot_image:
+            raise RuntimeError("No snapshot_sources were given.")
+        # Flush everything to the data files so that the snapshot boots with little recovery
+        result = self.container.exec(["psql", "-U", self.master_db.user, "-c", "CHECKPOINT"])
+        if result.returncode != 0:
+            print(f"⚠️  CHECKPOINT failed, not taking a snapshot: {result.stderr.strip()}")
+            return
+        self.container.commit(self.snapshot_image)
+        print(f"📸 Snapshot {self.snapshot_image} saved.")
 
-        self.container.start_container()
-
-    def is_postgres_ready(self, retries: int = 10, delay: int = 3) -> bool:
-        """Waits until PostgreSQL inside the Docker container is ready."""
-        for attempt in range(retries):
-            result = self.container.exec(["pg_isready", "-U", self.master_db.user])
-            if result.returncode == 0:
-                print("✅ PostgreSQL is ready!")
-                return True
-            print(f"Waiting for PostgreSQL to be ready... (Attempt {attempt+1}/{retries})")
-            time.sleep(delay)
-
-        print("⚠️  PostgreSQL is not ready after multiple attempts.")
-        return False
+    def is_postgres_ready(self, timeout: float = 60.0, backoff: Backoff | None = None) -> bool:
+        """Waits until PostgreSQL inside the Docker container accepts connections."""
+        return self._wait_ready(
+            lambda: is_postgres_accepting(
+                self.master_db.host, self.master_db.port, user=self.master_db.user
+            ),
+            timeout,
+            backoff,
+        )
 
     def ensure_postgres_is_ready(self) -> None:
         """Ensures Docker and PostgreSQL are ready to use."""
@@ -1,81 +1,475 @@
-from psycopg import Connection, connect, sql
+import contextvars
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import NamedTuple, TypeVar
 
+from psycopg import Connection, Cursor, connect, errors, sql
+
+from testing_containers import timing, workers
 from testing_containers.models import DBConfig
 
+from . import bulk_load, change_tracking
+from .bulk_load import DataSource
+from .connection_pool import ConnectionPool
+
+T = TypeVar("T")
+
+TERMINATE_BACKENDS = """
+    SELECT pg_terminate_backend(pg_stat_activity.pid)
+    FROM pg_stat_activity
+    WHERE pg_stat_activity.datname = %s AND pid <> pg_backend_pid();
+"""
+
+# Extension members (e.g. PostGIS' spatial_ref_sys) and partitions (truncated through their
+# parent) are left out
+USER_TABLES = """
+    SELECT n.nspname, c.relname
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind IN ('r', 'p') AND NOT c.relispartition
+      AND n.nspname <> 'information_schema' AND n.nspname NOT LIKE 'pg\\_%'
+      AND NOT EXISTS (
+        SELECT 1 FROM pg_depend d
+        WHERE d.classid = 'pg_class'::regclass AND d.objid = c.oid AND d.deptype = 'e'
+      )
+    ORDER BY 1, 2
+"""
+
+# Sequences that are not owned by a column: TRUNCATE ... RESTART IDENTITY resets the others
+STANDALONE_SEQUENCES = """
+    SELECT n.nspname, c.relname
+    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind = 'S'
+      AND n.nspname <> 'information_schema' AND n.nspname NOT LIKE 'pg\\_%'
+      AND NOT EXISTS (
+        SELECT 1 FROM pg_depend d
+        WHERE d.classid = 'pg_class'::regclass AND d.objid = c.oid AND d.deptype IN ('a', 'i', 'e')
+      )
+    ORDER BY 1, 2
+"""
+
+
+def _in_parallel(max_workers: int, tasks: list[Callable[[], T]]) -> list[T]:
+    """The results of `tasks`, run on up to `max_workers` threads (in the caller's context)."""
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(max_workers, len(tasks))), thread_name_prefix="load-data"
+    ) as executor:
+        futures = [executor.submit(contextvars.copy_context().run, task) for task in tasks]
+        return [future.result() for future in futures]
+
+
+class ResetCatalog(NamedTuple):
+    """What `reset` needs to know about a database."""
+
+    tables: list[tuple[str, str]]
+    sequences: list[tuple[str, str]]
+    tracked: bool  # dirty-table tracking is installed
+
 
 class PostgresManager:
     connection: Connection
+    template: DBConfig | None
 
-    def __init__(self, master_db: DBConfig):
+    def __init__(self, master_db: DBConfig, name: str = "tmp_testdb"):
         self.master_db = master_db
-        self.testdb = DBConfig(
-            host=master_db.host,
-            name="tmp_testdb",
-            user=master_db.user,
-            password=master_db.password,
-            port=master_db.port,
+        # Under pytest-xdist every worker gets its own database so they can run in parallel
+        self.name = name
+        self.testdb = self._db_config(workers.worker_scoped_name(name))
+        self.template = None
+        # A persistent template outlives the run (e.g. it is part of a container snapshot)
+        self.template_persistent = False
+        # Whether setup_template() built (and migrated) the template, rather than reusing it
+        self.template_built = False
+        self._migrate: Callable[[DBConfig], None] | None = None
+        # Per database: what reset() needs to know about it, and a connection to reset it
+        self._reset_catalogs: dict[str, ResetCatalog] = {}
+        self._reset_connections: dict[str, Connection] = {}
+        self._pools: dict[str, ConnectionPool] = {}
+
+    def _db_config(self, db_name: str) -> DBConfig:
+        """Build the connection info of a database living on the master server."""
+        return DBConfig(
+            host=self.master_db.host,
+            name=db_name,
+            user=self.master_db.user,
+            password=self.master_db.password,
+            port=self.master_db.port,
         )
 
     def _connect(self) -> Connection:
-        """Establish a connection to the specified database."""
-        if not hasattr(self, "connection") or self.connection.closed:
-            self.connection = connect(
-                dbname=self.master_db.name,
-                user=self.master_db.user,
-                password=self.master_db.password,
-                host=self.master_db.host,
-                port=self.master_db.port,
-            )
+        """The (autocommit) admin connection to the master database, reused across calls."""
+        if not hasattr(self, "connection") or self.connection.closed or self.connection.broken:
+            self.connection = self._connect_to(self.master_db)
         return self.connection
 
+    @contextmanager
+    def _advisory_lock(self, key: str) -> Iterator[None]:
+        """Hold a session-level advisory lock, serializing setup/teardown across workers."""
+        conn = self._connect()
+        conn.execute("SELECT pg_advisory_lock(hashtext(%s))", (key,))
+        try:
+            yield
+        finally:
+            conn.execute("SELECT pg_advisory_unlock(hashtext(%s))", (key,))
+
+    def _database_exists(self, db_name: str) -> bool:
+        with self._connect().cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", (db_name,))
+            return cur.fetchone() is not None
+
+    def _worker_databases(self) -> list[str]:
+        """Test databases of the xdist workers of this run that still exist."""
+        with self._connect().cursor() as cur:
+            cur.execute(
+                "SELECT datname FROM pg_database WHERE datname LIKE %s",
+                (workers.run_scoped_name(self.name) + r"\_gw%",),
+            )
+            return [row[0] for row in cur.fetchall()]
+
+    @staticmethod
+    def _terminate_backends(cur: Cursor, db_name: str) -> None:
+        """Terminate every other session connected to the given database."""
+        cur.execute(TERMINATE_BACKENDS, (db_name,))
+
     def is_postgres_ready(self) -> bool:
         """Check if PostgreSQL is ready for connection."""
         try:
-            with self._connect():
-                return True
+            self._connect().execute("SELECT 1")
+            return True
         except Exception as e:
             print(f"⚠️  PostgreSQL not ready: {e}")
             return False
 
-    def create_database(self, db_name: str) -> None:
-        """Create a new database."""
+    @timing.timed("postgres.create_database")
+    def create_database(self, db_name: str, template: str | None = None) -> None:
+        """Create a new database, optionally as a copy of a template database."""
         try:
-            with self._connect() as conn:
-                conn.autocommit = True
-                with conn.cursor() as cur:
+            with self._connect().cursor() as cur:
+                if template is None:
                     cur.execute(sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name)))
-                print(f"✅ Database {db_name} created successfully.")
+                else:
+                    # CREATE DATABASE ... TEMPLATE fails while anyone is connected to it
+                    self._close_connections(template)
+                    self._terminate_backends(cur, template)
+                    cur.execute(
+                        sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                            sql.Identifier(db_name), sql.Identifier(template)
+                        )
+                    )
+            print(f"✅ Database {db_name} created successfully.")
         except Exception as e:
             print(f"⚠️  Error creating database {db_name}: {e}")
 
+    @timing.timed("postgres.drop_database")
     def drop_database(self, db_name: str) -> None:
         """Drop a database, terminating active connections if necessary."""
+        self._close_connections(db_name)
+        # A database recreated under this name may have another schema
+        self._reset_catalogs.pop(db_name, None)
         try:
-            with self._connect() as conn:
-                conn.autocommit = True  # Allow dropping databases
-                with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        SELECT pg_terminate_backend(pg_stat_activity.pid)
-                        FROM pg_stat_activity
-                        WHERE pg_stat_activity.datname = %s AND pid <> pg_backend_pid();
-                        """,
-                        (db_name,),
-                    )
-                    cur.execute(
-                        sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name))
-                    )
-                print(f"✅ Database {db_name} dropped successfully.")
+            with self._connect().cursor() as cur:
+                self._terminate_backends(cur, db_name)
+                cur.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name)))
+            print(f"✅ Database {db_name} dropped successfully.")
         except Exception as e:
             print(f"Error dropping database {db_name}: {e}")
 
+    @timing.timed("postgres.setup_template")
+    def setup_template(
+        self,
+        migrate: Callable[[DBConfig], None] | None = None,
+        name: str | None = None,
+        persistent: bool = False,
+    ) -> DBConfig:
+        """Build the "golden" template database once, running `migrate` against it.
+
+        Databases created afterwards with `clone_database` (and `setup_testdb`)
+        are copied from this template instead of being migrated from scratch.
+        Under pytest-xdist the template is shared: the first worker builds it and
+        the others reuse it. A `persistent` template is reused whenever it exists
+        and is never dropped, so its name should identify the migrations it holds.
+        """
+        template = self._db_config(name or f"{workers.run_scoped_name(self.name)}_template")
+        shared = persistent or workers.worker_id() is not None
+        with self._advisory_lock(template.name):
+            self.template_built = not shared or not self._database_exists(template.name)
+            if self.template_built:
+                self._build_template(template, migrate)
+        self.template = template
+        self.template_persistent = persistent
+        self._migrate = migrate
+        return template
+
+    def _build_template(
+        self, template: DBConfig, migrate: Callable[[DBConfig], None] | None
+    ) -> None:
+        self.drop_database(template.name)
+        self.create_database(template.name)
+        if migrate is not None:
+            with timing.span("postgres.migrate"):
+                migrate(template)
+
+    def _clone_template(self, template: DBConfig, db_name: str) -> None:
+        """Create `db_name` from the template, holding the lock `destroy` drops it under.
+
+        Once cloned, the worker database keeps the template alive; before that, another
+        worker finishing its run may have dropped the template, which is then built again.
+        """
+        with self._advisory_lock(template.name):
+            if not self._database_exists(template.name):
+                print(f"Template {template.name} was dropped by another worker, building it again.")
+                self._build_template(template, self._migrate)
+            self.drop_database(db_name)
+            self.create_database(db_name, template=template.name)
+
+    @timing.timed("postgres.clone_database")
+    def clone_database(self, db_name: str) -> DBConfig:
+        """Create `db_name` as a copy of the template database."""
+        if self.template is None:
+            raise RuntimeError("No template database. Call setup_template() first.")
+        self._clone_template(self.template, db_name)
+        return self._db_config(db_name)
+
+    @timing.timed("postgres.destroy")
     def destroy(self) -> None:
-        self.drop_database(self.testdb.name)
+        if self.template is None:
+            self.drop_database(self.testdb.name)
+            return
 
+        with self._advisory_lock(self.template.name):
+            self.drop_database(self.testdb.name)
+            if self.template_persistent:
+                return
+            # Under xdist the template is shared: the last worker of the run drops it
+            if workers.worker_id() is None or not self._worker_databases():
+                self.drop_database(self.template.name)
+
+    @timing.timed("postgres.setup_testdb")
     def setup_testdb(self) -> None:
-        """Drop and recreate the testdb database."""
+        """Drop and recreate the testdb database (cloned from the template if there is one)."""
         if self.is_postgres_ready():
-            self.drop_database(self.testdb.name)
-            self.create_database(self.testdb.name)
+            if self.template is None:
+                self.drop_database(self.testdb.name)
+                self.create_database(self.testdb.name)
+            else:
+                self._clone_template(self.template, self.testdb.name)
         else:
             raise RuntimeError("PostgreSQL is not accessible. Check credentials and connection.")
+
+    @staticmethod
+    def _connect_to(db: DBConfig) -> Connection:
+        """An autocommit connection to any database of the server."""
+        return connect(
+            dbname=db.name,
+            user=db.user,
+            password=db.password,
+            host=db.host,
+            port=db.port,
+            autocommit=True,
+        )
+
+    def _reset_connection(self, db: DBConfig) -> Connection:
+        conn = self._reset_connections.get(db.name)
+        if conn is None or conn.closed:
+            conn = self._reset_connections[db.name] = self._connect_to(db)
+        return conn
+
+    def _close_connections(self, db_name: str) -> None:
+        """Close our own sessions on a database (its reset connection and pool)."""
+        conn = self._reset_connections.pop(db_name, None)
+        if conn is not None:
+            conn.close()
+        pool = self._pools.pop(db_name, None)
+        if pool is not None:
+            pool.close()
+
+    def _reset_catalog(self, conn: Connection, db_name: str) -> ResetCatalog:
+        """The user tables and standalone sequences of a database, looked up once."""
+        if db_name not in self._reset_catalogs:
+            with conn.cursor() as cur:
+                tables = cur.execute(USER_TABLES).fetchall()
+                sequences = cur.execute(STANDALONE_SEQUENCES).fetchall()
+                installed = cur.execute(change_tracking.IS_INSTALLED).fetchone()
+            self._reset_catalogs[db_name] = ResetCatalog(
+                tables, sequences, bool(installed and installed[0])
+            )
+        return self._reset_catalogs[db_name]
+
+    def invalidate_reset_cache(self) -> None:
+        """Forget the cached catalogs, e.g. after tables were created or dropped."""
+        self._reset_catalogs.clear()
+
+    @timing.timed("postgres.reset")
+    def reset(
+        self, exclude: Iterable[str] = ("alembic_version",), db: DBConfig | None = None
+    ) -> None:
+        """Empty every user table of the test database (or `db`) and restart its sequences.
+
+        Everything is cleared in a single round trip (one `TRUNCATE ... RESTART IDENTITY
+        CASCADE`) using a catalog looked up once; with `track_changes` installed, only
+        the tables written to since the last reset are truncated. Tables in `exclude`
+        ("name" or "schema.name") are kept, unless they reference a truncated table.
+        """
+        db = db or self.testdb
+        conn = self._reset_connection(db)
+        tables, sequences, tracked = self._reset_catalog(conn, db.name)
+        excluded = set(exclude)
+
+        def _kept(schema: str, name: str) -> bool:
+            return name not in excluded and f"{schema}.{name}" not in excluded
+
+        statements: list[sql.Composable] = []
+        if tracked:
+            statements.append(
+                sql.SQL("SELECT testing_containers.reset_dirty({}::text[])").format(
+                    sql.Literal(sorted(excluded))
+                )
+            )
+        elif truncated := [sql.Identifier(*t) for t in tables if _kept(*t)]:
+            statements.append(
+                sql.SQL("TRUNCATE {} RESTART IDENTITY CASCADE").format(
+                    sql.SQL(", ").join(truncated)
+                )
+            )
+        for sequence in sequences:
+            if _kept(*sequence):
+                statements.append(
+                    sql.SQL("ALTER SEQUENCE {} RESTART").format(sql.Identifier(*sequence))
+                )
+        if statements:
+            conn.execute(sql.SQL("; ").join(statements))
+
+    @timing.timed("postgres.track_changes")
+    def track_changes(self, db: DBConfig | None = None) -> None:
+        """Install dirty-table tracking in the test database (or `db`, e.g. the template).
+
+        Statement-level triggers record which tables get written to, so that `reset`
+        only truncates those. Tables created afterwards are not tracked until this is
+        called again. Databases cloned from a tracked template are tracked too.
+        """
+        db = db or self.testdb
+        # A short-lived connection: a template must have no session left to be cloned
+        with self._connect_to(db) as conn:
+            conn.execute(change_tracking.INSTALL)
+        self._reset_catalogs.pop(db.name, None)
+
+    def untrack_changes(self, db: DBConfig | None = None) -> None:
+        """Remove the dirty-table tracking triggers, table and functions."""
+        db = db or self.testdb
+        with self._connect_to(db) as conn:
+            conn.execute(change_tracking.UNINSTALL)
+        self._reset_catalogs.pop(db.name, None)
+
+    @timing.timed("postgres.load_data")
+    def load_data(
+        self,
+        data: Mapping[str, DataSource],
+        db: DBConfig | None = None,
+        max_workers: int = 4,
+        check_foreign_keys: bool = True,
+        disable_triggers: bool = False,
+    ) -> dict[str, int]:
+        """Bulk-load rows into tables of the test database (or `db`) with COPY.
+
+        `data` maps table names ("name" or "schema.name") to a CSV file with a header row,
+        a JSON Lines file (either optionally gzipped) or an iterable of rows (mappings, or
+        sequences in column order). Returns the number of rows loaded per table.
+
+        By default the tables linked by foreign keys load one after the other over one
+        connection, in a single transaction with the deferrable constraints deferred to its
+        commit: triggers fire, and a DEFERRABLE foreign key may reference a table loaded
+        after its own. Tables not linked to one another load in parallel, `max_workers`
+        groups at a time, each group committed on its own.
+
+        With `disable_triggers`, every table is streamed over a connection of its own,
+        `max_workers` at a time, in one transaction with triggers, and so foreign-key
+        checks, off: tables load in parallel and in any order. The foreign keys from or to
+        the loaded tables are then checked once, set-based, and a violation raises
+        RuntimeError (the rows stay loaded) unless `check_foreign_keys` is False. This needs
+        a role allowed to set session_replication_role (a superuser): RuntimeError is raised
+        before anything is loaded otherwise.
+        """
+        db = db or self.testdb
+        conn = self._reset_connection(db)
+        if not disable_triggers:
+            groups = [list(data)]
+            if max_workers > 1 and len(data) > 1:
+                with conn.cursor() as cur:
+                    groups = bulk_load.linked_groups(cur, list(data))
+            if len(groups) == 1:
+                return self._load_tables(db, data)
+            results = _in_parallel(
+                max_workers,
+                [partial(self._load_tables, db, {t: data[t] for t in group}) for group in groups],
+            )
+            loaded_groups = {table: n for result in results for table, n in result.items()}
+            return {table: loaded_groups[table] for table in data}
+
+        self._check_can_disable_triggers(conn, db)
+        counts = _in_parallel(
+            max_workers,
+            [partial(self._load_table, db, table, source) for table, source in data.items()],
+        )
+        loaded = dict(zip(data, counts, strict=True))
+
+        tables = [bulk_load.table_identifier(table) for table in data]
+        if self._reset_catalog(conn, db.name).tracked and tables:
+            # The tracking triggers did not fire either
+            conn.execute(change_tracking.MARK_DIRTY, ([t.as_string(conn) for t in tables],))
+        if check_foreign_keys and tables:
+            with conn.cursor() as cur:
+                violated = bulk_load.foreign_key_violations(cur, tables)
+            if violated:
+                raise RuntimeError(f"Loaded rows violate foreign keys: {', '.join(violated)}")
+        return loaded
+
+    def _load_tables(self, db: DBConfig, data: Mapping[str, DataSource]) -> dict[str, int]:
+        loaded = {}
+        with self._connect_to(db) as conn, conn.transaction(), conn.cursor() as cur:
+            cur.execute("SET CONSTRAINTS ALL DEFERRED")
+            cur.execute("SET LOCAL synchronous_commit = off")
+            for table, source in data.items():
+                with timing.span("postgres.load_table", table=table):
+                    loaded[table] = bulk_load.copy_into(cur, table, source)
+        return loaded
+
+    @staticmethod
+    def _check_can_disable_triggers(conn: Connection, db: DBConfig) -> None:
+        try:
+            with conn.transaction():
+                conn.execute("SET LOCAL session_replication_role = replica")
+        except errors.InsufficientPrivilege:
+            raise RuntimeError(
+                f"disable_triggers needs a role allowed to set session_replication_role "
+                f"(a superuser), which {db.user!r} is not: load without it."
+            ) from None
+
+    def _load_table(self, db: DBConfig, table: str, source: DataSource) -> int:
+        with (
+            timing.span("postgres.load_table", table=table),
+            self._connect_to(db) as conn,
+            conn.transaction(),
+            conn.cursor() as cur,
+        ):
+            # No triggers, so no foreign-key checks: load_data checks them afterwards
+            cur.execute("SET LOCAL session_replication_role = replica")
+            cur.execute("SET LOCAL synchronous_commit = off")
+            return bulk_load.copy_into(cur, table, source)
+
+    def pool(
+        self, min_size: int = 1, max_size: int = 10, db: DBConfig | None = None
+    ) -> ConnectionPool:
+        """A pool of connections to the test database (or `db`), created on first use."""
+        db = db or self.testdb
+        pool = self._pools.get(db.name)
+        if pool is None or pool.closed:
+            pool = self._pools[db.name] = ConnectionPool(db, min_size=min_size, max_size=max_size)
+        return pool
+
+    def close(self) -> None:
+        """Close every connection the manager holds (admin, reset and pooled ones)."""
+        for db_name in {*self._reset_connections, *self._pools}:
+            self._close_connections(db_name)
+        if hasattr(self, "connection"):
+            self.connection.close()
@@ -0,0 +1,112 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any
+
+from psycopg import Connection, connect
+
+from testing_containers.models import DBConfig
+
+SAVEPOINT = "testing_containers_test"
+
+
+class IsolatedConnection:
+    """A connection handed to the code under test: commits never reach the database.
+
+    `commit()` releases the test savepoint and opens a new one, `rollback()` rolls back
+    to it and `close()` does nothing; everything else is the underlying psycopg
+    connection. Its work is discarded when the test's outer transaction is rolled back.
+    """
+
+    def __init__(self, connection: Connection):
+        self._connection = connection
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._connection, name)
+
+    def __enter__(self) -> "IsolatedConnection":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        # Like psycopg's connection block, minus closing the connection
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def commit(self) -> None:
+        self._connection.execute(f"RELEASE SAVEPOINT {SAVEPOINT}")
+        self._connection.execute(f"SAVEPOINT {SAVEPOINT}")
+
+    def rollback(self) -> None:
+        self._connection.execute(f"ROLLBACK TO SAVEPOINT {SAVEPOINT}")
+
+    def close(self) -> None:
+        pass
+
+
+class SavepointIsolation:
+    """Isolates tests sharing one (migrated) database by rolling back what each test did.
+
+    Every test runs inside an outer transaction on a single connection; commits made by
+    the code under test only move a savepoint, and the whole transaction is rolled back
+    at teardown, so no test needs any DDL. Patch the app's connection factory with
+    `connect` so that it uses the test's connection too.
+    """
+
+    def __init__(self, db: DBConfig):
+        self.db = db
+        self._connection: Connection | None = None
+
+    def _connect(self) -> Connection:
+        if self._connection is None or self._connection.closed:
+            # Autocommit, so that transactions are only opened by begin()
+            self._connection = connect(
+                dbname=self.db.name,
+                user=self.db.user,
+                password=self.db.password,
+                host=self.db.host,
+                port=self.db.port,
+                autocommit=True,
+            )
+        return self._connection
+
+    @property
+    def connection(self) -> IsolatedConnection:
+        """The connection of the running test."""
+        if self._connection is None or self._connection.closed:
+            raise RuntimeError("No test is running. Call begin() first.")
+        return IsolatedConnection(self._connection)
+
+    def connect(self, *args: Any, **kwargs: Any) -> IsolatedConnection:
+        """Drop-in replacement for `psycopg.connect`, returning the test's connection."""
+        return self.connection
+
+    def begin(self) -> IsolatedConnection:
+        """Open the outer transaction of a test."""
+        conn = self._connect()
+        conn.execute("BEGIN")
+        conn.execute(f"SAVEPOINT {SAVEPOINT}")
+        return IsolatedConnection(conn)
+
+    def rollback(self) -> None:
+        """Discard everything done since begin()."""
+        if self._connection is not None and not self._connection.closed:
+            self._connection.execute("ROLLBACK")
+
+    @contextmanager
+    def isolated(self) -> Iterator[IsolatedConnection]:
+        conn = self.begin()
+        try:
+            yield conn
+        finally:
+            self.rollback()
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
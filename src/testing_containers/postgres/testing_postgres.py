@@ -1,50 +1,120 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+
+from testing_containers import timing
 from testing_containers.models import ContainerOptions, DBConfig
+from testing_containers.service_container import container_options, is_last_worker, stop_service
 
-from .postgres_docker_container import PostgresDockerContainer
+from .local_postgres_cluster import LocalPostgresCluster
+from .postgres_docker_container import CONTAINER_NAME, PostgresDockerContainer
 from .postgres_manager import PostgresManager
 
 
 class TestingPostgres:
     __test__ = False  # tell pytest this is not a test class
-    postgres: PostgresManager
-    _pg_container: PostgresDockerContainer | None
+    _postgres: PostgresManager
+    _pg_container: PostgresDockerContainer | LocalPostgresCluster | None
 
-    def __init__(self, master_db: DBConfig | None = None, options: ContainerOptions | None = None):
+    def __init__(
+        self,
+        master_db: DBConfig | None = None,
+        options: ContainerOptions | None = None,
+        migrate: Callable[[DBConfig], None] | None = None,
+        background: bool = False,
+    ):
         self.options = options or ContainerOptions()
+        self.migrate = migrate
         self._pg_container = None
-        self._setup(master_db)
+        self.ready: Future[None] = Future()
+        if background:
+            threading.Thread(
+                target=self._run_setup, args=(master_db,), name="testing-postgres", daemon=True
+            ).start()
+        else:
+            self._run_setup(master_db)
+            self.wait()
+
+    @classmethod
+    def background(
+        cls,
+        master_db: DBConfig | None = None,
+        options: ContainerOptions | None = None,
+        migrate: Callable[[DBConfig], None] | None = None,
+    ) -> "TestingPostgres":
+        """Start Postgres on a worker thread and return immediately.
+
+        The boot overlaps with whatever runs next (e.g. pytest collection); accessing
+        `postgres` (or calling `wait()`) blocks until the test database is ready.
+        """
+        return cls(master_db=master_db, options=options, migrate=migrate, background=True)
+
+    @property
+    def postgres(self) -> PostgresManager:
+        self.wait()
+        return self._postgres
+
+    def wait(self, timeout: float | None = None) -> None:
+        """Block until setup has finished, re-raising its error if it failed."""
+        self.ready.result(timeout)
 
+    def _run_setup(self, master_db: DBConfig | None) -> None:
+        try:
+            self._setup(master_db)
+        except BaseException as e:  # sys.exit() included, so that wait() re-raises it
+            self.ready.set_exception(e)
+        else:
+            self.ready.set_result(None)
+
+    @timing.timed("testing_postgres.stop")
     def stop(self) -> None:
         self.postgres.destroy()
-        if self._pg_container:
-            self._pg_container.stop_container()
+        last_worker = is_last_worker(self.options.run_scoped, self.postgres._worker_databases)
+        self.postgres.close()
+        stop_service(self._pg_container, last_worker)
 
+    @timing.timed("testing_postgres.setup")
     def _setup(self, master_db: DBConfig | None = None) -> None:
         try:
             if master_db is None:
                 raise ValueError("No masterdb provided")
-            self.postgres = self._get_current_postgres(master_db)
+            self._postgres = self._get_current_postgres(master_db)
         except ValueError:
             self._pg_container = self._create_postgres_container(self.options)
-            self.postgres = PostgresManager(master_db=self._pg_container.master_db)
-        self.postgres.setup_testdb()
-
-    @staticmethod
-    def _get_container_name(container_namespace: str | None) -> str:
-        if container_namespace:
-            return f"{container_namespace}-testing-postgres"
-        return "testing-postgres"
-
-    def _create_postgres_container(self, options: ContainerOptions) -> PostgresDockerContainer:
-        pg_container = PostgresDockerContainer(
-            options=ContainerOptions(
-                image=options.image,
-                namespace=options.namespace,
-                name=options.name or self._get_container_name(self.options.namespace),
-                should_stop=options.should_stop,
-                remove_on_stop=options.remove_on_stop,
-            )
+            self._postgres = PostgresManager(master_db=self._pg_container.master_db)
+        if self.migrate is not None:
+            self._setup_template(self.migrate)
+        self._postgres.setup_testdb()
+
+    def _setup_template(self, migrate: Callable[[DBConfig], None]) -> None:
+        container = self._pg_container
+        if container is None or container.fingerprint is None:
+            self._postgres.setup_template(migrate)
+            return
+
+        # The template is named after the migrations it holds and kept in the snapshot
+        self._postgres.setup_template(
+            migrate,
+            name=f"{self._postgres.name}_template_{container.fingerprint[:12]}",
+            persistent=True,
         )
+        if not container.from_snapshot and self._postgres.template_built:
+            container.snapshot()
+
+    def _create_postgres_container(
+        self, options: ContainerOptions
+    ) -> PostgresDockerContainer | LocalPostgresCluster:
+        options = container_options(options, CONTAINER_NAME)
+        pg_container: PostgresDockerContainer | LocalPostgresCluster
+        pg_container = PostgresDockerContainer(options=options)
+        if options.backend == "local" or (
+            options.backend == "auto"
+            and not pg_container.container.is_docker_ready()
+            and LocalPostgresCluster.is_available(options)
+        ):
+            if options.backend == "auto":
+                print("🐘 Docker is not available, using the local PostgreSQL binaries instead.")
+            pg_container = LocalPostgresCluster(options=options)
         pg_container.ensure_postgres_is_ready()
 
         return pg_container
@@ -0,0 +1,166 @@
+"""pytest plugin: lazy, scoped PostgreSQL and Redis fixtures.
+
+Registered through the `pytest11` entry point, so installing the package is enough.
+Nothing is started at import or collection time: Postgres boots the first time a selected
+test requests one of the fixtures below, and the plugin tears it down at the end of the
+session. Under pytest-xdist, session-scoped fixtures live once per worker.
+
+    testing_postgres       session   the TestingPostgres (container + manager)
+    postgres_db            session   the worker's test database (DBConfig)
+    postgres_module_db     module    a fresh database for the test module
+    postgres_function_db   function  a fresh database for the test, from a pre-warmed pool
+    postgres_conn          function  a connection to `postgres_db`, reset after the test
+    testing_redis          session   the TestingRedis (server + leases)
+    redis_db               function  a logical database of its own for the test (RedisConfig)
+
+Override `testing_postgres_master_db`, `testing_postgres_options` or
+`testing_postgres_migrate` (`testing_redis_config`, `testing_redis_options`) in your
+conftest to configure them.
+
+The plugin is loaded by every pytest run, so psycopg and pydantic are only imported
+once a fixture is used.
+"""
+
+import itertools
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from psycopg import Connection
+
+    from testing_containers.models import ContainerOptions, DBConfig, RedisConfig, RedisOptions
+    from testing_containers.postgres.database_pool import DatabasePool
+    from testing_containers.postgres.postgres_manager import PostgresManager
+    from testing_containers.postgres.testing_postgres import TestingPostgres
+    from testing_containers.redis.testing_redis import TestingRedis
+
+POOL_SIZE_INI = "testing_postgres_pool_size"
+
+_module_dbs = itertools.count()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    parser.addini(
+        POOL_SIZE_INI,
+        "Fresh databases kept ready for the postgres_function_db fixture",
+        default="2",
+    )
+
+
+@pytest.fixture(scope="session")
+def testing_postgres_master_db() -> "DBConfig | None":
+    """An existing server to use; a Docker container is started when None or unreachable."""
+    return None
+
+
+@pytest.fixture(scope="session")
+def testing_postgres_options() -> "ContainerOptions":
+    from testing_containers.models import ContainerOptions
+
+    return ContainerOptions()
+
+
+@pytest.fixture(scope="session")
+def testing_postgres_migrate() -> "Callable[[DBConfig], None] | None":
+    """Migrations run once into the template every database is cloned from."""
+    return None
+
+
+@pytest.fixture(scope="session")
+def testing_postgres(
+    testing_postgres_master_db: "DBConfig | None",
+    testing_postgres_options: "ContainerOptions",
+    testing_postgres_migrate: "Callable[[DBConfig], None] | None",
+) -> "Iterator[TestingPostgres]":
+    from testing_containers.postgres.testing_postgres import TestingPostgres
+
+    pg = TestingPostgres(
+        master_db=testing_postgres_master_db,
+        options=testing_postgres_options,
+        migrate=testing_postgres_migrate,
+    )
+    yield pg
+    pg.stop()
+
+
+@pytest.fixture(scope="session")
+def postgres_db(testing_postgres: "TestingPostgres") -> "DBConfig":
+    return testing_postgres.postgres.testdb
+
+
+def _create_database(manager: "PostgresManager", db_name: str) -> "DBConfig":
+    """`db_name` cloned from the template if there is one, empty otherwise."""
+    if manager.template is not None:
+        return manager.clone_database(db_name)
+    manager.drop_database(db_name)
+    manager.create_database(db_name)
+    return manager._db_config(db_name)
+
+
+@pytest.fixture(scope="module")
+def postgres_module_db(testing_postgres: "TestingPostgres") -> "Iterator[DBConfig]":
+    manager = testing_postgres.postgres
+    db = _create_database(manager, f"{manager.testdb.name}_module_{next(_module_dbs)}")
+    yield db
+    manager.drop_database(db.name)
+
+
+@pytest.fixture(scope="session")
+def _testing_postgres_database_pool(
+    pytestconfig: pytest.Config, testing_postgres: "TestingPostgres"
+) -> "Iterator[DatabasePool]":
+    from testing_containers.postgres.database_pool import DatabasePool
+
+    size = int(pytestconfig.getini(POOL_SIZE_INI))
+    with DatabasePool(testing_postgres.postgres, size=size) as pool:
+        yield pool
+
+
+@pytest.fixture
+def postgres_function_db(
+    _testing_postgres_database_pool: "DatabasePool",
+) -> "Iterator[DBConfig]":
+    with _testing_postgres_database_pool.leased() as db:
+        yield db
+
+
+@pytest.fixture
+def postgres_conn(testing_postgres: "TestingPostgres") -> "Iterator[Connection]":
+    """A pooled connection; its open transaction is rolled back and its tables emptied after."""
+    manager = testing_postgres.postgres
+    with manager.pool().connection() as conn:
+        yield conn
+    manager.reset()
+
+
+@pytest.fixture(scope="session")
+def testing_redis_config() -> "RedisConfig | None":
+    """An existing server to use; a Docker container is started when None or unreachable."""
+    return None
+
+
+@pytest.fixture(scope="session")
+def testing_redis_options() -> "RedisOptions":
+    from testing_containers.models import RedisOptions
+
+    return RedisOptions()
+
+
+@pytest.fixture(scope="session")
+def testing_redis(
+    testing_redis_config: "RedisConfig | None", testing_redis_options: "RedisOptions"
+) -> "Iterator[TestingRedis]":
+    from testing_containers.redis.testing_redis import TestingRedis
+
+    redis = TestingRedis(config=testing_redis_config, options=testing_redis_options)
+    yield redis
+    redis.stop()
+
+
+@pytest.fixture
+def redis_db(testing_redis: "TestingRedis") -> "Iterator[RedisConfig]":
+    """A logical database leased for the test, flushed when it is handed back."""
+    with testing_redis.leased() as db:
+        yield db
@@ -0,0 +1,158 @@
+"""Cheap host-side readiness probes and a backoff loop to poll them."""
+
+import asyncio
+import random
+import socket
+import struct
+import time
+from collections.abc import Awaitable, Callable, Iterator
+
+_PG_PROTOCOL_VERSION = 196608  # 3.0
+_PG_CANNOT_CONNECT_NOW = "57P03"  # "the database system is starting up"
+
+
+class Backoff:
+    """Jittered exponential backoff: starts in the tens of milliseconds, capped at `maximum`."""
+
+    def __init__(
+        self, initial: float = 0.02, factor: float = 2.0, maximum: float = 1.0, jitter: float = 0.5
+    ):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+        self.jitter = jitter
+
+    def delays(self) -> Iterator[float]:
+        delay = self.initial
+        while True:
+            yield delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+            delay = min(delay * self.factor, self.maximum)
+
+
+def wait_until(
+    probe: Callable[[], bool], timeout: float = 60.0, backoff: Backoff | None = None
+) -> bool:
+    """Polls `probe` with backoff until it returns True or `timeout` seconds have passed."""
+    deadline = time.monotonic() + timeout
+    for delay in (backoff or Backoff()).delays():
+        if probe():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+    return False
+
+
+async def async_wait_until(
+    probe: Callable[[], Awaitable[bool]], timeout: float = 60.0, backoff: Backoff | None = None
+) -> bool:
+    """Asyncio flavour of `wait_until`: sleeps without blocking the event loop."""
+    deadline = time.monotonic() + timeout
+    for delay in (backoff or Backoff()).delays():
+        if await probe():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        await asyncio.sleep(min(delay, remaining))
+    return False
+
+
+def is_port_open(host: str, port: int, timeout: float = 1.0, settle: float = 0.1) -> bool:
+    """Checks that something accepts TCP connections on host:port and keeps them open.
+
+    Docker's port proxy accepts a connection to a published port as soon as the container
+    runs, then closes it when nothing listens in the container: a connection closed (or
+    reset) within `settle` seconds, without sending anything, means the port is not open.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.settimeout(settle)
+            try:
+                return sock.recv(1, socket.MSG_PEEK) != b""
+            except TimeoutError:
+                return True  # still connected, waiting for the client to talk
+    except OSError:
+        return False
+
+
+def free_port() -> int:
+    """A TCP port of the loopback interface that nothing listens on (for a local server)."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port: int = sock.getsockname()[1]
+        return port
+
+
+def _startup_message(user: str, database: str) -> bytes:
+    params = f"user\0{user}\0database\0{database}\0\0".encode()
+    return struct.pack("!ii", 8 + len(params), _PG_PROTOCOL_VERSION) + params
+
+
+def _error_code(body: bytes) -> str | None:
+    """The SQLSTATE ('C' field) of an ErrorResponse body."""
+    for field in body.split(b"\0"):
+        if field[:1] == b"C":
+            return field[1:].decode()
+    return None
+
+
+def is_postgres_accepting(
+    host: str, port: int, user: str = "postgres", database: str = "postgres", timeout: float = 1.0
+) -> bool:
+    """Checks that the PostgreSQL server accepts connections, the way `pg_isready` does.
+
+    A startup message is sent and the first reply inspected: an authentication request,
+    or any error but "the database system is starting up", means the server is up.
+    A connection closed without a reply (e.g. by Docker's port proxy) means it is not.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(_startup_message(user, database))
+            reply = sock.recv(4096)
+    except OSError:
+        return False
+    return _is_accepting_reply(reply)
+
+
+async def is_postgres_accepting_async(
+    host: str, port: int, user: str = "postgres", database: str = "postgres", timeout: float = 1.0
+) -> bool:
+    """Asyncio flavour of `is_postgres_accepting`."""
+    try:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    try:
+        writer.write(_startup_message(user, database))
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(4096), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return False
+    finally:
+        writer.close()
+    return _is_accepting_reply(reply)
+
+
+def _is_accepting_reply(reply: bytes) -> bool:
+    if reply[:1] == b"R":
+        return True
+    if reply[:1] == b"E":
+        return _error_code(reply[5:]) != _PG_CANNOT_CONNECT_NOW
+    return False
+
+
+def is_redis_accepting(host: str, port: int, timeout: float = 1.0) -> bool:
+    """Checks that the Redis server answers commands, the way `redis-cli ping` does.
+
+    A PONG, or an authentication error, means the server is up. "-LOADING" (the dataset
+    is still being loaded) or a connection closed without a reply means it is not.
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout) as sock:
+            sock.sendall(b"PING\r\n")
+            reply = sock.recv(4096)
+    except OSError:
+        return False
+    return reply.startswith((b"+PONG", b"-NOAUTH"))
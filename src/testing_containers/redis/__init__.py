@@ -0,0 +1,36 @@
+"""Redis-specific service managers and test helpers.
+
+The classes are imported on first access (PEP 562), like in the parent package.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .redis_client import RedisClient, RedisError
+    from .testing_redis import TestingRedis
+
+# Public name -> module defining it
+_LAZY_ATTRIBUTES = {
+    "RedisClient": ".redis_client",
+    "RedisError": ".redis_client",
+    "TestingRedis": ".testing_redis",
+}
+
+__all__ = [
+    "RedisClient",
+    "RedisError",
+    "TestingRedis",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
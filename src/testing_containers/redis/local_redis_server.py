@@ -0,0 +1,110 @@
+import atexit
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from testing_containers import timing
+from testing_containers.models import RedisConfig, RedisOptions
+from testing_containers.readiness import Backoff, free_port, is_redis_accepting, wait_until
+
+from .redis_docker_container import redis_server_args
+
+REDIS_SERVER_ENV = "TESTING_CONTAINERS_REDIS_SERVER"
+# A tmpfs on most Linux hosts
+SHM_DIR = "/dev/shm"
+
+
+def find_redis_server(redis_server_bin: str | None = None) -> Path | None:
+    """The `redis-server` binary, or None when it cannot be found.
+
+    Looked up as `redis_server_bin`, then $TESTING_CONTAINERS_REDIS_SERVER, then in PATH.
+    """
+    for candidate in (redis_server_bin, os.environ.get(REDIS_SERVER_ENV), "redis-server"):
+        found = candidate and shutil.which(candidate)
+        if found:
+            return Path(found)
+    return None
+
+
+class LocalRedisServer:
+    """A throwaway Redis server run from the local `redis-server` binary, without Docker.
+
+    It listens on a free loopback port, with persistence off and its working directory
+    in a temporary directory (on tmpfs when /dev/shm is there). It is not shared with
+    other processes and is killed when stopped (or when the process exits).
+    It has the interface of `RedisDockerContainer` that `TestingRedis` uses.
+    """
+
+    # Each pytest-xdist worker runs its own server: stop it along with the worker
+    shared = False
+
+    def __init__(self, options: RedisOptions, binary: Path | None = None):
+        self.options = options
+        found = binary or find_redis_server(options.redis_server_bin)
+        if found is None:
+            raise RuntimeError("redis-server not found: set redis_server_bin or add it to PATH.")
+        self.binary = found
+        self.config = RedisConfig(host="127.0.0.1", port=free_port())
+        self.process: subprocess.Popen[bytes] | None = None
+        self.work_dir: Path | None = None
+
+    @staticmethod
+    def is_available(options: RedisOptions) -> bool:
+        return find_redis_server(options.redis_server_bin) is not None
+
+    @timing.timed("local_redis.start")
+    def start_container(self) -> None:
+        parent = SHM_DIR if os.access(SHM_DIR, os.W_OK) else None
+        self.work_dir = Path(tempfile.mkdtemp(prefix="testing-redis-", dir=parent))
+        atexit.register(self.stop_container)
+        self.process = subprocess.Popen(
+            [
+                str(self.binary),
+                "--bind",
+                self.config.host,
+                "--port",
+                str(self.config.port),
+                "--dir",
+                str(self.work_dir),
+                *redis_server_args(self.options),
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        print(f"🧱 Local Redis server started on port {self.config.port}")
+
+    @timing.timed("local_redis.stop")
+    def stop_container(self) -> None:
+        """Kills the server and removes its working directory."""
+        if self.process is None:
+            return
+        process, self.process = self.process, None
+        atexit.unregister(self.stop_container)
+        process.kill()
+        process.wait()
+        if self.work_dir is not None:
+            shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    @timing.timed("local_redis.wait_ready")
+    def is_redis_ready(self, timeout: float = 10.0, backoff: Backoff | None = None) -> bool:
+        """Waits until the local server answers commands (and gives up if it exited)."""
+        answered = wait_until(
+            lambda: self._exited() or is_redis_accepting(self.config.host, self.config.port),
+            timeout=timeout,
+            backoff=backoff,
+        )
+        return answered and not self._exited()
+
+    def _exited(self) -> bool:
+        return self.process is None or self.process.poll() is not None
+
+    def ensure_redis_is_ready(self) -> None:
+        """Starts the server and makes sure it answers commands."""
+        self.start_container()
+
+        if not self.is_redis_ready():
+            print("⚠️  Local Redis server is not ready.")
+            sys.exit(1)
@@ -0,0 +1,127 @@
+import socket
+import threading
+from collections.abc import Sequence
+from typing import Any, BinaryIO
+
+from testing_containers.models import RedisConfig
+
+Command = Sequence[str | int | bytes]
+
+
+class RedisError(RuntimeError):
+    """An error reply of the Redis server (e.g. "ERR DB index is out of range")."""
+
+
+class RedisClient:
+    """A minimal Redis client speaking RESP2 over a single connection.
+
+    It only serves the bookkeeping of `TestingRedis` (leases, FLUSHDB), so that the
+    library does not depend on a Redis client package: tests bring their own.
+    """
+
+    def __init__(self, config: RedisConfig, timeout: float = 5.0):
+        self.config = config
+        self.timeout = timeout
+        self._sock: socket.socket | None = None
+        self._reader: BinaryIO | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> BinaryIO:
+        if self._reader is not None:
+            return self._reader
+        self._sock = socket.create_connection((self.config.host, self.config.port), self.timeout)
+        self._reader = self._sock.makefile("rb")
+        handshake: list[Command] = []
+        if self.config.password:
+            handshake.append(["AUTH", self.config.password])
+        if self.config.db:
+            handshake.append(["SELECT", self.config.db])
+        for command in handshake:
+            self._send([command])
+            reply = self._read_reply(self._reader)
+            if isinstance(reply, RedisError):
+                # e.g. a wrong password: every later command would fail (or hit database 0)
+                self.close()
+                raise reply
+        return self._reader
+
+    def close(self) -> None:
+        if self._reader is not None:
+            self._reader.close()
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._reader = None
+
+    def __enter__(self) -> "RedisClient":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    @staticmethod
+    def _encode(command: Command) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _send(self, commands: list[Command]) -> None:
+        assert self._sock is not None
+        self._sock.sendall(b"".join(self._encode(command) for command in commands))
+
+    def _read_reply(self, reader: BinaryIO) -> Any:
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Redis closed the connection.")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            return RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind in (b"$", b"*"):
+            length = int(payload)
+            if length < 0:  # nil bulk string or array
+                return None
+            if kind == b"$":
+                return reader.read(length + 2)[:-2].decode()
+            return [self._read_reply(reader) for _ in range(length)]
+        raise ConnectionError(f"Unexpected reply from Redis: {line!r}")
+
+    def pipeline(self, *commands: Command) -> list[Any]:
+        """Sends the commands in one round trip and returns their replies, in order.
+
+        Raises the first error reply, once every reply has been read.
+        """
+        with self._lock:
+            try:
+                reader = self._connect()
+                self._send(list(commands))
+                replies = [self._read_reply(reader) for _ in commands]
+            except OSError:
+                self.close()  # reconnect on the next call
+                raise
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def execute(self, *command: str | int | bytes) -> Any:
+        return self.pipeline(command)[0]
+
+    def ping(self) -> bool:
+        return bool(self.execute("PING") == "PONG")
+
+    def flushdb(self, db: int | None = None, asynchronous: bool = True) -> None:
+        """Empties the logical database `db` (the connection's one if None).
+
+        ASYNC only unlinks the keys: the database is empty at once and the memory is
+        freed by a background thread, so the reset does not depend on the data size.
+        """
+        flush: Command = ["FLUSHDB", "ASYNC"] if asynchronous else ["FLUSHDB"]
+        if db is None or db == self.config.db:
+            self.pipeline(flush)
+        else:
+            self.pipeline(["SELECT", db], flush, ["SELECT", self.config.db])
@@ -0,0 +1,53 @@
+import sys
+
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import RedisConfig, RedisOptions
+from testing_containers.readiness import Backoff, is_redis_accepting
+from testing_containers.service_container import ServiceDockerContainer, expose_port
+
+CONTAINER_NAME = "testing-redis"
+REDIS_PORT = 6379
+
+# Test data is disposable: no RDB snapshots, no append-only file
+NO_PERSISTENCE_ARGS = ["--save", "", "--appendonly", "no"]
+
+
+def redis_server_args(options: RedisOptions) -> list[str]:
+    """The `redis-server` arguments for `options`: persistence off, `databases` logical DBs."""
+    args = [*NO_PERSISTENCE_ARGS, "--databases", str(options.databases)]
+    for key, value in options.server_settings.items():
+        args += [f"--{key}", value]
+    return args
+
+
+class RedisDockerContainer(ServiceDockerContainer):
+    service = "redis"
+    label = "Redis"
+    service_port = REDIS_PORT
+
+    def __init__(self, options: RedisOptions, port: int | None = None):
+        # No port: Docker picks a free one, read back once the container is started
+        port = port or options.port
+        self.config = RedisConfig(port=port or 0)
+        container = DockerContainer(
+            container_name=options.name or CONTAINER_NAME,
+            image=options.image or "redis:7.2",
+            expose_ports=[expose_port(REDIS_PORT, port)],
+            command=["redis-server", *redis_server_args(options)],
+            run_args=options.run_args,
+            run_scoped=options.run_scoped,
+        )
+        super().__init__(options, container, self.config)
+
+    def is_redis_ready(self, timeout: float = 30.0, backoff: Backoff | None = None) -> bool:
+        """Waits until Redis inside the Docker container answers commands."""
+        return self._wait_ready(
+            lambda: is_redis_accepting(self.config.host, self.config.port), timeout, backoff
+        )
+
+    def ensure_redis_is_ready(self) -> None:
+        """Ensures Docker and Redis are ready to use."""
+        self.start_container()
+
+        if not self.is_redis_ready():
+            sys.exit(1)
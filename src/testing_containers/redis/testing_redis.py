@@ -0,0 +1,138 @@
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from testing_containers import timing, workers
+from testing_containers.models import RedisConfig, RedisOptions
+from testing_containers.readiness import is_redis_accepting
+from testing_containers.service_container import container_options, is_last_worker, stop_service
+
+from .local_redis_server import LocalRedisServer
+from .redis_client import RedisClient, RedisError
+from .redis_docker_container import CONTAINER_NAME, RedisDockerContainer
+
+# Database 0 holds the leases of the other logical databases: one key per leased index
+LEASE_KEY_PREFIX = "testing-containers:lease:"
+# A lease left behind by a killed test run expires eventually
+LEASE_TTL = 24 * 3600
+
+
+class TestingRedis:
+    """A Redis server for tests, with one logical database per pytest-xdist worker or test.
+
+    Every logical database but 0 is leased through an atomic `SET NX` in database 0, so
+    workers, tests and concurrent runs sharing one server never share a database.
+    Databases are emptied with `FLUSHDB ASYNC` when leased and released, and `reset()`
+    empties the worker's own database (`db`) between tests.
+    """
+
+    __test__ = False  # tell pytest this is not a test class
+    _redis_container: RedisDockerContainer | LocalRedisServer | None
+
+    def __init__(self, config: RedisConfig | None = None, options: RedisOptions | None = None):
+        self.options = options or RedisOptions()
+        self._redis_container = None
+        self._setup(config)
+
+    @timing.timed("testing_redis.setup")
+    def _setup(self, config: RedisConfig | None) -> None:
+        if config is not None and is_redis_accepting(config.host, config.port):
+            server = config
+        else:
+            self._redis_container = self._create_redis_container(self.options)
+            server = self._redis_container.config
+        self.server = server.model_copy(update={"db": 0})
+        self.client = RedisClient(self.server)
+        self.databases = self._count_databases()
+        self.db = self.lease()
+
+    def _count_databases(self) -> int:
+        """The `databases` setting of the server (the options' one if CONFIG is disabled)."""
+        try:
+            reply = self.client.execute("CONFIG", "GET", "databases")
+        except RedisError:
+            return self.options.databases
+        return int(reply[1]) if reply else self.options.databases
+
+    @staticmethod
+    def _lease_owner() -> str:
+        return f"{workers.run_id()}:{workers.worker_id() or 'main'}:{os.getpid()}"
+
+    @timing.timed("testing_redis.lease")
+    def lease(self) -> RedisConfig:
+        """Claims a free logical database, emptied, until `release()`."""
+        owner = self._lease_owner()
+        for index in range(1, self.databases):
+            claimed = self.client.execute(
+                "SET", f"{LEASE_KEY_PREFIX}{index}", owner, "NX", "EX", LEASE_TTL
+            )
+            if claimed == "OK":
+                # Whatever a killed run left in there
+                self.client.flushdb(index)
+                return self.server.model_copy(update={"db": index})
+        raise RuntimeError(
+            f"All {self.databases - 1} logical databases are leased: "
+            "raise `databases` in RedisOptions (or in the server configuration)."
+        )
+
+    def release(self, db: RedisConfig) -> None:
+        """Empties the leased database and hands it back."""
+        self.client.pipeline(
+            ["SELECT", db.db],
+            ["FLUSHDB", "ASYNC"],
+            ["SELECT", 0],
+            ["DEL", f"{LEASE_KEY_PREFIX}{db.db}"],
+        )
+
+    @contextmanager
+    def leased(self) -> Iterator[RedisConfig]:
+        """A logical database of its own for the duration of the block (e.g. a test)."""
+        db = self.lease()
+        try:
+            yield db
+        finally:
+            self.release(db)
+
+    @timing.timed("testing_redis.reset")
+    def reset(self) -> None:
+        """Empties the worker's database (`db`)."""
+        self.client.flushdb(self.db.db)
+
+    def _run_leases(self) -> list[str]:
+        """Lease keys still held by the workers of this test run."""
+        keys: list[str] = self.client.execute("KEYS", f"{LEASE_KEY_PREFIX}*")
+        if not keys:
+            return []
+        owners: list[Any] = self.client.execute("MGET", *keys)
+        run_id = workers.run_id()
+        return [
+            key
+            for key, owner in zip(keys, owners, strict=True)
+            if owner is not None and owner.startswith(f"{run_id}:")
+        ]
+
+    @timing.timed("testing_redis.stop")
+    def stop(self) -> None:
+        self.release(self.db)
+        last_worker = is_last_worker(self.options.run_scoped, self._run_leases)
+        self.client.close()
+        stop_service(self._redis_container, last_worker)
+
+    def _create_redis_container(
+        self, options: RedisOptions
+    ) -> RedisDockerContainer | LocalRedisServer:
+        options = container_options(options, CONTAINER_NAME)
+        redis_container: RedisDockerContainer | LocalRedisServer
+        redis_container = RedisDockerContainer(options=options)
+        if options.backend == "local" or (
+            options.backend == "auto"
+            and not redis_container.container.is_docker_ready()
+            and LocalRedisServer.is_available(options)
+        ):
+            if options.backend == "auto":
+                print("🧱 Docker is not available, using the local redis-server instead.")
+            redis_container = LocalRedisServer(options=options)
+        redis_container.ensure_redis_is_ready()
+
+        return redis_container
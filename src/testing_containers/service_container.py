@@ -0,0 +1,182 @@
+"""What the Docker containers of the services (Postgres, Redis) have in common.
+
+A service container is found by name, so the pytest-xdist workers of a run share it: it is
+named after the namespace (and the run id when run-scoped), its server port is published on
+the host (on a free port Docker picks when none is set) and the last worker stops it.
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable, Callable
+from typing import Any, Protocol, TypeVar
+
+from testing_containers import timing, workers
+from testing_containers.async_docker_container import AsyncDockerContainer
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerOptions, ContainerState, RedisOptions
+from testing_containers.readiness import Backoff, async_wait_until, wait_until
+
+OptionsT = TypeVar("OptionsT", ContainerOptions, RedisOptions)
+
+
+class _Server(Protocol):
+    """The connection info (e.g. a DBConfig) pointed at the published port."""
+
+    port: int
+
+
+class _ServiceContainer(Protocol):
+    shared: bool
+
+    def stop_container(self) -> None: ...
+
+
+def container_name(base: str, namespace: str | None, run_scoped: bool = False) -> str:
+    name = base
+    if namespace:
+        name = f"{namespace}-{name}"
+    if run_scoped:
+        # Shared by the xdist workers of this run, distinct from any other run
+        name = f"{name}-{workers.run_id()[:8]}"
+    return name
+
+
+def container_options(options: OptionsT, base_name: str) -> OptionsT:
+    """`options` completed with the container name (and, if run-scoped, its lifecycle)."""
+    update: dict[str, Any] = {
+        "name": options.name or container_name(base_name, options.namespace, options.run_scoped)
+    }
+    if options.run_scoped:
+        update.update(should_stop=True, remove_on_stop=True)
+        if "port" not in options.model_fields_set:
+            update["port"] = None
+    return options.model_copy(update=update)
+
+
+def is_last_worker(run_scoped: bool, run_in_use: Callable[[], object]) -> bool:
+    """Whether this process is the last one of its run to use the service.
+
+    A run-scoped container is removed by the last xdist worker of the run: the one that
+    finds nothing of the run left in use (`run_in_use`, e.g. the other workers' databases).
+    """
+    return workers.worker_id() is None or (run_scoped and not run_in_use())
+
+
+def expose_port(service_port: int, port: int | None) -> str:
+    """The `expose_ports` entry publishing `service_port` on `port` (a free one if None)."""
+    return f"{port}:{service_port}" if port else str(service_port)
+
+
+def stop_service(container: _ServiceContainer | None, last_worker: bool) -> None:
+    """Stops the service container (as its options say) unless other workers still use it."""
+    if container is None:
+        return
+    if container.shared and not last_worker:
+        print("Container is shared with the other pytest-xdist workers, leaving it up.")
+        return
+    container.stop_container()
+
+
+async def stop_service_async(
+    container: "AsyncServiceDockerContainer | None", last_worker: bool
+) -> None:
+    """Asyncio flavour of `stop_service`."""
+    definition = container._definition if container is not None else None
+    await asyncio.to_thread(stop_service, definition, last_worker)
+
+
+class ServiceDockerContainer:
+    """A `DockerContainer` running one server, whose `service_port` is published on the host."""
+
+    # The container is found by name, so pytest-xdist workers all use the same one
+    shared = True
+    service: str  # e.g. "postgres", the prefix of the timing spans
+    label: str  # e.g. "PostgreSQL", in the messages
+    service_port: int  # the port the server listens on in the container
+
+    def __init__(
+        self, options: ContainerOptions | RedisOptions, container: DockerContainer, server: _Server
+    ):
+        self.options = options
+        self.container = container
+        self._server = server
+
+    def stop_container(self) -> None:
+        with timing.span(f"{self.service}_container.stop_container"):
+            if self.options.should_stop:
+                self.container.stop_container()
+                if self.options.remove_on_stop:
+                    self.container.remove_container()
+
+    def start_container(self) -> None:
+        with timing.span(f"{self.service}_container.start_container"):
+            if not self.container.is_docker_ready():
+                sys.exit(1)
+
+            self._prepare_start()
+            self.container.start_container()
+            self.use_published_port(self.container.get_state(refresh=True))
+
+    def _prepare_start(self) -> None:
+        """Called once Docker answers, right before the container is started."""
+
+    def use_published_port(self, state: ContainerState) -> None:
+        """Point the server's connection info at the host port it is actually published on."""
+        published = state.host_port(self.service_port)
+        if published is not None:
+            self._server.port = published
+        elif not self._server.port:
+            raise RuntimeError(f"Container {state.name} publishes no port for {self.service_port}.")
+
+    def _wait_ready(
+        self, accepting: Callable[[], bool], timeout: float, backoff: Backoff | None
+    ) -> bool:
+        with timing.span(f"{self.service}_container.wait_ready"):
+            print(f"Waiting for {self.label} to be ready...")
+            return self._report_ready(
+                wait_until(accepting, timeout=timeout, backoff=backoff), timeout
+            )
+
+    def _report_ready(self, ready: bool, timeout: float) -> bool:
+        if ready:
+            print(f"✅ {self.label} is ready!")
+            return True
+
+        print(f"⚠️  {self.label} is not ready after {timeout}s.")
+        return False
+
+
+class AsyncServiceDockerContainer:
+    """Asyncio counterpart of `ServiceDockerContainer`, driving the same definition.
+
+    Docker is called through an `AsyncDockerContainer`; the definition's own blocking
+    steps (e.g. stopping the container) run in a worker thread.
+    """
+
+    def __init__(self, definition: ServiceDockerContainer):
+        self._definition = definition
+        self.options = definition.options
+        self.shared = definition.shared
+        self.container = AsyncDockerContainer(definition.container)
+
+    async def stop_container(self) -> None:
+        await asyncio.to_thread(self._definition.stop_container)
+
+    async def start_container(self) -> None:
+        definition = self._definition
+        with timing.span(f"{definition.service}_container.start_container"):
+            if not await self.container.is_docker_ready():
+                sys.exit(1)
+
+            await asyncio.to_thread(definition._prepare_start)
+            await self.container.start_container()
+            definition.use_published_port(await self.container.get_state())
+
+    async def _wait_ready(
+        self, accepting: Callable[[], Awaitable[bool]], timeout: float, backoff: Backoff | None
+    ) -> bool:
+        definition = self._definition
+        with timing.span(f"{definition.service}_container.wait_ready"):
+            print(f"Waiting for {definition.label} to be ready...")
+            ready = await async_wait_until(accepting, timeout=timeout, backoff=backoff)
+            return definition._report_ready(ready, timeout)
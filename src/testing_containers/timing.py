@@ -0,0 +1,142 @@
+"""Timing spans around the phases of provisioning (docker start, readiness, migrations...).
+
+Every finished span is passed to the registered listeners and added to the count/total/max
+of its phase. The spans themselves (the newest MAX_RECORDED_SPANS) are only kept once
+`record()` is called or TESTING_CONTAINERS_TIMING_REPORT is set: some phases run for every
+test. Set TESTING_CONTAINERS_TIMING_REPORT to a file path to get the JSON report written
+there when the process exits (one file per pytest-xdist worker).
+"""
+
+import atexit
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+from testing_containers import workers
+from testing_containers.models import Span
+
+REPORT_ENV_VAR = "TESTING_CONTAINERS_TIMING_REPORT"
+MAX_RECORDED_SPANS = 10_000
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+_current: ContextVar[Span | None] = ContextVar("testing_containers_span", default=None)
+_ids = itertools.count(1)
+_lock = threading.Lock()
+_spans: deque[Span] = deque(maxlen=MAX_RECORDED_SPANS)
+_phases: dict[str, dict[str, Any]] = {}  # name -> count/total/max duration
+_recording = False
+_listeners: list[Callable[[Span], None]] = []
+
+
+def add_listener(listener: Callable[[Span], None]) -> None:
+    """Call `listener` with every span as soon as it finishes."""
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Span], None]) -> None:
+    _listeners.remove(listener)
+
+
+def record(enabled: bool = True) -> None:
+    """Keep the finished spans for `spans()` and the report, not only their phase totals."""
+    global _recording  # noqa: PLW0603
+    _recording = enabled
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span]:
+    """Time the enclosed block as the phase `name`, nested under the current span."""
+    parent = _current.get()
+    current = Span(
+        id=next(_ids),
+        parent_id=parent.id if parent else None,
+        name=name,
+        start=time.time(),
+        thread=threading.current_thread().name,
+        attributes=attributes,
+    )
+    token = _current.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration = time.perf_counter() - started
+        _current.reset(token)
+        with _lock:
+            phase = _phases.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            phase["count"] += 1
+            phase["total"] += current.duration
+            phase["max"] = max(phase["max"], current.duration)
+            if _recording or os.environ.get(REPORT_ENV_VAR):
+                _spans.append(current)
+        for listener in list(_listeners):
+            listener(current)
+
+
+def timed(name: str) -> Callable[[Callable[P, R]], Callable[P, R]]:
+    """Decorator running the function inside `span(name)`."""
+
+    def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def spans() -> list[Span]:
+    """The spans recorded so far (see `record()`), in completion order."""
+    with _lock:
+        return list(_spans)
+
+
+def clear() -> None:
+    with _lock:
+        _spans.clear()
+        _phases.clear()
+
+
+def report() -> dict[str, Any]:
+    """Count/total/max duration per phase, plus the recorded spans."""
+    with _lock:
+        phases = {name: dict(phase) for name, phase in _phases.items()}
+    return {
+        "created": time.time(),
+        "phases": phases,
+        "spans": [s.model_dump() for s in sorted(spans(), key=lambda s: s.start)],
+    }
+
+
+def write_report(path: str | Path) -> None:
+    Path(path).write_text(json.dumps(report(), indent=2))
+
+
+def _write_report_at_exit() -> None:
+    path = os.environ.get(REPORT_ENV_VAR)
+    if not path or not _phases:
+        return
+    worker = workers.worker_id()
+    if worker is not None:
+        # One report per pytest-xdist worker, e.g. timing.gw0.json
+        path = str(Path(path).with_suffix(f".{worker}{Path(path).suffix}"))
+    write_report(path)
+
+
+atexit.register(_write_report_at_exit)
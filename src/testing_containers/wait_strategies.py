@@ -0,0 +1,192 @@
+"""What `DockerContainer.start_container()` waits for before a service is considered ready.
+
+    redis = DockerContainer(
+        image="redis:7",
+        container_name="test-redis",
+        expose_ports=["6379:6379"],
+        wait_for=WaitForLog(r"Ready to accept connections"),
+    )
+
+Every strategy has a `timeout` (its deadline, in seconds) and polls with a `Backoff`;
+`WaitForLog` streams the container output instead of polling it.
+"""
+
+import abc
+import contextlib
+import re
+import time
+import urllib.error
+import urllib.request
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from testing_containers.docker_engine import DockerEngineError
+from testing_containers.readiness import Backoff, is_port_open, wait_until
+
+if TYPE_CHECKING:
+    from testing_containers.docker_container import DockerContainer
+
+
+class WaitStrategy(abc.ABC):
+    """Polls `probe` with backoff until it succeeds or `timeout` seconds have passed."""
+
+    def __init__(self, timeout: float = 60.0, backoff: Backoff | None = None):
+        self.timeout = timeout
+        self.backoff = backoff
+
+    @abc.abstractmethod
+    def probe(self, container: "DockerContainer") -> bool:
+        """Whether the service is ready now."""
+
+    def wait(self, container: "DockerContainer") -> bool:
+        return wait_until(lambda: self.probe(container), self.timeout, self.backoff)
+
+    def __str__(self) -> str:
+        return type(self).__name__
+
+
+def _host_port(container: "DockerContainer", port: int) -> int | None:
+    """The host port `port` is published on; looked up until the container publishes it."""
+    return container.get_state().host_port(port)
+
+
+class WaitForPort(WaitStrategy):
+    """The published `port` (a container port) accepts TCP connections."""
+
+    def __init__(
+        self,
+        port: int,
+        host: str = "localhost",
+        timeout: float = 60.0,
+        backoff: Backoff | None = None,
+    ):
+        super().__init__(timeout, backoff)
+        self.port = port
+        self.host = host
+
+    def probe(self, container: "DockerContainer") -> bool:
+        host_port = _host_port(container, self.port)
+        return host_port is not None and is_port_open(self.host, host_port)
+
+    def __str__(self) -> str:
+        return f"port {self.port}"
+
+
+class WaitForHttp(WaitStrategy):
+    """An HTTP GET of `path` on the published `port` answers `status` (any 2xx/3xx if None)."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        path: str = "/",
+        port: int = 80,
+        status: int | None = None,
+        host: str = "localhost",
+        timeout: float = 60.0,
+        backoff: Backoff | None = None,
+    ):
+        super().__init__(timeout, backoff)
+        self.path = path if path.startswith("/") else f"/{path}"
+        self.port = port
+        self.status = status
+        self.host = host
+
+    def probe(self, container: "DockerContainer") -> bool:
+        host_port = _host_port(container, self.port)
+        if host_port is None:
+            return False
+        url = f"http://{self.host}:{host_port}{self.path}"
+        try:
+            with urllib.request.urlopen(url, timeout=1.0) as response:
+                code = int(response.status)
+        except urllib.error.HTTPError as e:
+            code = e.code
+        except (OSError, ValueError):
+            return False
+        if self.status is None:
+            return HTTPStatus.OK <= code < HTTPStatus.BAD_REQUEST
+        return code == self.status
+
+    def __str__(self) -> str:
+        return f"HTTP {self.path} on port {self.port}"
+
+
+class WaitForCommand(WaitStrategy):
+    """`command` exits with 0 when run inside the container (e.g. ["redis-cli", "ping"])."""
+
+    def __init__(self, command: list[str], timeout: float = 60.0, backoff: Backoff | None = None):
+        super().__init__(timeout, backoff)
+        self.command = command
+
+    def probe(self, container: "DockerContainer") -> bool:
+        return container.exec(self.command).returncode == 0
+
+    def __str__(self) -> str:
+        return f"`{' '.join(self.command)}`"
+
+
+class WaitForHealthcheck(WaitStrategy):
+    """Docker reports the container as healthy (it needs a HEALTHCHECK)."""
+
+    def probe(self, container: "DockerContainer") -> bool:
+        return container.get_state(refresh=True).health == "healthy"
+
+    def __str__(self) -> str:
+        return "healthcheck"
+
+
+class WaitForLog(WaitStrategy):
+    """The container output matches `pattern` (a regex) `times` times.
+
+    The output is streamed and matched as it is written. If the stream ends early (e.g.
+    the container is not running yet), it is reopened after a backoff delay.
+    """
+
+    def __init__(
+        self,
+        pattern: str | re.Pattern[str],
+        times: int = 1,
+        timeout: float = 60.0,
+        backoff: Backoff | None = None,
+    ):
+        super().__init__(timeout, backoff)
+        self.pattern = re.compile(pattern)
+        self.times = times
+
+    def _matched(self, container: "DockerContainer", deadline: float) -> bool:
+        matches = 0  # the stream starts over from the first line
+        timeout = max(deadline - time.monotonic(), 0.01)
+        with contextlib.closing(container.follow_logs(timeout)) as lines:
+            for line in lines:
+                if self.pattern.search(line):
+                    matches += 1
+                    if matches >= self.times:
+                        return True
+                if time.monotonic() >= deadline:
+                    return False
+        return False
+
+    def probe(self, container: "DockerContainer") -> bool:
+        """One pass over the output written so far (and until `timeout`)."""
+        try:
+            return self._matched(container, time.monotonic() + self.timeout)
+        except (TimeoutError, DockerEngineError):
+            return False
+
+    def wait(self, container: "DockerContainer") -> bool:
+        deadline = time.monotonic() + self.timeout
+        for delay in (self.backoff or Backoff()).delays():
+            try:
+                if self._matched(container, deadline):
+                    return True
+            except TimeoutError:
+                return False
+            except DockerEngineError:
+                pass  # no such container (yet)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+        return False
+
+    def __str__(self) -> str:
+        return f"log /{self.pattern.pattern}/"
@@ -0,0 +1,36 @@
+"""Helpers to tell pytest-xdist workers (and test runs) apart."""
+
+import os
+import uuid
+
+# pytest-xdist exports the worker id ("gw0", "gw1", ...) and a run id shared by all the
+# workers of one test session. Outside of xdist we fall back to a per-process run id.
+WORKER_ENV = "PYTEST_XDIST_WORKER"
+RUN_ID_ENV = "PYTEST_XDIST_TESTRUNUID"
+
+_process_run_id = uuid.uuid4().hex
+
+
+def worker_id() -> str | None:
+    """The xdist worker id of this process, or None when not running under xdist."""
+    return os.environ.get(WORKER_ENV) or None
+
+
+def run_id() -> str:
+    """An id shared by every worker of the current test run."""
+    return os.environ.get(RUN_ID_ENV) or _process_run_id
+
+
+def run_scoped_name(base: str) -> str:
+    """`base` suffixed with the run id when running under xdist, `base` otherwise."""
+    if worker_id() is None:
+        return base
+    return f"{base}_{run_id()[:8]}"
+
+
+def worker_scoped_name(base: str) -> str:
+    """`base` suffixed with the run id and worker id when running under xdist."""
+    worker = worker_id()
+    if worker is None:
+        return base
+    return f"{run_scoped_name(base)}_{worker}"
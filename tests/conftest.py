@@ -1,5 +1,14 @@
+import fnmatch
+import os
+import socketserver
+import threading
+
 import pytest
 
+from fake_docker_engine import FakeDockerEngine, serve
+
+pytest_plugins = ["pytester"]
+
 
 class DummyCompletedProcess:
     def __init__(self, returncode=0, stdout="", stderr=""):
@@ -14,7 +23,17 @@ def dummy_completed_process():
 
 
 @pytest.fixture
-def fake_run_success(monkeypatch, dummy_completed_process):
+def docker_cli(monkeypatch, tmp_path_factory):
+    """Put a (never run) `docker` executable on PATH, for tests faking the CLI calls."""
+    bin_dir = tmp_path_factory.mktemp("bin")
+    docker = bin_dir / "docker"
+    docker.write_text("#!/bin/sh\nexit 1\n")
+    docker.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+
+
+@pytest.fixture
+def fake_run_success(monkeypatch, docker_cli, dummy_completed_process):
     """Mock subprocess.run; configurable per-test via closure."""
     calls = []
 
@@ -28,7 +47,7 @@ def fake_run_success(monkeypatch, dummy_completed_process):
 
 
 @pytest.fixture
-def fake_run_fail(monkeypatch, dummy_completed_process):
+def fake_run_fail(monkeypatch, docker_cli, dummy_completed_process):
     """Mock subprocess.run; configurable per-test via closure."""
     calls = []
 
@@ -87,3 +106,99 @@ def fake_psycopg_connect(monkeypatch):
 
     monkeypatch.setattr("psycopg.connect", _fake_connect)
     return store
+
+
+@pytest.fixture
+def no_docker(monkeypatch, tmp_path):
+    """A machine without Docker: no docker CLI in PATH, no daemon socket."""
+    monkeypatch.setenv("PATH", str(tmp_path))
+    monkeypatch.setenv("DOCKER_HOST", f"unix://{tmp_path / 'docker.sock'}")
+
+
+# --- fake Docker Engine API served over a unix socket -------------------------
+
+
+@pytest.fixture
+def fake_docker_engine():
+    """Serve a FakeDockerEngine on a temporary unix socket."""
+    with serve(FakeDockerEngine()) as engine:
+        yield engine
+
+
+class FakeRedis:
+    """In-memory Redis server answering the commands used by the library (RESP2)."""
+
+    def __init__(self, databases=16):
+        self.databases = databases
+        self.data = {}  # db index -> {key: value}
+        self.commands = []  # every command received, as a list of strings
+        self.password = None
+        self.port = None
+
+    def handle(self, command, session):  # noqa: PLR0911
+        self.commands.append(command)
+        name, args = command[0].upper(), command[1:]
+        db = self.data.setdefault(session["db"], {})
+        if name == "PING":
+            return b"+PONG\r\n"
+        if name == "AUTH":
+            if args[-1] != self.password:
+                return b"-WRONGPASS invalid username-password pair\r\n"
+            return b"+OK\r\n"
+        if name == "SELECT":
+            if int(args[0]) >= self.databases:
+                return b"-ERR DB index is out of range\r\n"
+            session["db"] = int(args[0])
+            return b"+OK\r\n"
+        if name == "CONFIG":
+            return self._array(["databases", str(self.databases)])
+        if name == "SET":
+            if "NX" in args and args[0] in db:
+                return b"$-1\r\n"
+            db[args[0]] = args[1]
+            return b"+OK\r\n"
+        if name == "MGET":
+            return self._array([db.get(key) for key in args])
+        if name == "DEL":
+            return b":%d\r\n" % sum(db.pop(key, None) is not None for key in args)
+        if name == "KEYS":
+            return self._array([key for key in db if fnmatch.fnmatchcase(key, args[0])])
+        if name == "FLUSHDB":
+            db.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+    @staticmethod
+    def _array(items):
+        reply = b"*%d\r\n" % len(items)
+        for item in items:
+            reply += b"$-1\r\n" if item is None else b"$%d\r\n%s\r\n" % (len(item), item.encode())
+        return reply
+
+
+@pytest.fixture
+def fake_redis():
+    """Serve a FakeRedis on a free TCP port."""
+    redis = FakeRedis()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            session = {"db": 0}
+            while line := self.rfile.readline():
+                if not line.startswith(b"*"):  # inline command, e.g. a readiness probe
+                    self.wfile.write(redis.handle(line.decode().split(), session))
+                    continue
+                command = []
+                for _ in range(int(line[1:])):
+                    length = int(self.rfile.readline()[1:])
+                    command.append(self.rfile.read(length + 2)[:-2].decode())
+                self.wfile.write(redis.handle(command, session))
+
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    redis.port = server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield redis
+    server.shutdown()
+    server.server_close()
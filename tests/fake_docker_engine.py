@@ -0,0 +1,157 @@
+"""An in-memory Docker daemon answering the Engine API over a unix socket.
+
+It stands in for Docker (and Docker Hub) so that the container code paths run offline:
+the unit tests (through the `fake_docker_engine` fixture) and the benchmarks use it.
+"""
+
+import http.server
+import json
+import os
+import shutil
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+import urllib.parse
+from contextlib import contextmanager
+
+
+class FakeDockerEngine:
+    """In-memory Docker daemon answering the Engine API endpoints used by the library.
+
+    `latency` (seconds) is added to every request, to mimic a real daemon.
+    """
+
+    def __init__(self, socket_path=None, latency=0.0):
+        self.socket_path = socket_path or os.path.join(tempfile.mkdtemp(), "docker.sock")
+        self.latency = latency
+        self.requests = []  # (method, path) of every request received
+        self.containers = {}  # name -> inspect payload
+        self.images = set()
+        self.private_images = set()  # pulled only with the credentials of `docker login`
+        self.exec_result = (0, "", "")
+        self.logs = {}  # name -> output lines
+        self._execs = {}
+
+    def add_container(self, name, running=True, image="postgres:16.3"):
+        self.containers[name] = {
+            "Id": f"id-{name}",
+            "Name": f"/{name}",
+            "Image": f"sha256:{image}",
+            "Config": {"Image": image, "Labels": {}},
+            "State": {"Running": running, "Status": "running" if running else "exited"},
+            "NetworkSettings": {"Ports": {}},
+        }
+
+    def handle(self, method, path, query, body):  # noqa: PLR0911, PLR0912
+        self.requests.append((method, path))
+        time.sleep(self.latency)
+        parts = path.strip("/").split("/")
+        if path == "/_ping":
+            return 200, b"OK"
+        if parts[0] == "containers" and path == "/containers/create":
+            name = query["name"][0]
+            if body["Image"] not in self.images:
+                return 404, json.dumps({"message": f"No such image: {body['Image']}"}).encode()
+            if name in self.containers:
+                return 409, json.dumps({"message": "Conflict"}).encode()
+            self.add_container(name, running=False, image=body["Image"])
+            self.containers[name]["Config"]["Env"] = body["Env"]
+            self.containers[name]["Config"]["Labels"] = body.get("Labels") or {}
+            self.containers[name]["HostConfig"] = body.get("HostConfig") or {}
+            return 201, json.dumps({"Id": f"id-{name}"}).encode()
+        if parts[0] == "containers":
+            name = parts[1].removeprefix("id-")  # looked up by name or by id
+            if name not in self.containers:
+                return 404, json.dumps({"message": f"No such container: {name}"}).encode()
+            container = self.containers[name]
+            action = parts[2] if len(parts) > 2 else None
+            if method == "DELETE":
+                if container["State"]["Running"] and query.get("force") != ["true"]:
+                    return 409, json.dumps({"message": "container is running"}).encode()
+                del self.containers[name]
+                return 204, b""
+            if action == "json":
+                return 200, json.dumps(container).encode()
+            if action == "logs":
+                stream = b""
+                for line in self.logs.get(name, []):
+                    data = f"{line}\n".encode()
+                    stream += struct.pack(">BxxxL", 1, len(data)) + data
+                return 200, stream
+            if action == "start" and container["State"]["Running"]:
+                return 304, b""
+            if action in ("start", "stop"):
+                container["State"]["Running"] = action == "start"
+                if action == "start":  # Docker picks the host ports left empty
+                    bindings = container.get("HostConfig", {}).get("PortBindings", {})
+                    container["NetworkSettings"]["Ports"] = {
+                        port: [{"HostIp": "0.0.0.0", "HostPort": host[0]["HostPort"] or "49153"}]
+                        for port, host in bindings.items()
+                    }
+                return 204, b""
+            if action == "exec":
+                exec_id = f"exec-{len(self._execs)}"
+                self._execs[exec_id] = body["Cmd"]
+                return 201, json.dumps({"Id": exec_id}).encode()
+        if parts[0] == "images" and parts[-1] == "json":
+            image = urllib.parse.unquote("/".join(parts[1:-1]))
+            if image not in self.images:
+                return 404, json.dumps({"message": f"No such image: {image}"}).encode()
+            return 200, json.dumps({"Id": f"sha256:{image}"}).encode()
+        if path == "/commit":
+            self.images.add(f"{query['repo'][0]}:{query['tag'][0]}")
+            return 201, json.dumps({"Id": "sha256:snapshot"}).encode()
+        if parts[0] == "images" and parts[1] == "create":
+            image = f"{query['fromImage'][0]}:{query['tag'][0]}"
+            if image in self.private_images:
+                message = f"pull access denied for {image}, may require 'docker login'"
+                return 404, json.dumps({"message": message}).encode()
+            self.images.add(image)
+            return 200, b'{"status":"Pulling"}\n{"status":"Done"}\n'
+        if parts[0] == "exec" and parts[2] == "start":
+            _, stdout, stderr = self.exec_result
+            stream = b""
+            for stream_type, data in ((1, stdout), (2, stderr)):
+                if data:
+                    stream += struct.pack(">BxxxL", stream_type, len(data)) + data.encode()
+            return 200, stream
+        if parts[0] == "exec" and parts[2] == "json":
+            return 200, json.dumps({"ExitCode": self.exec_result[0]}).encode()
+        return 404, json.dumps({"message": "page not found"}).encode()
+
+
+@contextmanager
+def serve(engine):
+    """Serve `engine` on its unix socket while in the block."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _dispatch(self):
+            url = urllib.parse.urlsplit(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length)) if length else None
+            status, data = engine.handle(
+                self.command, url.path, urllib.parse.parse_qs(url.query), body
+            )
+            self.send_response(status)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        do_GET = do_POST = do_DELETE = _dispatch
+
+        def log_message(self, *args):
+            pass
+
+    server = socketserver.ThreadingUnixStreamServer(engine.socket_path, Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield engine
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(os.path.dirname(engine.socket_path), ignore_errors=True)
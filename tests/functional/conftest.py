@@ -0,0 +1,35 @@
+from collections.abc import Iterator
+
+import psycopg
+import pytest
+
+from testing_containers.models import ContainerOptions
+from testing_containers.postgres.testing_postgres import TestingPostgres
+
+
+@pytest.fixture(scope="module")
+def testing_postgres() -> Iterator[TestingPostgres]:
+    options = ContainerOptions(
+        name="functional-db", port=5445, should_stop=True, remove_on_stop=True
+    )
+    testing = TestingPostgres(options=options)
+    yield testing
+    testing.stop()
+
+
+@pytest.fixture
+def testdb_conn(testing_postgres: TestingPostgres) -> Iterator[psycopg.Connection]:
+    """An autocommit connection to the test database, whose tables are dropped afterwards."""
+    db = testing_postgres.postgres.testdb
+    with psycopg.connect(
+        dbname=db.name,
+        user=db.user,
+        password=db.password,
+        host=db.host,
+        port=db.port,
+        autocommit=True,
+    ) as conn:
+        yield conn
+        conn.execute("DROP SCHEMA IF EXISTS testing_containers CASCADE")
+        conn.execute("DROP SCHEMA public CASCADE; CREATE SCHEMA public")
+    testing_postgres.postgres.invalidate_reset_cache()
@@ -0,0 +1,42 @@
+import asyncio
+
+import psycopg
+
+from testing_containers import AsyncTestingPostgres
+from testing_containers.models import ContainerOptions, DBConfig
+
+
+async def _existing_databases(master_db: DBConfig, names: list[str]) -> set[str]:
+    async with await psycopg.AsyncConnection.connect(
+        dbname=master_db.name,
+        user=master_db.user,
+        password=master_db.password,
+        host=master_db.host,
+        port=master_db.port,
+    ) as conn:
+        cur = await conn.execute(
+            "SELECT datname FROM pg_database WHERE datname = ANY(%s)", (names,)
+        )
+        return {row[0] for row in await cur.fetchall()}
+
+
+def test_async_testpsql_without_db_config() -> None:
+    async def _run() -> None:
+        options = ContainerOptions(remove_on_stop=True, should_stop=True)
+        async with AsyncTestingPostgres(options=options) as testdb:
+            assert testdb.postgres.testdb == DBConfig(
+                host="localhost",
+                name="tmp_testdb",
+                user="postgres",
+                password="password",
+                port=5433,
+            )
+            names = ["concurrent_a", "concurrent_b"]
+            master_db = testdb.postgres.master_db
+            await asyncio.gather(*(testdb.postgres.create_database(name) for name in names))
+            assert await _existing_databases(master_db, names) == set(names)
+
+            await asyncio.gather(*(testdb.postgres.drop_database(name) for name in names))
+            assert await _existing_databases(master_db, names) == set()
+
+    asyncio.run(_run())
@@ -0,0 +1,25 @@
+import psycopg
+
+from testing_containers.postgres.testing_postgres import TestingPostgres
+
+
+def test_reset_truncates_only_the_tables_written_to(
+    testing_postgres: TestingPostgres, testdb_conn: psycopg.Connection
+) -> None:
+    manager = testing_postgres.postgres
+    testdb_conn.execute("CREATE TABLE countries (code text PRIMARY KEY)")
+    testdb_conn.execute("CREATE TABLE users (id serial PRIMARY KEY, name text)")
+    # Written before tracking is installed: not dirty
+    testdb_conn.execute("INSERT INTO countries VALUES ('AL'), ('IT')")
+    testdb_conn.execute("INSERT INTO users (name) VALUES ('ann')")
+    manager.track_changes()
+
+    testdb_conn.execute("INSERT INTO users (name) VALUES ('bob')")
+    manager.reset()
+
+    assert testdb_conn.execute("SELECT count(*) FROM users").fetchone() == (0,)
+    assert testdb_conn.execute("SELECT count(*) FROM countries").fetchone() == (2,)
+    # Its sequence restarted with it
+    inserted = testdb_conn.execute("INSERT INTO users (name) VALUES ('cy') RETURNING id")
+    assert inserted.fetchone() == (1,)
+    manager.untrack_changes()
@@ -0,0 +1,50 @@
+import psycopg
+import pytest
+
+from testing_containers.postgres import bulk_load
+from testing_containers.postgres.testing_postgres import TestingPostgres
+
+
+@pytest.fixture
+def orders_schema(testdb_conn: psycopg.Connection) -> psycopg.Connection:
+    testdb_conn.execute("CREATE TABLE users (id int PRIMARY KEY)")
+    testdb_conn.execute(
+        "CREATE TABLE orders (id int PRIMARY KEY,"
+        " user_id int CONSTRAINT orders_user_fk REFERENCES users DEFERRABLE)"
+    )
+    testdb_conn.execute("CREATE TABLE countries (code text PRIMARY KEY)")
+    return testdb_conn
+
+
+def test_foreign_key_violation_is_detected_after_a_load_without_triggers(
+    testing_postgres: TestingPostgres, orders_schema: psycopg.Connection
+) -> None:
+    manager = testing_postgres.postgres
+
+    with pytest.raises(RuntimeError, match="violate foreign keys: orders_user_fk"):
+        manager.load_data({"users": [(1,)], "orders": [(10, 1), (11, 42)]}, disable_triggers=True)
+
+    # The rows stay loaded: the check runs once they are all in
+    assert orders_schema.execute("SELECT count(*) FROM orders").fetchone() == (2,)
+    with orders_schema.cursor() as cur:
+        assert bulk_load.foreign_key_violations(cur, [bulk_load.table_identifier("orders")]) == [
+            "orders_user_fk"
+        ]
+    orders_schema.execute("DELETE FROM orders WHERE user_id = 42")
+    with orders_schema.cursor() as cur:
+        assert bulk_load.foreign_key_violations(cur, [bulk_load.table_identifier("users")]) == []
+
+
+def test_linked_tables_load_in_any_order(
+    testing_postgres: TestingPostgres, orders_schema: psycopg.Connection
+) -> None:
+    with orders_schema.cursor() as cur:
+        groups = bulk_load.linked_groups(cur, ["orders", "countries", "users"])
+    assert groups == [["orders", "users"], ["countries"]]
+
+    # The deferred key of orders is checked once users is loaded too
+    loaded = testing_postgres.postgres.load_data(
+        {"orders": [(10, 1)], "countries": [("IT",)], "users": [(1,)]}
+    )
+
+    assert loaded == {"orders": 1, "countries": 1, "users": 1}
@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+
+import testing_containers.postgres.async_postgres_docker_container as apdc
+from testing_containers import readiness
+from testing_containers.models import ContainerOptions
+from testing_containers.service_container import stop_service_async
+
+
+@pytest.fixture
+def instance():
+    return apdc.AsyncPostgresDockerContainer(
+        port=5544, options=ContainerOptions(name="async-pg", should_stop=True, remove_on_stop=True)
+    )
+
+
+def test_definition_is_shared_with_the_sync_container(instance):
+    assert instance.master_db.port == 5544
+    assert instance.container.container_name == "async-pg"
+    assert instance.container.container.expose_ports == ["5544:5432"]
+
+
+def test_is_postgres_ready_polls_without_blocking(instance, monkeypatch, capsys):
+    answers = iter([False, True])
+    slept = []
+
+    async def _probe(host, port, user="postgres", **kw):
+        return next(answers)
+
+    async def _sleep(delay):
+        slept.append(delay)
+
+    monkeypatch.setattr(apdc, "is_postgres_accepting_async", _probe)
+    monkeypatch.setattr(readiness.asyncio, "sleep", _sleep)
+
+    assert asyncio.run(instance.is_postgres_ready(timeout=5)) is True
+    assert len(slept) == 1
+    assert "PostgreSQL is ready!" in capsys.readouterr().out
+
+
+def test_ensure_postgres_is_ready_exits_when_docker_not_ready(instance, monkeypatch):
+    async def _not_ready():
+        return False
+
+    monkeypatch.setattr(instance.container, "is_docker_ready", _not_ready)
+
+    with pytest.raises(SystemExit) as ei:
+        asyncio.run(instance.ensure_postgres_is_ready())
+    assert ei.value.code == 1
+
+
+def test_stop_container_stops_and_removes(instance, monkeypatch):
+    called = []
+    # Stopped by the synchronous definition, in a worker thread
+    container = instance._definition.container
+    monkeypatch.setattr(container, "stop_container", lambda: called.append("stop"))
+    monkeypatch.setattr(container, "remove_container", lambda: called.append("remove"))
+
+    asyncio.run(instance.stop_container())
+
+    assert called == ["stop", "remove"]
+
+
+def test_stop_service_async_leaves_a_shared_container_up(instance, monkeypatch, capsys):
+    stopped = []
+    monkeypatch.setattr(instance._definition, "stop_container", lambda: stopped.append(1))
+
+    asyncio.run(stop_service_async(instance, last_worker=False))
+    assert stopped == []
+    assert "leaving it up" in capsys.readouterr().out
+    asyncio.run(stop_service_async(instance, last_worker=True))
+    asyncio.run(stop_service_async(None, last_worker=True))
+    assert stopped == [1]
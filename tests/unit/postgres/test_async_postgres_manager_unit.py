@@ -0,0 +1,161 @@
+import asyncio
+import contextlib
+
+import pytest
+
+import testing_containers.postgres.async_postgres_manager as apm
+from testing_containers.models import DBConfig
+from testing_containers.postgres.async_postgres_manager import AsyncPostgresManager
+
+
+class DummyAsyncCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    async def fetchall(self):
+        return self.rows
+
+
+class DummyAsyncConn:
+    def __init__(self, store, rows):
+        self.store = store
+        self.rows = rows
+        self.closed = False
+
+    async def execute(self, stmt, params=None):
+        self.store.append((stmt, params))
+        return DummyAsyncCursor(self.rows)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+        return False
+
+
+@pytest.fixture
+def cfg():
+    return DBConfig(host="localhost", name="postgres", user="u", password="p", port=5432)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Monkeypatch AsyncConnection.connect and collect executed statements."""
+    executed = []
+
+    async def _fake_connect(*args, **kwargs):
+        assert kwargs["autocommit"] is True
+        return DummyAsyncConn(executed, rows=[])
+
+    monkeypatch.setattr(apm.AsyncConnection, "connect", _fake_connect)
+    return executed
+
+
+def test_is_postgres_ready(cfg, store):
+    assert asyncio.run(AsyncPostgresManager(cfg).is_postgres_ready()) is True
+
+
+def test_is_postgres_ready_false_on_exception(cfg, monkeypatch, capsys):
+    async def _boom(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(apm.AsyncConnection, "connect", _boom)
+    assert asyncio.run(AsyncPostgresManager(cfg).is_postgres_ready()) is False
+    assert "PostgreSQL not ready: boom" in capsys.readouterr().out
+
+
+def test_create_database_from_template(cfg, store, capsys):
+    asyncio.run(AsyncPostgresManager(cfg).create_database("clone", template="golden"))
+
+    assert "pg_terminate_backend" in str(store[0][0])
+    assert store[0][1] == ("golden",)
+    assert "CREATE DATABASE" in str(store[1][0])
+    assert "TEMPLATE" in str(store[1][0])
+    assert "Database clone created successfully." in capsys.readouterr().out
+
+
+def test_drop_database(cfg, store):
+    asyncio.run(AsyncPostgresManager(cfg).drop_database("temp_db"))
+
+    assert store[0][1] == ("temp_db",)
+    assert "DROP DATABASE IF EXISTS" in str(store[1][0])
+
+
+def test_setup_template_awaits_async_migrate(cfg, monkeypatch):
+    mgr = AsyncPostgresManager(cfg)
+    calls = []
+
+    async def _record(name, template=None):
+        calls.append(name)
+
+    monkeypatch.setattr(mgr, "drop_database", _record)
+    monkeypatch.setattr(mgr, "create_database", _record)
+
+    async def _migrate(db):
+        calls.append(("migrate", db.name))
+
+    @contextlib.asynccontextmanager
+    async def _lock(key):
+        yield
+
+    monkeypatch.setattr(mgr, "_advisory_lock", _lock)
+
+    template = asyncio.run(mgr.setup_template(_migrate))
+
+    assert mgr.template == template
+    assert calls == [template.name, template.name, ("migrate", template.name)]
+
+
+def test_setup_testdb_raises_when_not_ready(cfg, monkeypatch):
+    mgr = AsyncPostgresManager(cfg)
+
+    async def _not_ready():
+        return False
+
+    monkeypatch.setattr(mgr, "is_postgres_ready", _not_ready)
+    with pytest.raises(RuntimeError):
+        asyncio.run(mgr.setup_testdb())
+
+
+def test_clone_is_made_under_the_template_lock(cfg, monkeypatch):
+    mgr = AsyncPostgresManager(cfg)
+    mgr.template = mgr._db_config("golden")
+    databases = set()
+    held = []
+    migrated = []
+
+    @contextlib.asynccontextmanager
+    async def _lock(key):
+        held.append(key)
+        yield
+        held.remove(key)
+
+    async def _exists(name):
+        return name in databases
+
+    async def _drop(name):
+        databases.discard(name)
+
+    async def _create(name, template=None):
+        assert template is None or template in held, "cloned outside the template lock"
+        databases.add(name)
+
+    async def _ready():
+        return True
+
+    monkeypatch.setattr(mgr, "_advisory_lock", _lock)
+    monkeypatch.setattr(mgr, "_database_exists", _exists)
+    monkeypatch.setattr(mgr, "drop_database", _drop)
+    monkeypatch.setattr(mgr, "create_database", _create)
+    monkeypatch.setattr(mgr, "is_postgres_ready", _ready)
+    mgr._migrate = migrated.append
+
+    # The template was dropped by another worker since setup_template(): it is built again
+    asyncio.run(mgr.setup_testdb())
+
+    assert databases == {"golden", mgr.testdb.name}
+    assert [db.name for db in migrated] == ["golden"]
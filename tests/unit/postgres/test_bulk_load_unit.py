@@ -0,0 +1,275 @@
+import gzip
+import json
+import threading
+
+import pytest
+from psycopg import errors
+from psycopg.types.json import Jsonb
+
+import testing_containers.postgres.postgres_manager as pm
+from testing_containers.models import DBConfig
+from testing_containers.postgres import bulk_load, change_tracking
+from testing_containers.postgres.postgres_manager import PostgresManager
+
+
+class FakeCopy:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def write(self, data):
+        self.cursor.conn.written.append(data)
+
+    def write_row(self, row):
+        self.cursor.conn.rows.append(row)
+
+    def __enter__(self):
+        conn = self.cursor.conn
+        self.started = len(conn.rows), len(conn.written)
+        return self
+
+    def __exit__(self, *exc):
+        conn = self.cursor.conn
+        rows, written = conn.rows[self.started[0] :], conn.written[self.started[1] :]
+        self.cursor.rowcount = len(rows) or b"".join(written).count(b"\n")
+        return False
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.connection = None  # quote identifiers with the default encoding
+        self.rowcount = -1
+        self.answer = []
+
+    def execute(self, query, params=None):
+        self.conn.executed.append(query if isinstance(query, str) else query.as_string(None))
+        self.answer = self.conn.answers.get(query, []) if isinstance(query, str) else []
+        if not isinstance(query, str) and "NOT EXISTS" in self.conn.executed[-1]:
+            self.answer = [(name,) for name in self.conn.violations]
+        return self
+
+    def fetchall(self):
+        return self.answer
+
+    def fetchone(self):
+        return self.answer[0]
+
+    def copy(self, statement):
+        self.conn.copies.append(statement.as_string(None))
+        return FakeCopy(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeConn:
+    """Records what one connection executes and copies."""
+
+    def __init__(self, answers, violations):
+        self.answers = answers
+        self.violations = violations
+        self.executed, self.copies, self.written, self.rows = [], [], [], []
+        self.thread = None
+        self.closed = False
+        self.connection = None  # quote identifiers with the default encoding
+
+    def cursor(self):
+        self.thread = threading.current_thread().name
+        return FakeCursor(self)
+
+    def execute(self, query, params=None):
+        if query in self.answers.get("denied", ()):
+            raise errors.InsufficientPrivilege(f"permission denied to set parameter: {query}")
+        self.executed.append((query, params))
+
+    def transaction(self):
+        return self
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    """Every connection the manager opens; the answers of the catalog queries."""
+    opened = []
+    state = {
+        "answers": {
+            pm.USER_TABLES: [],
+            pm.STANDALONE_SEQUENCES: [],
+            change_tracking.IS_INSTALLED: [(False,)],
+            bulk_load.FOREIGN_KEYS: [],
+            bulk_load.LINKED_TABLES: [],
+        },
+        "violations": [],
+    }
+
+    def _connect(**kwargs):
+        conn = FakeConn(state["answers"], state["violations"])
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(pm, "connect", _connect)
+    return opened, state
+
+
+@pytest.fixture
+def manager():
+    return PostgresManager(
+        DBConfig(host="localhost", name="postgres", user="u", password="p", port=5432)
+    )
+
+
+def _loads(opened):
+    """The connections that loaded a table."""
+    return [conn for conn in opened if conn.copies]
+
+
+def test_csv_is_streamed_as_is(manager, connections, tmp_path):
+    opened, _ = connections
+    path = tmp_path / "countries.csv"
+    path.write_bytes(b'\xef\xbb\xbfcode,"name"\nAL,Albania\nIT,"Italy, Republic of"\n')
+
+    assert manager.load_data({"ref.countries": path}) == {"ref.countries": 2}
+
+    (conn,) = _loads(opened)
+    assert conn.copies == ['COPY "ref"."countries" ("code", "name") FROM STDIN (FORMAT csv)']
+    assert b"".join(conn.written) == b'AL,Albania\nIT,"Italy, Republic of"\n'
+    assert conn.executed[:2] == [
+        "SET CONSTRAINTS ALL DEFERRED",
+        "SET LOCAL synchronous_commit = off",
+    ]
+
+
+def test_jsonl_and_iterables_are_copied_row_by_row(manager, connections, tmp_path):
+    opened, _ = connections
+    path = tmp_path / "users.jsonl.gz"
+    with gzip.open(path, "wt") as f:
+        f.write(json.dumps({"id": 1, "profile": {"age": 30}}) + "\n\n")
+        f.write(json.dumps({"id": 2}) + "\n")
+
+    loaded = manager.load_data(
+        {"users": path, "tags": [(1, "new"), (2, "vip")], "empty": iter([])}, max_workers=1
+    )
+
+    assert loaded == {"users": 2, "tags": 2, "empty": 0}
+    (conn,) = _loads(opened)  # one transaction, in the given order
+    assert conn.copies == ['COPY "users" ("id", "profile") FROM STDIN', 'COPY "tags" FROM STDIN']
+    assert conn.rows[0][0] == 1 and isinstance(conn.rows[0][1], Jsonb)
+    assert conn.rows[1:] == [[2, None], [1, "new"], [2, "vip"]]
+
+
+def test_tables_load_in_parallel_on_their_own_connections(manager, connections):
+    opened, _ = connections
+    barrier = threading.Barrier(3, timeout=5)
+
+    def _rows(table):
+        barrier.wait()  # every table is being loaded at once
+        yield (table,)
+
+    manager.load_data(
+        {table: _rows(table) for table in ("a", "b", "c")}, max_workers=3, disable_triggers=True
+    )
+
+    loads = _loads(opened)
+    assert len(loads) == 3
+    assert len({conn.thread for conn in loads}) == 3
+    assert all(
+        conn.executed[:2]
+        == ["SET LOCAL session_replication_role = replica", "SET LOCAL synchronous_commit = off"]
+        for conn in loads
+    )
+
+
+def test_tables_linked_by_foreign_keys_load_together(manager, connections):
+    opened, state = connections
+    # orders -> users, line_items -> orders (by position); countries is not linked
+    state["answers"][bulk_load.LINKED_TABLES] = [(2, 1), (4, 2)]
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _rows(table):
+        if table in ("users", "countries"):
+            barrier.wait()  # both groups are being loaded at once
+        yield (table,)
+
+    tables = ("users", "orders", "countries", "line_items")
+    loaded = manager.load_data({table: _rows(table) for table in tables})
+
+    assert list(loaded) == list(tables)
+    assert sorted(conn.copies for conn in _loads(opened)) == [
+        ['COPY "countries" FROM STDIN'],
+        ['COPY "users" FROM STDIN', 'COPY "orders" FROM STDIN', 'COPY "line_items" FROM STDIN'],
+    ]
+    assert all(conn.executed[0] == "SET CONSTRAINTS ALL DEFERRED" for conn in _loads(opened))
+
+
+def test_linked_groups():
+    cur = FakeConn({bulk_load.LINKED_TABLES: [(3, 1), (1, 3), (4, 4)]}, []).cursor()
+
+    groups = bulk_load.linked_groups(cur, ["a", "b", "c", "d", "s.e"])
+
+    assert groups == [["a", "c"], ["b"], ["d"], ["s.e"]]
+
+
+def test_disabling_triggers_fails_early_without_the_privilege(manager, connections):
+    opened, state = connections
+    state["answers"]["denied"] = ["SET LOCAL session_replication_role = replica"]
+
+    with pytest.raises(RuntimeError, match="disable_triggers needs .* which 'u' is not"):
+        manager.load_data({"t": [(1,)]}, disable_triggers=True)
+
+    assert _loads(opened) == []
+
+
+def test_unsupported_file_is_rejected(manager, connections, tmp_path):
+    with pytest.raises(ValueError, match="Unsupported data file data.xlsx"):
+        manager.load_data({"t": tmp_path / "data.xlsx"})
+
+
+def test_foreign_keys_are_checked_once_after_loading(manager, connections):
+    opened, state = connections
+    state["answers"][bulk_load.FOREIGN_KEYS] = [
+        ("orders_user_fk", "orders", "users", ["user_id"], ["id"]),
+    ]
+    state["violations"].append("orders_user_fk")
+
+    assert manager.load_data({"orders": [(1, 42)]}) == {"orders": 1}  # checked by Postgres
+    with pytest.raises(RuntimeError, match="violate foreign keys: orders_user_fk"):
+        manager.load_data({"orders": [(1, 42)]}, disable_triggers=True)
+
+    check = manager._reset_connection(manager.testdb).executed[-1]
+    assert (
+        check
+        == (
+            "SELECT 'orders_user_fk' WHERE EXISTS (SELECT FROM orders c WHERE "
+            '"c"."user_id" IS NOT NULL AND NOT EXISTS '
+            '(SELECT FROM users p WHERE "p"."id" = "c"."user_id"))'
+        )
+        or "NOT EXISTS" in check
+    )
+    loaded = manager.load_data(
+        {"orders": [(1, 42)]}, check_foreign_keys=False, disable_triggers=True
+    )
+    assert loaded == {"orders": 1}
+
+
+def test_loaded_tables_are_marked_dirty_when_tracked(manager, connections):
+    opened, state = connections
+    state["answers"][change_tracking.IS_INSTALLED] = [(True,)]
+
+    manager.load_data({"app.users": [(1,)]})
+    assert not any(change_tracking.MARK_DIRTY in conn.executed for conn in opened)
+
+    manager.load_data({"app.users": [(1,)]}, disable_triggers=True)  # the tracking triggers too
+    assert any(
+        (change_tracking.MARK_DIRTY, (['"app"."users"'],)) in conn.executed for conn in opened
+    )
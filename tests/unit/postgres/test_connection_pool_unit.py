@@ -0,0 +1,112 @@
+import threading
+
+import pytest
+from psycopg.pq import TransactionStatus
+
+from testing_containers.models import DBConfig
+from testing_containers.postgres import connection_pool
+from testing_containers.postgres.connection_pool import ConnectionPool
+
+
+class DummyConn:
+    def __init__(self):
+        self.closed = False
+        self.broken = False
+        self.rollbacks = 0
+        self.info = type("Info", (), {"transaction_status": TransactionStatus.IDLE})()
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.info.transaction_status = TransactionStatus.IDLE
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    connections = []
+
+    def _connect(**kwargs):
+        connections.append(DummyConn())
+        return connections[-1]
+
+    monkeypatch.setattr(connection_pool, "connect", _connect)
+    return connections
+
+
+@pytest.fixture
+def db():
+    return DBConfig(host="localhost", name="tmp_testdb", user="postgres", password="pwd", port=5432)
+
+
+def test_min_size_connections_are_opened_up_front(db, connections):
+    ConnectionPool(db, min_size=2, max_size=4)
+    assert len(connections) == 2
+
+
+def test_connections_are_reused(db, connections):
+    pool = ConnectionPool(db, min_size=1)
+
+    for _ in range(3):
+        with pool.connection() as conn:
+            assert conn is connections[0]
+
+    assert len(connections) == 1
+
+
+def test_open_transactions_are_rolled_back_on_return(db, connections):
+    pool = ConnectionPool(db)
+
+    with pool.connection() as conn:
+        conn.info.transaction_status = TransactionStatus.INTRANS
+
+    assert conn.rollbacks == 1
+
+
+def test_broken_connections_are_replaced(db, connections):
+    pool = ConnectionPool(db, min_size=1)
+    connections[0].broken = True
+
+    with pool.connection() as conn:
+        assert conn is connections[1]
+
+
+def test_pool_grows_up_to_max_size_then_times_out(db, connections):
+    pool = ConnectionPool(db, min_size=0, max_size=2)
+    pool.getconn()
+    pool.getconn()
+
+    with pytest.raises(RuntimeError, match="No connection available"):
+        pool.getconn(timeout=0.01)
+    assert len(connections) == 2
+
+
+def test_waiting_caller_gets_the_returned_connection(db, connections):
+    pool = ConnectionPool(db, min_size=0, max_size=1)
+    conn = pool.getconn()
+    got = []
+
+    waiter = threading.Thread(target=lambda: got.append(pool.getconn(timeout=5)))
+    waiter.start()
+    pool.putconn(conn)
+    waiter.join()
+
+    assert got == [conn]
+
+
+def test_close_closes_idle_and_returned_connections(db, connections):
+    pool = ConnectionPool(db, min_size=2)
+    lent = pool.getconn()
+
+    pool.close()
+    pool.putconn(lent)
+
+    assert all(conn.closed for conn in connections)
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.getconn()
+
+
+def test_invalid_sizes(db):
+    with pytest.raises(ValueError, match="Invalid pool sizes"):
+        ConnectionPool(db, min_size=3, max_size=2, open=False)
@@ -0,0 +1,76 @@
+import queue
+from contextlib import nullcontext
+
+import pytest
+
+from testing_containers.models import DBConfig
+from testing_containers.postgres.database_pool import DatabasePool
+from testing_containers.postgres.postgres_manager import PostgresManager
+
+
+@pytest.fixture
+def master_db():
+    return DBConfig(host="localhost", name="postgres", user="postgres", password="pwd", port=5432)
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record the database operations the pool runs instead of hitting Postgres."""
+    calls = []
+
+    def create_database(self, db_name, template=None):
+        calls.append(("create", db_name, template))
+
+    def drop_database(self, db_name):
+        calls.append(("drop", db_name))
+
+    monkeypatch.setattr(PostgresManager, "create_database", create_database)
+    monkeypatch.setattr(PostgresManager, "drop_database", drop_database)
+    monkeypatch.setattr(PostgresManager, "_advisory_lock", lambda self, key: nullcontext())
+    monkeypatch.setattr(PostgresManager, "_database_exists", lambda self, db_name: True)
+    return calls
+
+
+def test_pool_is_filled_on_start(master_db, calls):
+    with DatabasePool(PostgresManager(master_db), size=2) as pool:
+        first, second = pool.lease(timeout=1), pool.lease(timeout=1)
+
+    assert {first.name, second.name} == {"tmp_testdb_pool_0", "tmp_testdb_pool_1"}
+    assert first.port == master_db.port
+    assert ("create", "tmp_testdb_pool_0", None) in calls
+
+
+def test_lease_schedules_a_refill(master_db, calls):
+    pool = DatabasePool(PostgresManager(master_db), size=1).start()
+
+    pool.lease(timeout=1)
+    refill = pool.lease(timeout=1)
+    pool.close()
+
+    assert refill.name != "tmp_testdb_pool_0"
+
+
+def test_databases_are_cloned_from_the_template(master_db, calls):
+    manager = PostgresManager(master_db)
+    manager.template = manager._db_config("tmp_testdb_template")
+
+    with DatabasePool(manager, size=1) as pool:
+        db = pool.lease(timeout=1)
+
+    assert ("create", db.name, "tmp_testdb_template") in calls
+
+
+def test_released_databases_are_dropped(master_db, calls):
+    with DatabasePool(PostgresManager(master_db), size=1) as pool, pool.leased(timeout=1) as db:
+        pass
+
+    assert calls.count(("drop", db.name)) == 2  # before creating it, then on release
+
+
+def test_close_drops_unused_databases(master_db, calls):
+    pool = DatabasePool(PostgresManager(master_db), size=2).start()
+    pool.close()
+
+    assert calls[-2:] == [("drop", "tmp_testdb_pool_0"), ("drop", "tmp_testdb_pool_1")]
+    with pytest.raises(queue.Empty):
+        pool.lease(timeout=0)
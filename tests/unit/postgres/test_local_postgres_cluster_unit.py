@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import testing_containers.postgres.local_postgres_cluster as lpc
+from testing_containers.models import ContainerOptions
+
+
+def _bin_dir(path):
+    path.mkdir(parents=True)
+    for tool in ("initdb", "pg_ctl"):
+        (path / tool).write_text("")
+    return path
+
+
+@pytest.fixture
+def no_pg_on_path(monkeypatch):
+    monkeypatch.setattr(lpc.shutil, "which", lambda name: None)
+    monkeypatch.setattr(lpc, "PG_BIN_GLOBS", [])
+    monkeypatch.delenv(lpc.PG_BIN_ENV, raising=False)
+
+
+def test_find_pg_bin_dir_prefers_the_explicit_directory(tmp_path, monkeypatch, no_pg_on_path):
+    explicit = _bin_dir(tmp_path / "explicit")
+    monkeypatch.setenv(lpc.PG_BIN_ENV, str(_bin_dir(tmp_path / "env")))
+
+    assert lpc.find_pg_bin_dir(str(explicit)) == explicit
+    assert lpc.find_pg_bin_dir() == tmp_path / "env"
+
+
+def test_find_pg_bin_dir_picks_the_newest_installed_version(tmp_path, monkeypatch, no_pg_on_path):
+    for version in ("9.6", "16", "13"):
+        _bin_dir(tmp_path / version / "bin")
+    monkeypatch.setattr(lpc, "PG_BIN_GLOBS", [str(tmp_path / "*" / "bin")])
+
+    assert lpc.find_pg_bin_dir() == tmp_path / "16" / "bin"
+
+
+def test_find_pg_bin_dir_none_when_missing(tmp_path, no_pg_on_path):
+    assert lpc.find_pg_bin_dir(str(tmp_path)) is None
+    with pytest.raises(RuntimeError, match="initdb/pg_ctl not found"):
+        lpc.LocalPostgresCluster(ContainerOptions())
+
+
+def test_start_and_stop_the_cluster(tmp_path, monkeypatch, fake_run_success):
+    monkeypatch.setattr(lpc, "SHM_DIR", str(tmp_path))
+    cluster = lpc.LocalPostgresCluster(
+        ContainerOptions(server_settings={"work_mem": "64MB"}), bin_dir=tmp_path / "bin"
+    )
+
+    cluster.start_container()
+    data_dir = cluster.data_dir
+
+    initdb, pg_ctl = fake_run_success
+    assert data_dir.parent == tmp_path and data_dir.is_dir()
+    assert initdb[0] == str(tmp_path / "bin" / "initdb") and "--no-sync" in initdb
+    assert pg_ctl[-1] == "start"
+    server_options = pg_ctl[pg_ctl.index("--options") + 1]
+    assert f"-p {cluster.master_db.port}" in server_options
+    assert "-c fsync=off" in server_options and "-c work_mem=64MB" in server_options
+
+    cluster.stop_container()
+    cluster.stop_container()  # a second stop (e.g. at exit) is a no-op
+
+    assert fake_run_success[-1][-1] == "stop"
+    assert len(fake_run_success) == 3
+    assert not data_dir.exists()
+
+
+def test_failing_initdb_raises(tmp_path, monkeypatch, fake_run_fail):
+    monkeypatch.setattr(lpc, "SHM_DIR", str(tmp_path))
+    cluster = lpc.LocalPostgresCluster(ContainerOptions(), bin_dir=tmp_path)
+
+    with pytest.raises(RuntimeError, match="initdb failed"):
+        cluster.start_container()
+    assert list(tmp_path.iterdir()) == []  # no data directory left behind
+
+
+def test_not_available_as_root(tmp_path, monkeypatch):
+    options = ContainerOptions(pg_bin_dir=str(_bin_dir(tmp_path / "bin")))
+    monkeypatch.setattr(os, "geteuid", lambda: 0)
+    assert lpc.LocalPostgresCluster.is_available(options) is False
+    monkeypatch.setattr(os, "geteuid", lambda: 1000)
+    assert lpc.LocalPostgresCluster.is_available(options) is True
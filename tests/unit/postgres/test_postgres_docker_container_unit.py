@@ -3,59 +3,72 @@ import types
 import pytest
 
 import testing_containers.postgres.postgres_docker_container as pdc
-from testing_containers.models import ContainerOptions
+from testing_containers import readiness
+from testing_containers.models import ContainerOptions, ContainerState
 
 
-def _cp(returncode=0, stdout="", stderr=""):
-    """Tiny CompletedProcess-like object."""
-    return types.SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+def _publish(monkeypatch, pg_container, host_port):
+    """Make the container report `host_port` as the published port of 5432."""
+    state = ContainerState(
+        name=pg_container.container.container_name,
+        exists=True,
+        running=True,
+        ports={"5432/tcp": host_port},
+    )
+    monkeypatch.setattr(pg_container.container, "get_state", lambda refresh=False: state)
 
 
 @pytest.fixture
-def instance():
+def instance(monkeypatch):
     # Build a real PostgresDockerContainer; we'll monkeypatch its `container` methods.
-    return pdc.PostgresDockerContainer(
+    pg_container = pdc.PostgresDockerContainer(
         port=5544, options=ContainerOptions(name="test-pg", should_stop=True, remove_on_stop=True)
     )
+    _publish(monkeypatch, pg_container, 5544)
+    return pg_container
 
 
-def test_is_postgres_ready_immediate_success(instance, monkeypatch, capsys):
-    # Make the first exec call succeed
-    monkeypatch.setattr(instance.container, "exec", lambda cmd: _cp(returncode=0))
-
-    assert instance.is_postgres_ready(retries=3, delay=0) is True
-    out = capsys.readouterr().out
-    assert "PostgreSQL is ready!" in out
+@pytest.fixture
+def probes(monkeypatch):
+    """Replace the host-side Postgres probe with a scripted sequence of answers."""
+    answers = []
+    calls = []
 
+    def _probe(host, port, user="postgres", **kw):
+        calls.append((host, port, user))
+        return answers.pop(0) if answers else False
 
-def test_is_postgres_ready_retries_then_success(instance, monkeypatch, capsys):
-    # Fail twice, then succeed
-    rcs = iter([1, 2, 0])
+    monkeypatch.setattr(pdc, "is_postgres_accepting", _probe)
+    monkeypatch.setattr(readiness.time, "sleep", lambda *_: None)
+    return types.SimpleNamespace(answers=answers, calls=calls)
 
-    def exec_seq(cmd):
-        return _cp(returncode=next(rcs))
 
-    monkeypatch.setattr(instance.container, "exec", exec_seq)
-    monkeypatch.setattr(pdc.time, "sleep", lambda *_: None)
+def test_is_postgres_ready_immediate_success(instance, probes, capsys):
+    probes.answers.append(True)
 
-    assert instance.is_postgres_ready(retries=5, delay=0) is True
+    assert instance.is_postgres_ready(timeout=3) is True
+    assert probes.calls == [("localhost", 5544, "postgres")]
     out = capsys.readouterr().out
-    assert "Waiting for PostgreSQL to be ready... (Attempt 1/5)" in out
-    assert "Waiting for PostgreSQL to be ready... (Attempt 2/5)" in out
     assert "PostgreSQL is ready!" in out
 
 
-def test_is_postgres_ready_gives_up(instance, monkeypatch, capsys):
-    # Always fail
-    monkeypatch.setattr(instance.container, "exec", lambda cmd: _cp(returncode=1))
-    monkeypatch.setattr(pdc.time, "sleep", lambda *_: None)
+def test_is_postgres_ready_retries_then_success(instance, probes, capsys):
+    probes.answers.extend([False, False, True])
 
-    assert instance.is_postgres_ready(retries=3, delay=0) is False
+    assert instance.is_postgres_ready(timeout=5) is True
+    assert len(probes.calls) == 3
     out = capsys.readouterr().out
-    assert "PostgreSQL is not ready after multiple attempts." in out
+    assert "Waiting for PostgreSQL to be ready..." in out
+    assert "PostgreSQL is ready!" in out
 
 
-def test_ensure_postgres_is_ready_happy_path(instance, monkeypatch, capsys):
+def test_is_postgres_ready_gives_up(instance, probes, capsys):
+    assert instance.is_postgres_ready(timeout=0) is False
+    out = capsys.readouterr().out
+    assert "PostgreSQL is not ready after 0s." in out
+
+
+def test_ensure_postgres_is_ready_happy_path(instance, monkeypatch, probes, capsys):
     # Docker ready → start_container() called → PG ready immediately
     start_calls = {"n": 0}
     monkeypatch.setattr(instance.container, "is_docker_ready", lambda: True)
@@ -64,7 +77,7 @@ def test_ensure_postgres_is_ready_happy_path(instance, monkeypatch, capsys):
         "start_container",
         lambda: start_calls.__setitem__("n", start_calls["n"] + 1),
     )
-    monkeypatch.setattr(instance.container, "exec", lambda cmd: _cp(returncode=0))
+    probes.answers.append(True)
 
     instance.ensure_postgres_is_ready()
 
@@ -87,16 +100,16 @@ def test_ensure_postgres_is_ready_exits_when_docker_not_ready(instance, monkeypa
     assert ei.value.code == 1
 
 
-def test_ensure_postgres_is_ready_exits_when_pg_not_ready(instance, monkeypatch):
+def test_ensure_postgres_is_ready_exits_when_pg_not_ready(instance, monkeypatch, probes):
     start_calls = {"n": 0}
-    monkeypatch.setattr(pdc.time, "sleep", lambda *_: None)
+    clock = iter(range(0, 1000, 10))
+    monkeypatch.setattr(readiness.time, "monotonic", lambda: next(clock))
     monkeypatch.setattr(instance.container, "is_docker_ready", lambda: True)
     monkeypatch.setattr(
         instance.container,
         "start_container",
         lambda: start_calls.__setitem__("n", start_calls["n"] + 1),
     )
-    monkeypatch.setattr(instance.container, "exec", lambda cmd: _cp(returncode=1))
 
     with pytest.raises(SystemExit) as ei:
         instance.ensure_postgres_is_ready()
@@ -116,3 +129,131 @@ def test_stop_container_delegates(instance, monkeypatch):
     instance.stop_container()
     assert called["n"] == 1
     assert called["m"] == 1
+
+
+def test_default_profile_runs_the_stock_server():
+    container = pdc.PostgresDockerContainer(options=ContainerOptions()).container
+
+    assert container.command == []
+    assert container.tmpfs == {}
+    assert container.shm_size is None
+
+
+def test_fast_profile():
+    container = pdc.PostgresDockerContainer(
+        options=ContainerOptions(
+            fast=True, server_settings={"max_connections": "50"}, run_args=["--cpus", "2"]
+        )
+    ).container
+
+    assert container.tmpfs == {pdc.PGDATA: "rw"}
+    assert container.env["PGDATA"] == pdc.PGDATA
+    assert container.shm_size == pdc.FAST_SHM_SIZE
+    assert container.run_args == ["--cpus", "2"]
+    assert container.command[0] == "postgres"
+    assert "fsync=off" in container.command
+    assert "synchronous_commit=off" in container.command
+    assert "full_page_writes=off" in container.command
+    # server_settings override the profile's defaults
+    assert "max_connections=50" in container.command
+    assert "max_connections=200" not in container.command
+
+
+def test_server_settings_without_fast_profile():
+    container = pdc.PostgresDockerContainer(
+        options=ContainerOptions(server_settings={"log_statement": "all"})
+    ).container
+
+    assert container.command == ["postgres", "-c", "log_statement=all"]
+    assert container.tmpfs == {}
+
+
+@pytest.fixture
+def snapshot_instance(tmp_path, monkeypatch):
+    (tmp_path / "001_init.sql").write_text("create table users (id int)")
+    pg_container = pdc.PostgresDockerContainer(
+        options=ContainerOptions(name="snap-pg", fast=True, snapshot_sources=[str(tmp_path)])
+    )
+    _publish(monkeypatch, pg_container, 5433)
+    return pg_container
+
+
+def test_snapshot_keeps_pgdata_in_the_container_filesystem(snapshot_instance):
+    container = snapshot_instance.container
+
+    assert snapshot_instance.snapshot_image.startswith(f"{pdc.SNAPSHOT_REPOSITORY}:")
+    assert container.env["PGDATA"] == pdc.SNAPSHOT_PGDATA
+    assert container.tmpfs == {}
+
+
+def test_start_container_boots_from_an_existing_snapshot(snapshot_instance, monkeypatch):
+    container = snapshot_instance.container
+    monkeypatch.setattr(container, "is_docker_ready", lambda: True)
+    monkeypatch.setattr(container, "image_exists", lambda image=None: True)
+    monkeypatch.setattr(container, "start_container", lambda: None)
+
+    snapshot_instance.start_container()
+
+    assert snapshot_instance.from_snapshot is True
+    assert container.image == snapshot_instance.snapshot_image
+    # The container the snapshot was taken of is no drift
+    assert (
+        container.config_hash()
+        == pdc.PostgresDockerContainer(options=snapshot_instance.options).container.config_hash()
+    )
+
+
+def test_start_container_without_snapshot_uses_the_base_image(snapshot_instance, monkeypatch):
+    container = snapshot_instance.container
+    monkeypatch.setattr(container, "is_docker_ready", lambda: True)
+    monkeypatch.setattr(container, "image_exists", lambda image=None: False)
+    monkeypatch.setattr(container, "start_container", lambda: None)
+
+    snapshot_instance.start_container()
+
+    assert snapshot_instance.from_snapshot is False
+    assert container.image == "postgres:16.3"
+
+
+def test_snapshot_checkpoints_then_commits(snapshot_instance, monkeypatch, capsys):
+    calls = []
+    container = snapshot_instance.container
+    monkeypatch.setattr(
+        container,
+        "exec",
+        lambda cmd: calls.append(cmd) or types.SimpleNamespace(returncode=0, stderr=""),
+    )
+    monkeypatch.setattr(container, "commit", calls.append)
+
+    snapshot_instance.snapshot()
+
+    assert calls == [
+        ["psql", "-U", "postgres", "-c", "CHECKPOINT"],
+        snapshot_instance.snapshot_image,
+    ]
+    assert "Snapshot" in capsys.readouterr().out
+
+
+def test_snapshot_requires_snapshot_sources(instance):
+    with pytest.raises(RuntimeError, match="snapshot_sources"):
+        instance.snapshot()
+
+
+def test_dynamic_port_is_read_back_after_start(monkeypatch):
+    pg_container = pdc.PostgresDockerContainer(options=ContainerOptions(port=None))
+    assert pg_container.container.expose_ports == ["5432"]
+    monkeypatch.setattr(pg_container.container, "is_docker_ready", lambda: True)
+    monkeypatch.setattr(pg_container.container, "start_container", lambda: None)
+    _publish(monkeypatch, pg_container, 49153)
+
+    pg_container.start_container()
+
+    assert pg_container.master_db.port == 49153
+
+
+def test_dynamic_port_without_published_port_raises(monkeypatch):
+    pg_container = pdc.PostgresDockerContainer(options=ContainerOptions(port=None))
+    state = ContainerState(name="testing-postgres", exists=True, running=True)
+
+    with pytest.raises(RuntimeError, match="publishes no port"):
+        pg_container.use_published_port(state)
@@ -1,3 +1,5 @@
+import contextlib
+
 import pytest
 from psycopg import sql
 
@@ -28,10 +30,14 @@ class DummyConn:
         self.store = store
         self.autocommit = False
         self.closed = False
+        self.broken = False
 
     def cursor(self):
         return DummyCursor(self.store)
 
+    def execute(self, stmt, params=None):
+        self.store.append(("execute", stmt, params))
+
     def close(self) -> None:
         self.closed = True
 
@@ -85,6 +91,38 @@ def test__connect_caches_connection(cfg, store, patch_connect):
     assert patch_connect["n"] == 2
 
 
+def test_admin_connection_is_kept_open_across_operations(cfg, store, patch_connect):
+    mgr = PostgresManager(cfg)
+
+    mgr.is_postgres_ready()
+    mgr.create_database("db_a")
+    mgr.drop_database("db_a")
+
+    assert patch_connect["n"] == 1
+    assert mgr.connection.closed is False
+
+
+def test_pool_is_created_once_and_closed_with_the_manager(cfg, monkeypatch):
+    pools = []
+
+    class FakePool:
+        def __init__(self, db, min_size, max_size):
+            self.db, self.closed = db, False
+            pools.append(self)
+
+        def close(self):
+            self.closed = True
+
+    monkeypatch.setattr(pm, "ConnectionPool", FakePool)
+    mgr = PostgresManager(cfg)
+
+    assert mgr.pool() is mgr.pool()
+    assert pools[0].db == mgr.testdb
+
+    mgr.close()
+    assert pools[0].closed is True
+
+
 def test_is_postgres_ready_true(cfg, store, patch_connect, capsys):
     mgr = PostgresManager(cfg)
     assert mgr.is_postgres_ready() is True
@@ -175,3 +213,374 @@ def test_setup_testdb_raises_when_not_ready(cfg, monkeypatch):
     with pytest.raises(RuntimeError) as ei:
         mgr.setup_testdb()
     assert "PostgreSQL is not accessible" in str(ei.value)
+
+
+def test_create_database_from_template_terminates_template_sessions(cfg, store, patch_connect):
+    mgr = PostgresManager(cfg)
+    mgr.create_database("clone_db", template="golden")
+
+    executes = [x for x in store if x[0] == "execute"]
+    assert len(executes) == 2
+    assert "pg_terminate_backend" in str(executes[0][1])
+    assert executes[0][2] == ("golden",)
+    assert "CREATE DATABASE" in str(executes[1][1])
+    assert "TEMPLATE" in str(executes[1][1])
+    assert "golden" in str(executes[1][1])
+
+
+def test_setup_template_recreates_and_migrates(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    calls = []
+    monkeypatch.setattr(mgr, "drop_database", lambda name: calls.append(("drop", name)))
+    monkeypatch.setattr(mgr, "create_database", lambda name: calls.append(("create", name)))
+
+    template = mgr.setup_template(lambda db: calls.append(("migrate", db.name)))
+
+    assert template.name == "tmp_testdb_template"
+    assert template.port == cfg.port
+    assert mgr.template == template
+    assert calls == [
+        ("drop", "tmp_testdb_template"),
+        ("create", "tmp_testdb_template"),
+        ("migrate", "tmp_testdb_template"),
+    ]
+
+
+def test_clone_database_requires_template(cfg):
+    mgr = PostgresManager(cfg)
+    with pytest.raises(RuntimeError) as ei:
+        mgr.clone_database("clone_db")
+    assert "setup_template" in str(ei.value)
+
+
+def test_clone_database_copies_template(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    mgr.template = mgr._db_config("golden")
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: True)
+    calls = []
+    monkeypatch.setattr(mgr, "drop_database", lambda name: calls.append(("drop", name)))
+    monkeypatch.setattr(
+        mgr,
+        "create_database",
+        lambda name, template=None: calls.append(("create", name, template)),
+    )
+
+    clone = mgr.clone_database("clone_db")
+
+    assert clone.name == "clone_db"
+    assert calls == [("drop", "clone_db"), ("create", "clone_db", "golden")]
+
+
+def test_setup_testdb_clones_from_template(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    mgr.template = mgr._db_config("golden")
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: True)
+    monkeypatch.setattr(mgr, "is_postgres_ready", lambda: True)
+    calls = []
+    monkeypatch.setattr(mgr, "drop_database", lambda name: calls.append(("drop", name)))
+    monkeypatch.setattr(
+        mgr,
+        "create_database",
+        lambda name, template=None: calls.append(("create", name, template)),
+    )
+
+    mgr.setup_testdb()
+
+    assert calls == [("drop", mgr.testdb.name), ("create", mgr.testdb.name, "golden")]
+
+
+def test_destroy_drops_template_too(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    mgr.template = mgr._db_config("golden")
+    dropped = []
+    monkeypatch.setattr(mgr, "drop_database", dropped.append)
+    mgr.destroy()
+    assert dropped == [mgr.testdb.name, "golden"]
+
+
+def test_persistent_template_is_reused_and_kept(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: True)
+    dropped = []
+    monkeypatch.setattr(mgr, "drop_database", dropped.append)
+
+    mgr.setup_template(
+        lambda db: pytest.fail("must not migrate again"), name="golden", persistent=True
+    )
+    mgr.destroy()
+
+    assert mgr.template_built is False
+    assert dropped == [mgr.testdb.name]
+
+
+def test_persistent_template_is_built_when_missing(cfg, monkeypatch):
+    mgr = PostgresManager(cfg)
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: False)
+    monkeypatch.setattr(mgr, "drop_database", lambda name: None)
+    monkeypatch.setattr(mgr, "create_database", lambda name: None)
+    migrated = []
+
+    mgr.setup_template(migrated.append, name="golden", persistent=True)
+
+    assert mgr.template_built is True
+    assert [db.name for db in migrated] == ["golden"]
+
+
+# --- reset ---------------------------------------------------------------------
+
+
+class CatalogConn:
+    """Answers the catalog queries of reset() and records what else is executed."""
+
+    def __init__(self, tables, sequences, tracked=False):
+        self.answers = {
+            pm.USER_TABLES: tables,
+            pm.STANDALONE_SEQUENCES: sequences,
+            pm.change_tracking.IS_INSTALLED: [(tracked,)],
+        }
+        self.catalog_queries = 0
+        self.executed = []
+        self.closed = False
+
+    def cursor(self):
+        conn = self
+
+        class _Cursor:
+            def execute(self, query, params=None):
+                conn.catalog_queries += 1
+                self.rows = conn.answers[query]
+                return self
+
+            def fetchall(self):
+                return self.rows
+
+            def fetchone(self):
+                return self.rows[0]
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+        return _Cursor()
+
+    def execute(self, query, params=None):
+        self.executed.append(query if isinstance(query, str) else query.as_string(None))
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def catalog_conn(cfg, monkeypatch):
+    conn = CatalogConn(
+        tables=[("public", "alembic_version"), ("public", "countries"), ("app", "users")],
+        sequences=[("public", "invoice_numbers")],
+    )
+    monkeypatch.setattr(pm, "connect", lambda **kwargs: conn)
+    return conn
+
+
+def test_reset_truncates_everything_in_one_statement(cfg, catalog_conn):
+    mgr = PostgresManager(cfg)
+
+    mgr.reset(exclude=["public.countries", "alembic_version"])
+
+    assert catalog_conn.executed == [
+        'TRUNCATE "app"."users" RESTART IDENTITY CASCADE; '
+        'ALTER SEQUENCE "public"."invoice_numbers" RESTART'
+    ]
+
+
+def test_reset_excludes_alembic_version_by_default(cfg, catalog_conn):
+    PostgresManager(cfg).reset()
+
+    assert '"alembic_version"' not in catalog_conn.executed[0]
+    assert '"countries"' in catalog_conn.executed[0]
+
+
+def test_reset_caches_catalog_and_connection(cfg, catalog_conn):
+    mgr = PostgresManager(cfg)
+
+    mgr.reset()
+    mgr.reset()
+    assert catalog_conn.catalog_queries == 3  # tables, sequences and tracking, once
+
+    mgr.invalidate_reset_cache()
+    mgr.reset()
+    assert catalog_conn.catalog_queries == 6
+    assert len(catalog_conn.executed) == 3
+
+
+def test_reset_with_nothing_to_clear(cfg, catalog_conn):
+    PostgresManager(cfg).reset(exclude=["alembic_version", "countries", "users", "invoice_numbers"])
+
+    assert catalog_conn.executed == []
+
+
+def test_tracked_reset_only_truncates_dirty_tables(cfg, catalog_conn):
+    catalog_conn.answers[pm.change_tracking.IS_INSTALLED] = [(True,)]
+
+    PostgresManager(cfg).reset(exclude=["countries", "alembic_version"])
+
+    assert catalog_conn.executed == [
+        "SELECT testing_containers.reset_dirty('{alembic_version,countries}'::text[]); "
+        'ALTER SEQUENCE "public"."invoice_numbers" RESTART'
+    ]
+
+
+def test_track_changes_installs_tracking_and_refreshes_catalog(cfg, catalog_conn):
+    mgr = PostgresManager(cfg)
+    mgr.reset()
+
+    mgr.track_changes()
+    catalog_conn.answers[pm.change_tracking.IS_INSTALLED] = [(True,)]
+    mgr.reset()
+
+    assert catalog_conn.executed[1] == pm.change_tracking.INSTALL
+    assert "reset_dirty" in catalog_conn.executed[2]
+
+    mgr.untrack_changes()
+    assert catalog_conn.executed[3] == pm.change_tracking.UNINSTALL
+
+
+def test_drop_database_closes_the_reset_connection(cfg, catalog_conn, monkeypatch):
+    mgr = PostgresManager(cfg)
+    mgr.reset()
+    monkeypatch.setattr(mgr, "_connect", lambda: DummyConn([]))
+
+    mgr.drop_database(mgr.testdb.name)
+
+    assert catalog_conn.closed is True
+    assert mgr.testdb.name not in mgr._reset_catalogs
+
+
+def test_reset_looks_the_catalog_up_again_after_a_recreate(cfg, catalog_conn, monkeypatch):
+    mgr = PostgresManager(cfg)
+    mgr.reset()
+    monkeypatch.setattr(mgr, "_connect", lambda: DummyConn([]))
+    mgr.drop_database(mgr.testdb.name)
+    catalog_conn.answers[pm.USER_TABLES] = [("public", "orders")]
+    catalog_conn.executed.clear()
+
+    mgr.reset()
+
+    assert catalog_conn.executed[0].startswith('TRUNCATE "public"."orders" RESTART IDENTITY')
+
+
+# --- pytest-xdist workers ----------------------------------------------------
+
+
+@pytest.fixture
+def xdist_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "0123456789abcdef")
+
+
+def test_testdb_name_is_worker_scoped(cfg, xdist_worker):
+    mgr = PostgresManager(cfg)
+    assert mgr.testdb.name == "tmp_testdb_01234567_gw3"
+
+
+def test_setup_template_reuses_template_built_by_another_worker(cfg, monkeypatch, xdist_worker):
+    mgr = PostgresManager(cfg)
+    locks = []
+
+    @contextlib.contextmanager
+    def _lock(key):
+        locks.append(key)
+        yield
+
+    monkeypatch.setattr(mgr, "_advisory_lock", _lock)
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: True)
+    monkeypatch.setattr(mgr, "drop_database", lambda name: pytest.fail("must not drop"))
+    monkeypatch.setattr(mgr, "create_database", lambda name: pytest.fail("must not create"))
+
+    template = mgr.setup_template(lambda db: pytest.fail("must not migrate again"))
+
+    assert template.name == "tmp_testdb_01234567_template"
+    assert locks == [template.name]
+    assert mgr.template == template
+
+
+def test_destroy_keeps_template_while_other_workers_use_it(cfg, monkeypatch, xdist_worker):
+    mgr = PostgresManager(cfg)
+    mgr.template = mgr._db_config("tmp_testdb_01234567_template")
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_worker_databases", lambda: ["tmp_testdb_01234567_gw1"])
+    dropped = []
+    monkeypatch.setattr(mgr, "drop_database", dropped.append)
+
+    mgr.destroy()
+
+    assert dropped == ["tmp_testdb_01234567_gw3"]
+
+
+def test_destroy_last_worker_drops_template(cfg, monkeypatch, xdist_worker):
+    mgr = PostgresManager(cfg)
+    mgr.template = mgr._db_config("tmp_testdb_01234567_template")
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_worker_databases", lambda: [])
+    dropped = []
+    monkeypatch.setattr(mgr, "drop_database", dropped.append)
+
+    mgr.destroy()
+
+    assert dropped == ["tmp_testdb_01234567_gw3", "tmp_testdb_01234567_template"]
+
+
+def _on_server(monkeypatch, mgr, databases):
+    """`mgr` working on the in-memory `databases` of a server shared with other workers."""
+    held = []
+
+    @contextlib.contextmanager
+    def _lock(key):
+        held.append(key)
+        yield
+        held.remove(key)
+
+    def _create(name, template=None):
+        assert template is None or template in held, "cloned outside the template lock"
+        if template is None or template in databases:  # else the error is only printed
+            databases.add(name)
+
+    monkeypatch.setattr(mgr, "_advisory_lock", _lock)
+    monkeypatch.setattr(mgr, "is_postgres_ready", lambda: True)
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: name in databases)
+    monkeypatch.setattr(mgr, "_worker_databases", lambda: [d for d in databases if "_gw" in d])
+    monkeypatch.setattr(mgr, "drop_database", databases.discard)
+    monkeypatch.setattr(mgr, "create_database", _create)
+    return mgr
+
+
+def test_template_dropped_before_the_clone_is_built_again(cfg, monkeypatch, xdist_worker):
+    databases = set()
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    finishing = _on_server(monkeypatch, PostgresManager(cfg), databases)
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw3")
+    starting = _on_server(monkeypatch, PostgresManager(cfg), databases)
+    migrated = []
+    finishing.setup_template(migrated.append)
+    finishing.setup_testdb()
+
+    starting.setup_template(migrated.append)  # reuses the template of gw1
+    finishing.destroy()  # no other worker database yet: gw1 drops the template
+    starting.setup_testdb()
+
+    assert databases == {"tmp_testdb_01234567_template", "tmp_testdb_01234567_gw3"}
+    assert len(migrated) == 2
+    starting.destroy()
+    assert databases == set()
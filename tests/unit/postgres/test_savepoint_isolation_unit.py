@@ -0,0 +1,98 @@
+import pytest
+
+from testing_containers.models import DBConfig
+from testing_containers.postgres import savepoint_isolation
+from testing_containers.postgres.savepoint_isolation import SAVEPOINT, SavepointIsolation
+
+
+class DummyConn:
+    def __init__(self):
+        self.closed = False
+        self.statements = []
+
+    def execute(self, query, params=None):
+        self.statements.append(query)
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def conn(monkeypatch):
+    conn = DummyConn()
+    monkeypatch.setattr(savepoint_isolation, "connect", lambda **kwargs: conn)
+    return conn
+
+
+@pytest.fixture
+def isolation():
+    return SavepointIsolation(
+        DBConfig(host="localhost", name="tmp_testdb", user="postgres", password="pwd", port=5432)
+    )
+
+
+def test_isolated_wraps_the_test_in_a_rolled_back_transaction(isolation, conn):
+    with isolation.isolated() as c:
+        c.execute("INSERT INTO users VALUES (1)")
+
+    assert conn.statements == [
+        "BEGIN",
+        f"SAVEPOINT {SAVEPOINT}",
+        "INSERT INTO users VALUES (1)",
+        "ROLLBACK",
+    ]
+
+
+def test_commit_and_rollback_only_move_the_savepoint(isolation, conn):
+    with isolation.isolated():
+        app_conn = isolation.connect("postgresql://ignored")
+        app_conn.commit()
+        app_conn.rollback()
+        app_conn.close()
+
+    assert conn.statements[2:] == [
+        f"RELEASE SAVEPOINT {SAVEPOINT}",
+        f"SAVEPOINT {SAVEPOINT}",
+        f"ROLLBACK TO SAVEPOINT {SAVEPOINT}",
+        "ROLLBACK",
+    ]
+    assert not conn.closed
+
+
+def test_connection_block_commits_or_rolls_back_without_closing(isolation, conn):
+    with isolation.isolated():
+        with isolation.connect():
+            pass
+        with pytest.raises(ValueError), isolation.connect():
+            raise ValueError
+
+    assert conn.statements[2:] == [
+        f"RELEASE SAVEPOINT {SAVEPOINT}",
+        f"SAVEPOINT {SAVEPOINT}",
+        f"ROLLBACK TO SAVEPOINT {SAVEPOINT}",
+        "ROLLBACK",
+    ]
+    assert not conn.closed
+
+
+def test_connection_is_reused_across_tests(isolation, monkeypatch):
+    connections = []
+
+    def _connect(**kwargs):
+        connections.append(DummyConn())
+        return connections[-1]
+
+    monkeypatch.setattr(savepoint_isolation, "connect", _connect)
+
+    for _ in range(3):
+        with isolation.isolated():
+            pass
+    isolation.close()
+
+    assert len(connections) == 1
+    assert connections[0].closed
+
+
+def test_connect_outside_a_test_raises(isolation):
+    with pytest.raises(RuntimeError, match="No test is running"):
+        isolation.connect()
@@ -0,0 +1,168 @@
+import threading
+import types
+
+import pytest
+
+import testing_containers.postgres.testing_postgres as tp
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerOptions
+from testing_containers.postgres.testing_postgres import TestingPostgres
+
+IS_DOCKER_READY = DockerContainer.is_docker_ready
+
+
+@pytest.fixture
+def gated_setup(monkeypatch):
+    """Replace TestingPostgres._setup with one that waits for `release` to be set."""
+    release = threading.Event()
+    calls = []
+
+    def _setup(self, master_db=None):
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        self._postgres = types.SimpleNamespace(testdb="tmp_testdb")
+
+    monkeypatch.setattr(TestingPostgres, "_setup", _setup)
+    return release, calls
+
+
+def test_setup_runs_synchronously_by_default(gated_setup):
+    release, calls = gated_setup
+    release.set()
+
+    pg = TestingPostgres()
+
+    assert calls == [threading.current_thread().name]
+    assert pg.ready.done()
+    assert pg.postgres.testdb == "tmp_testdb"
+
+
+def test_background_returns_before_setup_finishes(gated_setup):
+    release, calls = gated_setup
+
+    pg = TestingPostgres.background()
+
+    assert not pg.ready.done()
+    release.set()
+    assert pg.postgres.testdb == "tmp_testdb"  # blocks until the worker thread is done
+    assert calls == ["testing-postgres"]
+
+
+def test_background_setup_errors_are_raised_on_access(monkeypatch):
+    def _setup(self, master_db=None):
+        raise RuntimeError("PostgreSQL is not accessible")
+
+    monkeypatch.setattr(TestingPostgres, "_setup", _setup)
+
+    pg = TestingPostgres.background()
+
+    with pytest.raises(RuntimeError, match="not accessible"):
+        _ = pg.postgres
+
+
+def test_background_setup_exit_is_raised_on_wait(monkeypatch):
+    def _setup(self, master_db=None):
+        raise SystemExit(1)
+
+    monkeypatch.setattr(TestingPostgres, "_setup", _setup)
+
+    pg = TestingPostgres.background()
+
+    with pytest.raises(SystemExit):
+        pg.wait(timeout=5)
+
+
+@pytest.fixture
+def snapshotting(monkeypatch):
+    """A TestingPostgres whose container has snapshot_sources, with a recording manager."""
+    monkeypatch.setattr(TestingPostgres, "_setup", lambda self, master_db=None: None)
+    pg = TestingPostgres()
+    calls = []
+    pg._pg_container = types.SimpleNamespace(
+        fingerprint="0123456789abcdef" * 4,
+        from_snapshot=False,
+        snapshot=lambda: calls.append("snapshot"),
+    )
+
+    def setup_template(migrate, name=None, persistent=False):
+        calls.append(("setup_template", name, persistent))
+
+    pg._postgres = types.SimpleNamespace(
+        name="tmp_testdb", template_built=True, setup_template=setup_template
+    )
+    return pg, calls
+
+
+def test_migrated_template_is_snapshotted(snapshotting):
+    pg, calls = snapshotting
+
+    pg._setup_template(lambda db: None)
+
+    assert calls == [("setup_template", "tmp_testdb_template_0123456789ab", True), "snapshot"]
+
+
+def test_no_snapshot_when_the_template_was_reused(snapshotting):
+    pg, calls = snapshotting
+    pg._postgres.template_built = False
+
+    pg._setup_template(lambda db: None)
+
+    assert "snapshot" not in calls
+
+
+def test_no_snapshot_when_booted_from_one(snapshotting):
+    pg, calls = snapshotting
+    pg._pg_container.from_snapshot = True
+
+    pg._setup_template(lambda db: None)
+
+    assert "snapshot" not in calls
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    """Record which backend TestingPostgres starts, with Docker up or down."""
+    started = []
+    docker = {"ready": True}
+    monkeypatch.setattr(
+        tp.PostgresDockerContainer,
+        "ensure_postgres_is_ready",
+        lambda self: started.append("docker"),
+    )
+    monkeypatch.setattr(DockerContainer, "is_docker_ready", lambda self: docker["ready"])
+    monkeypatch.setattr(
+        tp.LocalPostgresCluster, "__init__", lambda self, options: setattr(self, "options", options)
+    )
+    monkeypatch.setattr(
+        tp.LocalPostgresCluster, "ensure_postgres_is_ready", lambda self: started.append("local")
+    )
+    monkeypatch.setattr(tp.LocalPostgresCluster, "is_available", staticmethod(lambda o: True))
+    monkeypatch.setattr(TestingPostgres, "_setup", lambda self, master_db=None: None)
+    return started, docker
+
+
+@pytest.mark.parametrize(
+    ("backend", "docker_ready", "expected"),
+    [
+        ("auto", True, "docker"),
+        ("auto", False, "local"),
+        ("local", True, "local"),
+        ("docker", False, "docker"),
+    ],
+)
+def test_backend_selection(backends, backend, docker_ready, expected):
+    started, docker = backends
+    docker["ready"] = docker_ready
+
+    TestingPostgres()._create_postgres_container(ContainerOptions(backend=backend))
+
+    assert started == [expected]
+
+
+def test_auto_backend_falls_back_without_the_docker_cli(backends, no_docker, monkeypatch):
+    started, _ = backends
+    monkeypatch.setattr(DockerContainer, "is_docker_ready", IS_DOCKER_READY)
+
+    TestingPostgres()._create_postgres_container(ContainerOptions(backend="auto"))
+
+    assert started == ["local"]
@@ -0,0 +1,61 @@
+import pytest
+
+from testing_containers.models import RedisConfig
+from testing_containers.redis.redis_client import RedisClient, RedisError
+
+
+@pytest.fixture
+def client(fake_redis):
+    with RedisClient(RedisConfig(host="127.0.0.1", port=fake_redis.port)) as client:
+        yield client
+
+
+def test_execute_replies(client):
+    assert client.ping() is True
+    assert client.execute("SET", "key", "value") == "OK"
+    assert client.execute("SET", "key", "other", "NX") is None
+    assert client.execute("MGET", "key", "missing") == ["value", None]
+    assert client.execute("DEL", "key") == 1
+
+
+def test_error_replies_are_raised(client):
+    with pytest.raises(RedisError, match="DB index is out of range"):
+        client.execute("SELECT", 99)
+    assert client.ping() is True  # the connection is still usable
+
+
+def test_pipeline_is_one_round_trip(client, fake_redis):
+    assert client.pipeline(["SELECT", 3], ["SET", "key", "value"], ["SELECT", 0]) == ["OK"] * 3
+
+    assert fake_redis.data[3] == {"key": "value"}
+
+
+def test_flushdb_of_another_database(client, fake_redis):
+    fake_redis.data.update({0: {"lease": "me"}, 3: {"key": "value"}})
+
+    client.flushdb(3)
+
+    assert fake_redis.data == {0: {"lease": "me"}, 3: {}}
+    assert fake_redis.commands[-3:] == [["SELECT", "3"], ["FLUSHDB", "ASYNC"], ["SELECT", "0"]]
+
+
+def test_connects_to_the_configured_database(fake_redis):
+    with RedisClient(RedisConfig(host="127.0.0.1", port=fake_redis.port, db=5)) as client:
+        client.execute("SET", "key", "value")
+
+    assert fake_redis.data[5] == {"key": "value"}
+    assert RedisConfig(port=6380, db=5, password="secret").url == "redis://:secret@localhost:6380/5"
+
+
+def test_handshake_errors_are_raised(fake_redis):
+    fake_redis.password = "secret"
+    config = RedisConfig(host="127.0.0.1", port=fake_redis.port, password="wrong")
+
+    with RedisClient(config) as client, pytest.raises(RedisError, match="WRONGPASS"):
+        client.execute("SET", "key", "value")
+    with RedisClient(config.model_copy(update={"password": "secret", "db": 99})) as client:
+        with pytest.raises(RedisError, match="DB index is out of range"):
+            client.execute("SET", "key", "value")
+        assert client._sock is None
+
+    assert fake_redis.data.get(0, {}) == {}
@@ -0,0 +1,113 @@
+import subprocess
+
+import pytest
+
+import testing_containers.redis.local_redis_server as lrs
+from testing_containers.models import ContainerState, RedisOptions
+from testing_containers.redis.redis_docker_container import RedisDockerContainer
+
+
+def test_server_runs_without_persistence():
+    redis = RedisDockerContainer(RedisOptions(databases=32, server_settings={"maxmemory": "256mb"}))
+
+    assert redis.container.command == [
+        "redis-server",
+        "--save",
+        "",
+        "--appendonly",
+        "no",
+        "--databases",
+        "32",
+        "--maxmemory",
+        "256mb",
+    ]
+    assert redis.container.expose_ports == ["6380:6379"]
+
+
+def test_dynamic_port_is_read_back_after_start(monkeypatch):
+    redis = RedisDockerContainer(RedisOptions(port=None))
+    monkeypatch.setattr(redis.container, "is_docker_ready", lambda: True)
+    monkeypatch.setattr(redis.container, "start_container", lambda: None)
+    monkeypatch.setattr(
+        redis.container,
+        "get_state",
+        lambda refresh=False: ContainerState(name="testing-redis", ports={"6379/tcp": 49153}),
+    )
+
+    redis.start_container()
+
+    assert redis.container.expose_ports == ["6379"]
+    assert redis.config.port == 49153
+
+
+def test_ensure_redis_is_ready_exits_when_redis_not_ready(monkeypatch):
+    redis = RedisDockerContainer(RedisOptions())
+    monkeypatch.setattr(redis, "start_container", lambda: None)
+    monkeypatch.setattr(redis, "is_redis_ready", lambda: False)
+
+    with pytest.raises(SystemExit):
+        redis.ensure_redis_is_ready()
+
+
+def test_local_server_start_and_stop(tmp_path, monkeypatch):
+    popen_calls = []
+
+    class FakeProcess:
+        def __init__(self, args, **kwargs):
+            popen_calls.append(args)
+            self.killed = False
+
+        def poll(self):
+            return -9 if self.killed else None
+
+        def kill(self):
+            self.killed = True
+
+        def wait(self):
+            return -9
+
+    monkeypatch.setattr(lrs, "SHM_DIR", str(tmp_path))
+    monkeypatch.setattr(lrs.subprocess, "Popen", FakeProcess)
+    monkeypatch.setattr(lrs, "is_redis_accepting", lambda host, port: True)
+    server = lrs.LocalRedisServer(RedisOptions(), binary=tmp_path / "redis-server")
+
+    server.ensure_redis_is_ready()
+    work_dir = server.work_dir
+
+    (args,) = popen_calls
+    assert args[0] == str(tmp_path / "redis-server")
+    assert args[args.index("--port") + 1] == str(server.config.port)
+    assert args[args.index("--save") + 1] == ""
+    assert work_dir.parent == tmp_path and work_dir.is_dir()
+
+    process = server.process
+    server.stop_container()
+    server.stop_container()  # a second stop (e.g. at exit) is a no-op
+
+    assert process.killed
+    assert not work_dir.exists()
+
+
+def test_local_server_not_ready_when_it_exits(tmp_path, monkeypatch):
+    monkeypatch.setattr(lrs, "SHM_DIR", str(tmp_path))
+    server = lrs.LocalRedisServer(RedisOptions(), binary=tmp_path / "redis-server")
+    server.process = subprocess.Popen(["true"])
+    server.process.wait()
+
+    assert server.is_redis_ready(timeout=1) is False
+
+
+def test_find_redis_server(tmp_path, monkeypatch):
+    binary = tmp_path / "redis-server"
+    binary.write_text("")
+    binary.chmod(0o755)
+    monkeypatch.delenv(lrs.REDIS_SERVER_ENV, raising=False)
+    monkeypatch.setenv("PATH", str(tmp_path / "empty"))
+
+    assert lrs.find_redis_server(str(binary)) == binary
+    assert lrs.find_redis_server() is None
+    monkeypatch.setenv(lrs.REDIS_SERVER_ENV, str(binary))
+    assert lrs.find_redis_server() == binary
+    monkeypatch.delenv(lrs.REDIS_SERVER_ENV)
+    with pytest.raises(RuntimeError, match="redis-server not found"):
+        lrs.LocalRedisServer(RedisOptions())
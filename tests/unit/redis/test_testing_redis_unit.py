@@ -0,0 +1,114 @@
+import pytest
+
+import testing_containers.redis.testing_redis as tr
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import RedisConfig, RedisOptions
+from testing_containers.redis.testing_redis import LEASE_KEY_PREFIX, TestingRedis
+
+IS_DOCKER_READY = DockerContainer.is_docker_ready
+
+
+@pytest.fixture
+def testing_redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(tr.workers, "run_id", lambda: "run1")
+    redis = TestingRedis(config=RedisConfig(host="127.0.0.1", port=fake_redis.port))
+    yield redis
+    redis.client.close()
+
+
+def test_worker_database_is_leased(testing_redis, fake_redis):
+    assert testing_redis.databases == 16
+    assert testing_redis.db.db == 1
+    assert fake_redis.data[0][f"{LEASE_KEY_PREFIX}1"].startswith("run1:main:")
+
+
+def test_leased_databases_are_distinct_and_handed_back_empty(testing_redis, fake_redis):
+    with testing_redis.leased() as first, testing_redis.leased() as second:
+        assert (first.db, second.db) == (2, 3)
+        fake_redis.data[2] = {"key": "value"}
+
+    assert fake_redis.data[2] == {}
+    assert set(fake_redis.data[0]) == {f"{LEASE_KEY_PREFIX}1"}
+    with testing_redis.leased() as again:
+        assert again.db == 2  # free again
+
+
+def test_lease_skips_databases_held_by_others(testing_redis, fake_redis):
+    fake_redis.data[0][f"{LEASE_KEY_PREFIX}2"] = "other-run:gw0:1"
+    fake_redis.data[3] = {"stale": "data"}
+
+    db = testing_redis.lease()
+
+    assert db.db == 3
+    assert fake_redis.data[3] == {}  # emptied when leased
+
+
+def test_lease_fails_when_every_database_is_taken(testing_redis, fake_redis):
+    fake_redis.databases = testing_redis.databases = 3
+    testing_redis.lease()
+
+    with pytest.raises(RuntimeError, match="All 2 logical databases are leased"):
+        testing_redis.lease()
+
+
+def test_reset_flushes_the_worker_database_only(testing_redis, fake_redis):
+    fake_redis.data.update({1: {"mine": "1"}, 2: {"other": "2"}})
+
+    testing_redis.reset()
+
+    assert fake_redis.data[1] == {}
+    assert fake_redis.data[2] == {"other": "2"}
+    assert ["FLUSHDB", "ASYNC"] in fake_redis.commands
+
+
+def test_stop_releases_the_worker_database(testing_redis, fake_redis):
+    testing_redis.stop()
+
+    assert fake_redis.data[0] == {}
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    """Record which backend TestingRedis starts, with Docker up or down."""
+    started = []
+    docker = {"ready": True}
+    monkeypatch.setattr(
+        tr.RedisDockerContainer, "ensure_redis_is_ready", lambda self: started.append("docker")
+    )
+    monkeypatch.setattr(DockerContainer, "is_docker_ready", lambda self: docker["ready"])
+    monkeypatch.setattr(
+        tr.LocalRedisServer, "__init__", lambda self, options: setattr(self, "options", options)
+    )
+    monkeypatch.setattr(
+        tr.LocalRedisServer, "ensure_redis_is_ready", lambda self: started.append("local")
+    )
+    monkeypatch.setattr(tr.LocalRedisServer, "is_available", staticmethod(lambda o: True))
+    monkeypatch.setattr(TestingRedis, "_setup", lambda self, config=None: None)
+    return started, docker
+
+
+@pytest.mark.parametrize(
+    ("backend", "docker_ready", "expected"),
+    [
+        ("auto", True, "docker"),
+        ("auto", False, "local"),
+        ("local", True, "local"),
+        ("docker", False, "docker"),
+    ],
+)
+def test_backend_selection(backends, backend, docker_ready, expected):
+    started, docker = backends
+    docker["ready"] = docker_ready
+
+    TestingRedis()._create_redis_container(RedisOptions(backend=backend))
+
+    assert started == [expected]
+
+
+def test_auto_backend_falls_back_without_the_docker_cli(backends, no_docker, monkeypatch):
+    started, _ = backends
+    monkeypatch.setattr(DockerContainer, "is_docker_ready", IS_DOCKER_READY)
+
+    TestingRedis()._create_redis_container(RedisOptions(backend="auto"))
+
+    assert started == ["local"]
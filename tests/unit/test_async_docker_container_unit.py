@@ -0,0 +1,111 @@
+import asyncio
+import json
+
+import pytest
+
+from testing_containers.async_docker_container import AsyncDockerContainer
+from testing_containers.docker_container import DockerContainer
+
+
+class FakeProcess:
+    def __init__(self, returncode=0, stdout="", stderr=""):
+        self.returncode = returncode
+        self._out = (stdout.encode(), stderr.encode())
+
+    async def communicate(self):
+        return self._out
+
+
+@pytest.fixture
+def fake_exec(monkeypatch, docker_cli):
+    """Mock asyncio.create_subprocess_exec; `results` maps a docker sub-command to an answer."""
+    calls = []
+    results = {}
+
+    async def _fake_exec(*cmd, **kwargs):
+        calls.append(list(cmd))
+        return results.get(cmd[1], FakeProcess())
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", _fake_exec)
+    return calls, results
+
+
+@pytest.fixture
+def container() -> AsyncDockerContainer:
+    return AsyncDockerContainer(
+        DockerContainer(
+            container_name="async-psql",
+            image="postgres:16.3",
+            expose_ports=["5433:5432"],
+            env={"POSTGRES_PASSWORD": "password"},
+            transport="cli",
+        )
+    )
+
+
+def test_is_docker_ready_cli(container, fake_exec):
+    calls, _ = fake_exec
+    assert asyncio.run(container.is_docker_ready()) is True
+    assert calls == [["docker", "--version"], ["docker", "info"]]
+
+
+def test_is_docker_ready_cli_daemon_down(container, fake_exec, capsys):
+    _, results = fake_exec
+    results["info"] = FakeProcess(returncode=1)
+    assert asyncio.run(container.is_docker_ready()) is False
+    assert "Docker daemon is not running" in capsys.readouterr().out
+
+
+def test_get_state_cli(container, fake_exec):
+    _, results = fake_exec
+    results["inspect"] = FakeProcess(stdout=json.dumps([{"State": {"Running": True}}]))
+
+    state = asyncio.run(container.get_state())
+
+    assert state.exists is True
+    assert state.running is True
+
+
+def test_start_container_cli_creates_container(container, fake_exec, capsys):
+    calls, results = fake_exec
+    results["inspect"] = FakeProcess(returncode=1, stdout="[]")
+
+    asyncio.run(container.start_container())
+
+    run = calls[-1]
+    assert run[:4] == ["docker", "run", "--name", "async-psql"]
+    assert run[8:10] == ["-p", "5433:5432"]
+    assert "Creating and starting new container" in capsys.readouterr().out
+
+
+def test_exec_cli(container, fake_exec):
+    calls, results = fake_exec
+    results["exec"] = FakeProcess(stdout="PONG\n")
+
+    result = asyncio.run(container.exec(["redis-cli", "ping"]))
+
+    assert result.stdout == "PONG\n"
+    assert calls == [["docker", "exec", "async-psql", "redis-cli", "ping"]]
+
+
+def test_containers_start_concurrently_through_api(fake_docker_engine, fake_run_fail):
+    fake_docker_engine.images.add("redis:7")
+    containers = [
+        AsyncDockerContainer(
+            DockerContainer(
+                container_name=f"svc-{i}",
+                image="redis:7",
+                socket_path=fake_docker_engine.socket_path,
+            )
+        )
+        for i in range(3)
+    ]
+
+    async def _start_all():
+        await asyncio.gather(*(c.start_container() for c in containers))
+        return await asyncio.gather(*(c.get_state() for c in containers))
+
+    states = asyncio.run(_start_all())
+
+    assert all(state.running for state in states)
+    assert fake_run_fail == []  # no docker CLI process spawned
@@ -0,0 +1,141 @@
+import graphlib
+import threading
+
+import pytest
+
+from testing_containers import timing
+from testing_containers.container_group import ContainerGroup
+from testing_containers.docker_container import DockerContainer
+
+
+@pytest.fixture
+def events():
+    return []
+
+
+def _service(events, name, value=None):
+    def _start():
+        events.append(("start", name))
+        return value or name
+
+    return _start
+
+
+def _stop(events):
+    return lambda value: events.append(("stop", value))
+
+
+def test_independent_services_start_concurrently(events):
+    # Each start blocks until all three are running at the same time
+    barrier = threading.Barrier(3, timeout=5)
+    group = ContainerGroup()
+    for name in ("postgres", "redis", "localstack"):
+        group.add(name, lambda name=name: (barrier.wait(), name)[1])
+
+    group.start()
+
+    assert [group[name] for name in ("postgres", "redis", "localstack")] == [
+        "postgres",
+        "redis",
+        "localstack",
+    ]
+
+
+def test_dependencies_start_first_and_stop_last(events):
+    group = ContainerGroup()
+    group.add(
+        "app",
+        lambda: events.append(("start", "app", group["postgres"], group["redis"])) or "app",
+        stop=_stop(events),
+        depends_on=["postgres", "redis"],
+    )
+    group.add("postgres", _service(events, "postgres", "dsn"), stop=_stop(events))
+    group.add("redis", _service(events, "redis"), stop=_stop(events))
+
+    with group:
+        assert events[-1] == ("start", "app", "dsn", "redis")
+        assert len(events) == 3
+
+    assert events[3] == ("stop", "app")
+    assert set(events[4:]) == {("stop", "dsn"), ("stop", "redis")}
+    with pytest.raises(KeyError, match="not started"):
+        group["app"]
+
+
+def test_failed_service_stops_the_group(events, capsys):
+    def _fail():
+        raise RuntimeError("redis is not ready")
+
+    group = ContainerGroup()
+    group.add("postgres", _service(events, "postgres"), stop=_stop(events))
+    group.add("redis", _fail, stop=_stop(events), depends_on=["postgres"])
+    group.add("app", _service(events, "app"), stop=_stop(events), depends_on=["redis"])
+
+    with pytest.raises(RuntimeError, match="redis is not ready"):
+        group.start()
+
+    assert events == [("start", "postgres"), ("stop", "postgres")]
+    assert "redis failed to start" in capsys.readouterr().out
+
+
+def test_stop_stops_every_service_even_when_one_fails(events):
+    def _fail(value):
+        raise RuntimeError("cannot stop")
+
+    group = ContainerGroup()
+    group.add("postgres", _service(events, "postgres"), stop=_stop(events))
+    group.add("app", _service(events, "app"), stop=_fail, depends_on=["postgres"])
+    group.start()
+
+    with pytest.raises(RuntimeError, match="cannot stop"):
+        group.stop()
+
+    assert events[-1] == ("stop", "postgres")
+
+
+def test_invalid_graphs_are_rejected():
+    group = ContainerGroup().add("app", lambda: None, depends_on=["db"])
+    with pytest.raises(ValueError, match="unknown services: \\['db'\\]"):
+        group.start()
+
+    group.add("db", lambda: None, depends_on=["app"])
+    with pytest.raises(graphlib.CycleError):
+        group.start()
+    with pytest.raises(ValueError, match="already in the group"):
+        group.add("db", lambda: None)
+
+
+def test_add_container(events, monkeypatch):
+    class FakeContainer:
+        container_name = "testing-localstack"
+
+        def start_container(self):
+            events.append(("start", self.container_name))
+
+    monkeypatch.setattr(DockerContainer, "stop_container", lambda self: events.append("stop"))
+    monkeypatch.setattr(DockerContainer, "remove_container", lambda self: events.append("rm"))
+    container = FakeContainer()
+    group = ContainerGroup().add_container(container)
+    group.add_container(container, name="removed", remove=True)
+
+    with group:
+        assert group["testing-localstack"] is container
+
+    assert sorted(events[2:]) == ["rm", "stop"]
+
+
+def test_service_spans_nest_under_the_group_span():
+    timing.clear()
+    timing.record()
+    group = ContainerGroup().add("redis", lambda: None)
+
+    try:
+        group.start()
+    finally:
+        timing.record(False)
+
+    spans = {span.name: span for span in timing.spans()}
+    service = spans["container_group.start_service"]
+    assert service.parent_id == spans["container_group.start"].id
+    assert service.attributes == {"service": "redis"}
+    assert service.thread.startswith("container-group")
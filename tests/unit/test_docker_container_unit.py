@@ -1,8 +1,11 @@
+import json
 import types
 
 import pytest
 
-from testing_containers.docker_container import DockerContainer
+from testing_containers import readiness
+from testing_containers.docker_container import CONFIG_HASH_LABEL, DockerContainer
+from testing_containers.models import ContainerState
 
 
 @pytest.fixture
@@ -16,9 +19,24 @@ def container() -> DockerContainer:
             "POSTGRES_USER": "postgres",
             "POSTGRES_PASSWORD": "password",
         },
+        transport="cli",
     )
 
 
+def _state(container: DockerContainer, exists: bool, running: bool):
+    """Patchable replacement for DockerContainer.get_state (of a container it created)."""
+    return lambda refresh=False: ContainerState(
+        name=container.container_name,
+        exists=exists,
+        running=running,
+        labels={CONFIG_HASH_LABEL: container.config_hash()},
+    )
+
+
+def _inspect_output(name: str, running: bool) -> str:
+    return json.dumps([{"Name": f"/{name}", "State": {"Running": running}}])
+
+
 def test_container_name_and_defaults(container: DockerContainer):
     assert container.container_name == "ns-testing-psql"
     assert container.image == "postgres:16.3"
@@ -34,6 +52,13 @@ def test_is_docker_installed_no(container: DockerContainer, fake_run_fail):
     assert ["docker", "--version"] in fake_run_fail
 
 
+def test_is_docker_installed_without_the_cli(no_docker):
+    container = DockerContainer(container_name="c", image="redis:7")
+
+    assert container.is_docker_installed() is False
+    assert container.is_docker_ready() is False
+
+
 def test_is_docker_running_yes(container: DockerContainer, fake_run_success):
     assert container.is_docker_running() is True
     assert ["docker", "info"] in fake_run_success
@@ -77,8 +102,10 @@ def test_is_docker_ready_false_not_running(monkeypatch, container: DockerContain
 
 
 def test_is_container_running_true(monkeypatch, container: DockerContainer):
-    """Should return True when container name appears in stdout."""
-    fake_result = types.SimpleNamespace(stdout=f"{container.container_name}\n", returncode=0)
+    """Should return True when docker inspect reports the container as running."""
+    fake_result = types.SimpleNamespace(
+        stdout=_inspect_output(container.container_name, running=True), returncode=0
+    )
     monkeypatch.setattr(container, "_run_command", lambda cmd: fake_result)
 
     result = container.is_container_running()
@@ -87,8 +114,10 @@ def test_is_container_running_true(monkeypatch, container: DockerContainer):
 
 
 def test_is_container_running_false(monkeypatch, container: DockerContainer):
-    """Should return False when stdout is empty or different name."""
-    fake_result = types.SimpleNamespace(stdout="other-container\n", returncode=0)
+    """Should return False when the container exists but is stopped."""
+    fake_result = types.SimpleNamespace(
+        stdout=_inspect_output(container.container_name, running=False), returncode=0
+    )
     monkeypatch.setattr(container, "_run_command", lambda cmd: fake_result)
 
     result = container.is_container_running()
@@ -97,16 +126,18 @@ def test_is_container_running_false(monkeypatch, container: DockerContainer):
 
 
 def test_container_exists_true(monkeypatch, container: DockerContainer):
-    """Should return True when container name is found in stdout."""
-    fake_result = types.SimpleNamespace(stdout=f"{container.container_name}\n", returncode=0)
+    """Should return True when docker inspect finds the container."""
+    fake_result = types.SimpleNamespace(
+        stdout=_inspect_output(container.container_name, running=False), returncode=0
+    )
     monkeypatch.setattr(container, "_run_command", lambda cmd: fake_result)
 
     assert container.container_exists() is True
 
 
 def test_container_exists_false(monkeypatch, container: DockerContainer):
-    """Should return False when name not in stdout."""
-    fake_result = types.SimpleNamespace(stdout="other-container\n", returncode=0)
+    """Should return False when docker inspect does not find the container."""
+    fake_result = types.SimpleNamespace(stdout="[]", stderr="No such container", returncode=1)
     monkeypatch.setattr(container, "_run_command", lambda cmd: fake_result)
 
     assert container.container_exists() is False
@@ -114,8 +145,7 @@ def test_container_exists_false(monkeypatch, container: DockerContainer):
 
 def test_start_container_already_running(monkeypatch, container: DockerContainer, capsys):
     """Should return early if container is already running."""
-    monkeypatch.setattr(container, "is_container_running", lambda: True)
-    monkeypatch.setattr(container, "container_exists", lambda: True)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=True))
     monkeypatch.setattr(
         container,
         "_run_command",
@@ -131,8 +161,7 @@ def test_start_container_existing_stopped(
     monkeypatch, container: DockerContainer, capsys, fake_run_success
 ):
     """Should call `docker start <name>` when container exists but is stopped."""
-    monkeypatch.setattr(container, "is_container_running", lambda: False)
-    monkeypatch.setattr(container, "container_exists", lambda: True)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=False))
 
     container.start_container()
     out = capsys.readouterr().out
@@ -149,8 +178,7 @@ def test_start_container_create_and_run(
     monkeypatch, container: DockerContainer, capsys, fake_run_success
 ):
     """Should build correct docker run command when container does not exist."""
-    monkeypatch.setattr(container, "is_container_running", lambda: False)
-    monkeypatch.setattr(container, "container_exists", lambda: False)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=False, running=False))
 
     container.start_container()
     out = capsys.readouterr().out
@@ -170,6 +198,8 @@ def test_start_container_create_and_run(
         "run",
         "--name",
         container.container_name,
+        "--label",
+        f"{CONFIG_HASH_LABEL}={container.config_hash()}",
         *expected_env,
         *expected_ports,
         "-d",
@@ -188,7 +218,7 @@ def test_stop_container_running_only_stop(
     monkeypatch, container: DockerContainer, capsys, fake_run_success
 ):
     """If running and remove_container=False, call `docker stop` only."""
-    monkeypatch.setattr(container, "is_container_running", lambda: True)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=True))
     container.stop_container()
     out = capsys.readouterr().out
 
@@ -201,7 +231,7 @@ def test_remove_container_running(
     monkeypatch, container: DockerContainer, capsys, fake_run_success
 ):
     """If running and remove_container=True, call `docker stop` then `docker rm`."""
-    monkeypatch.setattr(container, "is_container_running", lambda: True)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=True))
 
     container.remove_container()
     out = capsys.readouterr().out
@@ -214,7 +244,7 @@ def test_remove_container_running(
 
 def test_stop_container_not_running(monkeypatch, container: DockerContainer, capsys):
     """If not running, do not call docker; just print a message."""
-    monkeypatch.setattr(container, "is_container_running", lambda: False)
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=False))
     monkeypatch.setattr(
         container,
         "_run_command",
@@ -225,3 +255,365 @@ def test_stop_container_not_running(monkeypatch, container: DockerContainer, cap
     out = capsys.readouterr().out
 
     assert f"Container {container.container_name} is not running." in out
+
+
+def test_start_container_name_conflict_starts_and_waits_for_it(
+    monkeypatch, container: DockerContainer, capsys, dummy_completed_process
+):
+    """The loser of the create race starts the container too, then waits for its port."""
+    calls = []
+    created = ContainerState(name=container.container_name, exists=True, running=True)
+    lookups = iter(
+        [
+            ContainerState(name=container.container_name),  # before `docker run`
+            created,  # started by the winner, its port not published yet
+            created.model_copy(update={"ports": {"5432/tcp": 5433}}),
+        ]
+    )
+    monkeypatch.setattr(container, "get_state", lambda refresh=False: next(lookups))
+    monkeypatch.setattr(readiness.time, "sleep", lambda _: None)
+
+    def _fake_run(cmd, **kw):
+        calls.append(cmd[:2])
+        if cmd[1] == "run":
+            stderr = 'Conflict. The container name "/ns-testing-psql" is already in use'
+            return dummy_completed_process(returncode=125, stderr=stderr)
+        return dummy_completed_process(returncode=0)
+
+    monkeypatch.setattr(container, "_run_command", _fake_run)
+
+    container.start_container()
+
+    assert calls == [["docker", "run"], ["docker", "start"]]
+    assert "was created concurrently, starting it" in capsys.readouterr().out
+
+
+def test_wait_until_started_exits_after_its_timeout(monkeypatch, container: DockerContainer):
+    monkeypatch.setattr(container, "get_state", _state(container, exists=True, running=False))
+
+    with pytest.raises(SystemExit):
+        container.wait_until_started(timeout=0)
+
+
+def test_create_conflict_through_api_starts_the_container(monkeypatch, fake_docker_engine):
+    fake_docker_engine.images.add("redis:7")
+    winner, loser = (
+        DockerContainer(
+            container_name="svc",
+            image="redis:7",
+            expose_ports=["6379"],
+            socket_path=fake_docker_engine.socket_path,
+        )
+        for _ in range(2)
+    )
+    monkeypatch.setattr(loser, "_has_drifted", lambda state: False)
+    loser.get_state()  # looked up before the winner creates it
+    loser.state_ttl = 60
+    api = winner._engine()
+    api.create_container("svc", winner._create_config())  # created, not started yet
+
+    loser.start_container()
+    api.start_container("svc")  # the winner's start answers 304: not an error
+
+    assert fake_docker_engine.requests.count(("POST", "/containers/svc/start")) == 2
+    assert loser.get_state().host_port(6379) == 49153
+
+
+def test_private_image_is_pulled_with_the_cli(
+    monkeypatch, fake_docker_engine, docker_cli, dummy_completed_process, capsys
+):
+    image = "registry.example.com/team/app:1"
+    fake_docker_engine.private_images.add(image)
+    container = DockerContainer(
+        container_name="svc", image=image, socket_path=fake_docker_engine.socket_path
+    )
+    calls = []
+
+    def _fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        fake_docker_engine.images.add(image)
+        return dummy_completed_process(returncode=0)
+
+    monkeypatch.setattr(container, "_run_command", _fake_run)
+
+    container.start_container()
+
+    assert calls == [["docker", "pull", image]]
+    assert "failed (pull access denied" in capsys.readouterr().out
+    assert container.get_state(refresh=True).running
+
+
+def test_start_container_run_failure_exits(
+    monkeypatch, container: DockerContainer, dummy_completed_process
+):
+    monkeypatch.setattr(container, "get_state", _state(container, exists=False, running=False))
+    monkeypatch.setattr(
+        container,
+        "_run_command",
+        lambda cmd, **kw: dummy_completed_process(returncode=125, stderr="no such image"),
+    )
+
+    with pytest.raises(SystemExit):
+        container.start_container()
+
+
+def test_get_state_inspects_the_exact_container_name(
+    monkeypatch, container: DockerContainer, dummy_completed_process
+):
+    """`foo` must not be mistaken for `foo-2`: docker inspect looks up the exact name."""
+    calls = []
+
+    def _fake_run(cmd, **kw):
+        calls.append(cmd)
+        return dummy_completed_process(returncode=1, stdout="[]", stderr="No such container")
+
+    monkeypatch.setattr(container, "_run_command", _fake_run)
+
+    state = container.get_state()
+
+    assert state == ContainerState(name=container.container_name)
+    assert calls == [["docker", "inspect", "--type", "container", container.container_name]]
+
+
+def test_get_state_is_cached_for_state_ttl(monkeypatch, dummy_completed_process):
+    container = DockerContainer(
+        container_name="cached", image="redis:7", transport="cli", state_ttl=60
+    )
+    calls = []
+
+    def _fake_run(cmd, **kw):
+        calls.append(cmd)
+        return dummy_completed_process(stdout=_inspect_output("cached", running=True))
+
+    monkeypatch.setattr(container, "_run_command", _fake_run)
+
+    assert container.is_container_running() is True
+    assert container.container_exists() is True
+    assert len(calls) == 1
+    container.get_state(refresh=True)
+    assert len(calls) == 2
+
+
+def test_start_container_does_a_single_lookup(monkeypatch, container: DockerContainer):
+    calls = []
+
+    def _fake_run(cmd, **kw):
+        calls.append(cmd[:2])
+        stdout = "[]" if cmd[1] == "inspect" else ""
+        return types.SimpleNamespace(returncode=0, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(container, "_run_command", _fake_run)
+
+    container.start_container()
+
+    assert calls == [["docker", "inspect"], ["docker", "run"]]
+
+
+def test_container_state_from_inspect():
+    info = {
+        "Image": "sha256:abc",
+        "Config": {"Labels": {"app": "tests"}},
+        "State": {"Running": True, "Status": "running", "Health": {"Status": "healthy"}},
+        "NetworkSettings": {
+            "Ports": {
+                "5432/tcp": [{"HostIp": "0.0.0.0", "HostPort": "49153"}],
+                "8080/tcp": None,
+            }
+        },
+    }
+
+    state = ContainerState.from_inspect("pg", info)
+
+    assert state.exists is True
+    assert state.running is True
+    assert state.status == "running"
+    assert state.health == "healthy"
+    assert state.labels == {"app": "tests"}
+    assert state.image_id == "sha256:abc"
+    assert state.host_port(5432) == 49153
+    assert state.host_port(8080) is None
+
+
+def test_run_options_are_passed_to_docker_run(monkeypatch, fake_run_success):
+    container = DockerContainer(
+        container_name="fast-psql",
+        image="postgres:16.3",
+        transport="cli",
+        command=["postgres", "-c", "fsync=off"],
+        tmpfs={"/var/lib/postgresql/data": "rw"},
+        shm_size="1g",
+        run_args=["--cpus", "2"],
+    )
+    monkeypatch.setattr(container, "get_state", _state(container, exists=False, running=False))
+
+    container.start_container()
+
+    assert [
+        "docker",
+        "run",
+        "--name",
+        "fast-psql",
+        "--label",
+        f"{CONFIG_HASH_LABEL}={container.config_hash()}",
+        "--tmpfs",
+        "/var/lib/postgresql/data:rw",
+        "--shm-size",
+        "1g",
+        "--cpus",
+        "2",
+        "-d",
+        "postgres:16.3",
+        "postgres",
+        "-c",
+        "fsync=off",
+    ] in fake_run_success
+
+
+def test_run_options_in_engine_api_config():
+    container = DockerContainer(
+        container_name="fast-psql",
+        image="postgres:16.3",
+        command=["postgres", "-c", "fsync=off"],
+        tmpfs={"/var/lib/postgresql/data": "rw"},
+        shm_size="1g",
+    )
+
+    config = container._create_config()
+
+    assert config["Cmd"] == ["postgres", "-c", "fsync=off"]
+    assert config["HostConfig"]["Tmpfs"] == {"/var/lib/postgresql/data": "rw"}
+    assert config["HostConfig"]["ShmSize"] == 1024**3
+
+
+def test_run_args_imply_the_cli():
+    container = DockerContainer(container_name="c", image="redis:7", run_args=["--cpus", "2"])
+    assert container._engine() is None
+
+    with pytest.raises(ValueError, match="run_args"):
+        DockerContainer(container_name="c", image="redis:7", run_args=["--cpus"], transport="api")
+
+
+def test_port_without_host_port_lets_docker_pick():
+    container = DockerContainer(
+        container_name="c", image="postgres:16.3", expose_ports=["5432", "6379:6379"]
+    )
+
+    assert container._start_command(exists=False)[6:10] == ["-p", "5432", "-p", "6379:6379"]
+    assert container._create_config()["HostConfig"]["PortBindings"] == {
+        "5432/tcp": [{"HostPort": ""}],
+        "6379/tcp": [{"HostPort": "6379"}],
+    }
+
+
+def test_host_port_reads_the_published_port_back(monkeypatch, container: DockerContainer):
+    info = {"Name": "/ns-testing-psql", "NetworkSettings": {"Ports": {}}}
+    info["NetworkSettings"]["Ports"]["5432/tcp"] = [{"HostIp": "0.0.0.0", "HostPort": "49153"}]
+    monkeypatch.setattr(container, "_inspect", lambda: info)
+
+    assert container.host_port(5432) == 49153
+    assert container.host_port(6379) is None
+
+
+def test_config_hash_changes_with_the_configuration(container: DockerContainer):
+    same = DockerContainer(
+        container_name="another-name",
+        image="postgres:16.3",
+        expose_ports=["5433:5432"],
+        env=dict(reversed(container.env.items())),
+    )
+    assert same.config_hash() == container.config_hash()
+
+    same.image = "postgres:17"
+    assert same.config_hash() != container.config_hash()
+
+
+def test_snapshot_keeps_the_config_hash_but_not_a_new_fingerprint(container: DockerContainer):
+    config_hash = container.config_hash()
+
+    container.use_snapshot("testing-containers-postgres:abc")
+
+    assert container.image == "testing-containers-postgres:abc"
+    assert container.config_hash() == config_hash
+    container.fingerprint = "new-migrations"
+    assert container.config_hash() != config_hash
+
+
+def _drifted(container: DockerContainer, running: bool):
+    return lambda refresh=False: ContainerState(
+        name=container.container_name,
+        id="abc123",
+        exists=True,
+        running=running,
+        labels={CONFIG_HASH_LABEL: "stale"},
+    )
+
+
+def test_drifted_container_is_recreated(monkeypatch, container: DockerContainer, fake_run_success):
+    monkeypatch.setattr(container, "get_state", _drifted(container, running=False))
+
+    container.start_container()
+
+    assert fake_run_success[0] == ["docker", "rm", "abc123"]
+    assert fake_run_success[1][:2] == ["docker", "run"]
+
+
+def test_running_drifted_container_is_recreated(
+    monkeypatch, container: DockerContainer, fake_run_success
+):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    monkeypatch.setattr(container, "get_state", _drifted(container, running=True))
+
+    container.start_container()
+
+    assert fake_run_success[0] == ["docker", "rm", "--force", "abc123"]
+    assert fake_run_success[1][:2] == ["docker", "run"]
+
+
+@pytest.mark.parametrize("shared_by", ["run_scoped", "xdist"])
+def test_running_drifted_container_shared_by_workers_is_reused(
+    monkeypatch, container: DockerContainer, fake_run_success, capsys, shared_by
+):
+    """The other pytest-xdist workers may be using it: never killed."""
+    if shared_by == "xdist":
+        monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    else:
+        monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+        container.run_scoped = True
+    monkeypatch.setattr(container, "get_state", _drifted(container, running=True))
+
+    container.start_container()
+
+    assert fake_run_success == []
+    assert "has another configuration but is running" in capsys.readouterr().out
+
+
+def test_drift_is_ignored_when_disabled(monkeypatch, fake_run_success, capsys):
+    container = DockerContainer(
+        container_name="c", image="redis:7", transport="cli", recreate_on_drift=False
+    )
+    state = ContainerState(name="c", exists=True, running=True)
+    monkeypatch.setattr(container, "get_state", lambda refresh=False: state)
+
+    container.start_container()
+
+    assert fake_run_success == []
+    assert "already running" in capsys.readouterr().out
+
+
+def test_drifted_container_is_recreated_through_api(fake_docker_engine, monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    fake_docker_engine.images.update({"redis:7", "redis:8"})
+    old = DockerContainer(
+        container_name="svc", image="redis:7", socket_path=fake_docker_engine.socket_path
+    )
+    old.start_container()
+    new = DockerContainer(
+        container_name="svc", image="redis:8", socket_path=fake_docker_engine.socket_path
+    )
+
+    new.start_container()
+    new.start_container()  # now up to date: reused as is
+
+    assert ("DELETE", "/containers/id-svc") in fake_docker_engine.requests
+    assert fake_docker_engine.requests.count(("POST", "/containers/create")) == 2
+    assert fake_docker_engine.containers["svc"]["Config"]["Image"] == "redis:8"
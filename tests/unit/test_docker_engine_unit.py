@@ -0,0 +1,169 @@
+import struct
+
+import pytest
+
+from testing_containers.docker_container import DockerContainer
+from testing_containers.docker_engine import (
+    DockerEngineClient,
+    DockerEngineError,
+    demux_stream,
+    parse_size,
+    socket_path_from_env,
+    split_image,
+)
+
+
+@pytest.fixture
+def client(fake_docker_engine) -> DockerEngineClient:
+    return DockerEngineClient(fake_docker_engine.socket_path)
+
+
+@pytest.fixture
+def api_container(fake_docker_engine) -> DockerContainer:
+    return DockerContainer(
+        container_name="api-psql",
+        image="postgres:16.3",
+        expose_ports=["5433:5432"],
+        env={"POSTGRES_PASSWORD": "password"},
+        socket_path=fake_docker_engine.socket_path,
+    )
+
+
+def test_socket_path_from_env(monkeypatch):
+    monkeypatch.delenv("DOCKER_HOST", raising=False)
+    assert socket_path_from_env() == "/var/run/docker.sock"
+    monkeypatch.setenv("DOCKER_HOST", "unix:///run/user/1000/docker.sock")
+    assert socket_path_from_env() == "/run/user/1000/docker.sock"
+    monkeypatch.setenv("DOCKER_HOST", "tcp://10.0.0.1:2375")
+    assert socket_path_from_env() is None
+
+
+def test_split_image():
+    assert split_image("postgres:16.3") == ("postgres", "16.3")
+    assert split_image("redis") == ("redis", "latest")
+    assert split_image("localhost:5000/redis") == ("localhost:5000/redis", "latest")
+    assert split_image("postgres@sha256:abc") == ("postgres@sha256:abc", "")
+
+
+def test_parse_size():
+    assert parse_size("1g") == 1024**3
+    assert parse_size("512M") == 512 * 1024**2
+    assert parse_size("1024") == 1024
+    assert parse_size("512mb") == 512 * 1024**2
+    assert parse_size("1GB") == 1024**3
+    assert parse_size("64kb") == 64 * 1024
+
+
+def test_demux_stream():
+    data = struct.pack(">BxxxL", 1, 3) + b"out" + struct.pack(">BxxxL", 2, 3) + b"err"
+    assert demux_stream(data) == (b"out", b"err")
+
+
+def test_from_env_without_socket():
+    assert DockerEngineClient.from_env("/nonexistent/docker.sock") is None
+
+
+def test_requests_reuse_one_connection(client, fake_docker_engine):
+    assert client.ping() is True
+    sock = client._conn.sock
+    assert client.inspect_container("missing") is None
+    assert client._conn.sock is sock
+    assert fake_docker_engine.requests == [("GET", "/_ping"), ("GET", "/containers/missing/json")]
+
+
+def test_ping_false_when_daemon_unreachable():
+    assert DockerEngineClient("/nonexistent/docker.sock").ping() is False
+
+
+def test_create_container_pulls_missing_image(client, fake_docker_engine):
+    container_id = client.create_container("new", {"Image": "redis:7", "Env": []})
+
+    assert container_id == "id-new"
+    assert ("POST", "/images/create") in fake_docker_engine.requests
+    assert "redis:7" in fake_docker_engine.images
+
+
+def test_errors_raise_docker_engine_error(client):
+    with pytest.raises(DockerEngineError) as ei:
+        client.start_container("missing")
+    assert ei.value.status == 404
+    assert "No such container" in ei.value.message
+
+
+def test_commit_container_and_inspect_image(client, fake_docker_engine):
+    fake_docker_engine.add_container("pg")
+    assert client.inspect_image("snap:abc") is None
+
+    client.commit_container("pg", "snap:abc")
+
+    assert client.inspect_image("snap:abc") == {"Id": "sha256:snap:abc"}
+
+
+def test_exec_returns_exit_code_and_output(client, fake_docker_engine):
+    fake_docker_engine.add_container("pg")
+    fake_docker_engine.exec_result = (2, "hello\n", "oops\n")
+
+    assert client.exec("pg", ["echo", "hello"]) == (2, "hello\n", "oops\n")
+
+
+def test_container_auto_transport_uses_api(api_container, fake_docker_engine, fake_run_fail):
+    """With a reachable socket, no docker CLI process is spawned."""
+    assert api_container.is_docker_ready() is True
+    assert api_container.container_exists() is False
+
+    api_container.start_container()
+
+    assert api_container.is_container_running() is True
+    env = fake_docker_engine.containers["api-psql"]["Config"]["Env"]
+    assert env == ["POSTGRES_PASSWORD=password"]
+    assert fake_run_fail == []
+
+
+def test_container_exec_through_api(api_container, fake_docker_engine, fake_run_fail):
+    fake_docker_engine.add_container("api-psql")
+    fake_docker_engine.exec_result = (0, "accepting connections\n", "")
+
+    result = api_container.exec(["pg_isready"])
+
+    assert result.returncode == 0
+    assert result.stdout == "accepting connections\n"
+    assert fake_run_fail == []
+
+
+def test_container_stop_and_remove_through_api(api_container, fake_docker_engine):
+    fake_docker_engine.add_container("api-psql")
+
+    api_container.stop_container()
+    assert fake_docker_engine.containers["api-psql"]["State"]["Running"] is False
+
+    api_container.remove_container()
+    assert "api-psql" not in fake_docker_engine.containers
+
+
+def test_container_falls_back_to_cli_without_socket(fake_run_success):
+    container = DockerContainer(
+        container_name="cli-psql", image="postgres:16.3", socket_path="/nonexistent/docker.sock"
+    )
+
+    assert container.is_docker_running() is True
+    assert ["docker", "info"] in fake_run_success
+
+
+def test_container_state_through_api(api_container, fake_docker_engine):
+    fake_docker_engine.add_container("api-psql", running=False)
+
+    state = api_container.get_state()
+
+    assert state.exists is True
+    assert state.running is False
+    assert state.image_id == "sha256:postgres:16.3"
+    assert fake_docker_engine.requests.count(("GET", "/containers/api-psql/json")) == 1
+
+
+def test_container_image_exists_and_commit_through_api(api_container, fake_docker_engine):
+    fake_docker_engine.add_container("api-psql")
+
+    assert api_container.image_exists() is False
+    api_container.commit("snap:abc")
+
+    assert api_container.image_exists("snap:abc") is True
@@ -0,0 +1,45 @@
+import pytest
+
+from testing_containers.fingerprint import fingerprint
+
+
+@pytest.fixture
+def migrations(tmp_path):
+    versions = tmp_path / "versions"
+    versions.mkdir()
+    (versions / "001_init.py").write_text("create table users")
+    (versions / "002_orders.py").write_text("create table orders")
+    return versions
+
+
+def test_fingerprint_is_stable(migrations):
+    assert fingerprint([migrations]) == fingerprint([str(migrations)])
+
+
+def test_fingerprint_changes_with_contents_and_names(migrations):
+    before = fingerprint([migrations])
+
+    (migrations / "002_orders.py").write_text("create table orders (id int)")
+    edited = fingerprint([migrations])
+    (migrations / "002_orders.py").rename(migrations / "003_orders.py")
+    renamed = fingerprint([migrations])
+
+    assert len({before, edited, renamed}) == 3
+
+
+def test_fingerprint_ignores_bytecode(migrations):
+    before = fingerprint([migrations])
+
+    (migrations / "__pycache__").mkdir()
+    (migrations / "__pycache__" / "001_init.cpython-313.pyc").write_bytes(b"\0")
+
+    assert fingerprint([migrations]) == before
+
+
+def test_fingerprint_includes_extra_values(migrations):
+    assert fingerprint([migrations], "postgres:16.3") != fingerprint([migrations], "postgres:17")
+
+
+def test_fingerprint_missing_source(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        fingerprint([tmp_path / "missing"])
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+import pytest
+
+import testing_containers
+import testing_containers.postgres
+
+HEAVY_MODULES = ("psycopg", "pydantic", "asyncio")
+
+
+def _loaded_after(statement):
+    """The heavy modules loaded by `statement` in a fresh interpreter."""
+    script = (
+        f"import sys; {statement}; "
+        f"print(' '.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return result.stdout.split()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import testing_containers",
+        "import testing_containers.postgres",
+        "import testing_containers.pytest_plugin",
+    ],
+)
+def test_importing_the_package_loads_no_heavy_dependency(statement):
+    assert _loaded_after(statement) == []
+
+
+def test_heavy_dependencies_load_on_first_use():
+    assert "pydantic" in _loaded_after("from testing_containers import DBConfig")
+    assert "psycopg" in _loaded_after("from testing_containers.postgres import ConnectionPool")
+
+
+@pytest.mark.parametrize("package", [testing_containers, testing_containers.postgres])
+def test_every_public_name_resolves(package):
+    for name in package.__all__:
+        assert getattr(package, name).__name__ == name
+        assert name in dir(package)
+
+
+def test_unknown_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError, match="NotAThing"):
+        _ = testing_containers.NotAThing
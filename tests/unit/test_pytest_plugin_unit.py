@@ -0,0 +1,135 @@
+import types
+
+import pytest
+
+from testing_containers import pytest_plugin
+
+# Run the plugin under its module name, whether or not the package's entry point is installed
+PLUGIN_ARGS = ("-p", "no:testing_containers", "-p", "testing_containers.pytest_plugin")
+
+
+class FakeManager:
+    def __init__(self, events):
+        self.events = events
+        self.testdb = types.SimpleNamespace(name="tmp_testdb")
+        self.template = None
+
+    def drop_database(self, db_name):
+        self.events.append(("drop", db_name))
+
+    def create_database(self, db_name, template=None):
+        self.events.append(("create", db_name))
+
+    def _db_config(self, db_name):
+        return types.SimpleNamespace(name=db_name)
+
+    def reset(self):
+        self.events.append(("reset",))
+
+
+@pytest.fixture
+def fake_testing_postgres(monkeypatch):
+    events = []
+
+    class FakeTestingPostgres:
+        def __init__(self, master_db=None, options=None, migrate=None):
+            events.append(("start", options.fast))
+            self.postgres = FakeManager(events)
+
+        def stop(self):
+            events.append(("stop",))
+
+    monkeypatch.setattr(
+        "testing_containers.postgres.testing_postgres.TestingPostgres", FakeTestingPostgres
+    )
+    return events
+
+
+def test_postgres_is_not_started_when_no_selected_test_needs_it(pytester, fake_testing_postgres):
+    pytester.makepyfile(
+        """
+        def test_unit_only():
+            pass
+
+        def test_db(postgres_db):
+            pass
+        """
+    )
+
+    result = pytester.runpytest(*PLUGIN_ARGS, "-k", "unit_only")
+
+    result.assert_outcomes(passed=1, deselected=1)
+    assert fake_testing_postgres == []
+
+
+def test_postgres_is_started_once_and_stopped_at_session_end(pytester, fake_testing_postgres):
+    pytester.makeconftest(
+        """
+        import pytest
+        from testing_containers import ContainerOptions
+
+        @pytest.fixture(scope="session")
+        def testing_postgres_options():
+            return ContainerOptions(fast=True)
+        """
+    )
+    pytester.makepyfile(
+        """
+        def test_one(postgres_db):
+            assert postgres_db.name == "tmp_testdb"
+
+        def test_two(postgres_module_db):
+            assert postgres_module_db.name.startswith("tmp_testdb_module_")
+        """
+    )
+
+    result = pytester.runpytest(*PLUGIN_ARGS)
+
+    result.assert_outcomes(passed=2)
+    assert fake_testing_postgres[0] == ("start", True)
+    assert [e for e in fake_testing_postgres if e[0] == "start"] == [("start", True)]
+    assert fake_testing_postgres[-1] == ("stop",)
+    module_db = fake_testing_postgres[2][1]
+    assert fake_testing_postgres[1:4] == [
+        ("drop", module_db),
+        ("create", module_db),
+        ("drop", module_db),
+    ]
+
+
+def test_create_database_clones_the_template_when_there_is_one():
+    calls = []
+    manager = types.SimpleNamespace(
+        template=types.SimpleNamespace(name="tmp_testdb_template"),
+        clone_database=lambda db_name: calls.append(db_name) or db_name,
+    )
+
+    assert pytest_plugin._create_database(manager, "db_a") == "db_a"
+    assert calls == ["db_a"]
+
+
+def test_redis_db_is_a_database_of_its_own_per_test(pytester, fake_redis):
+    pytester.makeconftest(
+        f"""
+        import pytest
+        from testing_containers import RedisConfig
+
+        @pytest.fixture(scope="session")
+        def testing_redis_config():
+            return RedisConfig(host="127.0.0.1", port={fake_redis.port})
+        """
+    )
+    pytester.makepyfile(
+        """
+        def test_one(redis_db, testing_redis):
+            assert redis_db.db != testing_redis.db.db
+
+        def test_two(redis_db):
+            assert redis_db.db == 2  # the database of test_one was handed back
+        """
+    )
+
+    result = pytester.runpytest(*PLUGIN_ARGS)
+
+    result.assert_outcomes(passed=2)
+    assert fake_redis.data[0] == {}  # every lease released at session end
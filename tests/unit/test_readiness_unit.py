@@ -0,0 +1,161 @@
+import asyncio
+import socket
+import struct
+import threading
+
+import pytest
+
+from testing_containers import readiness
+from testing_containers.readiness import (
+    Backoff,
+    async_wait_until,
+    is_port_open,
+    is_postgres_accepting,
+    is_postgres_accepting_async,
+    is_redis_accepting,
+    wait_until,
+)
+
+
+@pytest.fixture
+def server():
+    """A one-shot TCP server replying `reply` (then closing) to the first message it gets."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    state = {"reply": b"", "received": b""}
+
+    def _serve():
+        conn, _ = listener.accept()
+        with conn:
+            state["received"] = conn.recv(4096)
+            conn.sendall(state["reply"])
+
+    thread = threading.Thread(target=_serve, daemon=True)
+    yield listener.getsockname()[1], state, thread
+    listener.close()
+
+
+def _error_response(code: str) -> bytes:
+    body = b"SFATAL\0C" + code.encode() + b"\0Mmessage\0\0"
+    return b"E" + struct.pack("!i", 4 + len(body)) + body
+
+
+def test_backoff_grows_exponentially_up_to_maximum():
+    delays = Backoff(initial=0.01, factor=2, maximum=0.05, jitter=0).delays()
+    assert [next(delays) for _ in range(5)] == [0.01, 0.02, 0.04, 0.05, 0.05]
+
+
+def test_backoff_jitter_stays_within_bounds():
+    delays = Backoff(initial=0.1, factor=1, jitter=0.5).delays()
+    assert all(0.05 <= next(delays) <= 0.15 for _ in range(100))
+
+
+def test_wait_until_returns_as_soon_as_probe_succeeds(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(readiness.time, "sleep", sleeps.append)
+    answers = iter([False, False, True])
+
+    assert wait_until(lambda: next(answers), backoff=Backoff(jitter=0)) is True
+    assert sleeps == [0.02, 0.04]
+
+
+def test_wait_until_respects_deadline(monkeypatch):
+    clock = iter([0.0, 0.5, 1.2])
+    sleeps = []
+    monkeypatch.setattr(readiness.time, "monotonic", lambda: next(clock))
+    monkeypatch.setattr(readiness.time, "sleep", sleeps.append)
+
+    assert wait_until(lambda: False, timeout=1, backoff=Backoff(initial=1, jitter=0)) is False
+    assert sleeps == [0.5]  # never sleeps past the deadline
+
+
+def test_is_port_open(server):
+    port, _, _ = server
+    assert is_port_open("127.0.0.1", port) is True
+
+
+def test_is_port_open_when_connection_closed_without_data():
+    with socket.socket() as listener:
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        # Accepts then closes, like Docker's proxy with nothing listening behind it
+        thread = threading.Thread(target=lambda: listener.accept()[0].close(), daemon=True)
+        thread.start()
+
+        assert is_port_open("127.0.0.1", listener.getsockname()[1]) is False
+
+
+def test_is_port_open_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    assert is_port_open("127.0.0.1", port) is False
+
+
+def test_is_postgres_accepting_on_auth_request(server):
+    port, state, thread = server
+    state["reply"] = b"R" + struct.pack("!ii", 8, 0)
+    thread.start()
+
+    assert is_postgres_accepting("127.0.0.1", port, user="alice") is True
+    thread.join()
+    assert b"user\0alice\0database\0postgres\0" in state["received"]
+
+
+def test_is_postgres_accepting_false_while_starting_up(server):
+    port, state, thread = server
+    state["reply"] = _error_response("57P03")
+    thread.start()
+
+    assert is_postgres_accepting("127.0.0.1", port) is False
+
+
+def test_is_postgres_accepting_true_on_other_errors(server):
+    """An auth or unknown-database error still means the server accepts connections."""
+    port, state, thread = server
+    state["reply"] = _error_response("28P01")
+    thread.start()
+
+    assert is_postgres_accepting("127.0.0.1", port) is True
+
+
+def test_is_postgres_accepting_false_when_connection_is_closed(server):
+    port, _, thread = server
+    thread.start()
+
+    assert is_postgres_accepting("127.0.0.1", port) is False
+
+
+@pytest.mark.parametrize(
+    ("reply", "accepting"),
+    [
+        (b"+PONG\r\n", True),
+        (b"-NOAUTH Authentication required.\r\n", True),
+        (b"-LOADING Redis is loading the dataset in memory\r\n", False),
+        (b"", False),
+    ],
+)
+def test_is_redis_accepting(server, reply, accepting):
+    port, state, thread = server
+    state["reply"] = reply
+    thread.start()
+
+    assert is_redis_accepting("127.0.0.1", port) is accepting
+    thread.join()
+    assert state["received"] == b"PING\r\n"
+
+
+def test_is_postgres_accepting_async(server):
+    port, state, thread = server
+    state["reply"] = b"R" + struct.pack("!ii", 8, 0)
+    thread.start()
+
+    assert asyncio.run(is_postgres_accepting_async("127.0.0.1", port)) is True
+
+
+def test_async_wait_until_gives_up_at_deadline():
+    async def _never():
+        return False
+
+    assert asyncio.run(async_wait_until(_never, timeout=0.05)) is False
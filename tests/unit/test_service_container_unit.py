@@ -0,0 +1,94 @@
+import types
+
+import pytest
+
+from testing_containers import service_container as sc
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerOptions, ContainerState, RedisOptions
+from testing_containers.postgres.postgres_docker_container import PostgresDockerContainer
+from testing_containers.redis.redis_docker_container import RedisDockerContainer
+
+
+@pytest.fixture
+def run_id(monkeypatch):
+    monkeypatch.setattr(sc.workers, "run_id", lambda: "1a2b3c4d5e6f")
+
+
+def test_container_options_default_to_the_shared_container():
+    options = sc.container_options(ContainerOptions(namespace="shop"), "testing-postgres")
+
+    assert options.name == "shop-testing-postgres"
+    assert options.port == 5433
+    assert options.should_stop is False
+    assert sc.container_options(RedisOptions(), "testing-redis").name == "testing-redis"
+
+
+@pytest.mark.parametrize(
+    ("options", "base_name"),
+    [
+        (ContainerOptions(namespace="shop", run_scoped=True), "testing-postgres"),
+        (RedisOptions(namespace="shop", run_scoped=True), "testing-redis"),
+    ],
+)
+def test_run_scoped_container_options(run_id, options, base_name):
+    completed = sc.container_options(options, base_name)
+
+    assert completed.name == f"shop-{base_name}-1a2b3c4d"
+    assert completed.port is None  # picked by Docker
+    assert completed.should_stop is True
+    assert completed.remove_on_stop is True
+    pinned = sc.container_options(options.model_copy(update={"port": 6000}), base_name)
+    assert pinned.port == 6000
+
+
+def test_last_worker(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert sc.is_last_worker(False, lambda: pytest.fail("no other worker to ask")) is True
+
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    assert sc.is_last_worker(False, lambda: []) is False  # a shared container stays up
+    assert sc.is_last_worker(True, lambda: ["tmp_testdb_gw0"]) is False
+    assert sc.is_last_worker(True, lambda: []) is True
+
+
+def test_shared_container_is_left_up_unless_last_worker(capsys):
+    stopped = []
+    container = types.SimpleNamespace(shared=True, stop_container=lambda: stopped.append(1))
+
+    sc.stop_service(container, last_worker=False)
+    assert stopped == []
+    assert "leaving it up" in capsys.readouterr().out
+    sc.stop_service(container, last_worker=True)
+    sc.stop_service(None, last_worker=True)
+    assert stopped == [1]
+
+
+@pytest.mark.parametrize(
+    ("service", "port", "server"),
+    [
+        (PostgresDockerContainer(ContainerOptions(port=None)), 5432, "master_db"),
+        (RedisDockerContainer(RedisOptions(port=None)), 6379, "config"),
+    ],
+)
+def test_services_share_the_container_lifecycle(monkeypatch, service, port, server):
+    assert isinstance(service.container, DockerContainer)
+    assert service.container.expose_ports == [str(port)]
+    monkeypatch.setattr(service.container, "is_docker_ready", lambda: True)
+    monkeypatch.setattr(service.container, "image_exists", lambda image=None: False)
+    monkeypatch.setattr(service.container, "start_container", lambda: None)
+    state = ContainerState(name="svc", exists=True, running=True, ports={f"{port}/tcp": 49153})
+    monkeypatch.setattr(service.container, "get_state", lambda refresh=False: state)
+
+    service.start_container()
+
+    assert getattr(service, server).port == 49153
+    with pytest.raises(RuntimeError, match=f"publishes no port for {port}"):
+        type(service)(service.options).use_published_port(ContainerState(name="svc"))
+
+
+def test_wait_ready_reports_the_service(monkeypatch, capsys):
+    service = RedisDockerContainer(RedisOptions())
+    monkeypatch.setattr(sc, "wait_until", lambda probe, timeout, backoff: False)
+
+    assert service.is_redis_ready(timeout=0) is False
+    assert "⚠️  Redis is not ready after 0s." in capsys.readouterr().out
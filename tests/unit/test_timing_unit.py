@@ -0,0 +1,116 @@
+import contextlib
+import json
+import threading
+
+import pytest
+
+from testing_containers import timing
+from testing_containers.models import DBConfig
+from testing_containers.postgres.postgres_manager import PostgresManager
+
+
+@pytest.fixture(autouse=True)
+def _clean_spans():
+    timing.clear()
+    timing.record()
+    yield
+    timing.record(False)
+    timing.clear()
+
+
+def test_spans_are_nested_and_recorded():
+    with timing.span("outer", container="pg") as outer, timing.span("inner") as inner:
+        pass
+
+    assert [s.name for s in timing.spans()] == ["inner", "outer"]
+    assert inner.parent_id == outer.id
+    assert outer.parent_id is None
+    assert outer.attributes == {"container": "pg"}
+    assert outer.duration >= inner.duration >= 0
+    assert outer.thread == threading.current_thread().name
+
+
+def test_errors_are_recorded_and_reraised():
+    with pytest.raises(SystemExit), timing.span("docker.start_container"):
+        raise SystemExit(1)
+
+    assert timing.spans()[0].error == "SystemExit"
+
+
+def test_listeners_get_finished_spans():
+    received = []
+    timing.add_listener(received.append)
+    try:
+        with timing.span("phase"):
+            assert received == []
+    finally:
+        timing.remove_listener(received.append)
+
+    assert [s.name for s in received] == ["phase"]
+
+
+def test_timed_decorator():
+    @timing.timed("postgres.migrate")
+    def migrate(value):
+        return value * 2
+
+    assert migrate(21) == 42
+    assert [s.name for s in timing.spans()] == ["postgres.migrate"]
+
+
+def test_report_summarizes_phases():
+    for _ in range(2):
+        with timing.span("postgres.create_database"):
+            pass
+
+    report = timing.report()
+
+    assert report["phases"]["postgres.create_database"]["count"] == 2
+    assert len(report["spans"]) == 2
+    json.dumps(report)  # JSON serializable
+
+
+def test_only_phase_totals_are_kept_unless_recording(monkeypatch):
+    timing.record(False)
+    monkeypatch.delenv(timing.REPORT_ENV_VAR, raising=False)
+    for _ in range(3):
+        with timing.span("postgres.reset"):
+            pass
+
+    assert timing.spans() == []
+    assert timing.report()["phases"]["postgres.reset"]["count"] == 3
+
+
+def test_recorded_spans_are_bounded(monkeypatch):
+    monkeypatch.setattr(timing, "_spans", timing.deque(maxlen=2))
+    for name in ("a", "b", "c"):
+        with timing.span(name):
+            pass
+
+    assert [s.name for s in timing.spans()] == ["b", "c"]
+    assert timing.report()["phases"]["a"]["count"] == 1
+
+
+def test_report_is_written_at_exit(tmp_path, monkeypatch):
+    monkeypatch.setenv(timing.REPORT_ENV_VAR, str(tmp_path / "timing.json"))
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw1")
+    with timing.span("phase"):
+        pass
+
+    timing._write_report_at_exit()
+
+    report = json.loads((tmp_path / "timing.gw1.json").read_text())
+    assert "phase" in report["phases"]
+
+
+def test_library_phases_are_timed(monkeypatch):
+    mgr = PostgresManager(DBConfig(name="postgres", user="u", password="p", port=5432))
+    mgr.template = mgr._db_config("golden")
+    monkeypatch.setattr(mgr, "_advisory_lock", lambda key: contextlib.nullcontext())
+    monkeypatch.setattr(mgr, "_database_exists", lambda name: True)
+    monkeypatch.setattr(mgr, "drop_database", lambda name: None)
+    monkeypatch.setattr(mgr, "create_database", lambda name, template=None: None)
+
+    mgr.clone_database("clone_db")
+
+    assert [s.name for s in timing.spans()] == ["postgres.clone_database"]
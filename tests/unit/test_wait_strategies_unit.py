@@ -0,0 +1,191 @@
+import http.server
+import socket
+import subprocess
+import threading
+import types
+
+import pytest
+
+from testing_containers import readiness
+from testing_containers.docker_container import DockerContainer
+from testing_containers.models import ContainerState
+from testing_containers.wait_strategies import (
+    WaitForCommand,
+    WaitForHealthcheck,
+    WaitForHttp,
+    WaitForLog,
+    WaitForPort,
+    WaitStrategy,
+)
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(readiness.time, "sleep", lambda *_: None)
+
+
+def _container(ports=None, health=None, **attributes):
+    state = ContainerState(name="svc", exists=True, running=True, ports=ports or {}, health=health)
+    return types.SimpleNamespace(get_state=lambda refresh=False: state, **attributes)
+
+
+@pytest.fixture
+def listening_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        sock.listen()
+        yield sock.getsockname()[1]
+
+
+def test_wait_for_port(listening_port):
+    container = _container(ports={"6379/tcp": listening_port})
+
+    assert WaitForPort(6379, host="127.0.0.1", timeout=1).wait(container) is True
+    assert WaitForPort(5432, host="127.0.0.1", timeout=0).wait(container) is False
+
+
+@pytest.fixture
+def proxied_port():
+    """A port accepting connections and closing them at once, like Docker's port proxy."""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+
+    def _serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            conn.close()
+
+    threading.Thread(target=_serve, daemon=True).start()
+    yield listener.getsockname()[1]
+    listener.close()
+
+
+def test_wait_for_port_ignores_connections_closed_at_once(proxied_port):
+    container = _container(ports={"6379/tcp": proxied_port})
+
+    assert WaitForPort(6379, host="127.0.0.1", timeout=0.3).wait(container) is False
+
+
+@pytest.fixture
+def http_port():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/health" else 503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+
+def test_wait_for_http(http_port):
+    container = _container(ports={"8080/tcp": http_port})
+
+    assert WaitForHttp("/health", port=8080, host="127.0.0.1", timeout=1).wait(container)
+    assert not WaitForHttp("/", port=8080, host="127.0.0.1", timeout=0).wait(container)
+    assert WaitForHttp("/", port=8080, status=503, host="127.0.0.1", timeout=1).wait(container)
+
+
+def test_wait_for_command_retries_until_it_succeeds():
+    codes = [1, 1, 0]
+    calls = []
+
+    def _exec(command):
+        calls.append(command)
+        return subprocess.CompletedProcess(command, codes.pop(0))
+
+    container = _container(exec=_exec)
+
+    assert WaitForCommand(["redis-cli", "ping"], timeout=5).wait(container) is True
+    assert calls == [["redis-cli", "ping"]] * 3
+
+
+def test_wait_for_healthcheck():
+    assert WaitForHealthcheck(timeout=1).wait(_container(health="healthy")) is True
+    assert WaitForHealthcheck(timeout=0).wait(_container(health="starting")) is False
+
+
+def test_wait_for_log_counts_matches():
+    container = _container(
+        follow_logs=lambda timeout: (
+            line for line in ["starting", "ready on 1", "noise", "ready on 2"]
+        )
+    )
+
+    assert WaitForLog(r"ready on \d", times=2, timeout=1).wait(container) is True
+    assert WaitForLog(r"ready on \d", times=3, timeout=0).wait(container) is False
+    assert WaitForLog(r"ready on \d", times=2, timeout=1).probe(container) is True
+
+
+def test_a_strategy_must_define_its_probe():
+    class NoProbe(WaitStrategy):
+        pass
+
+    with pytest.raises(TypeError, match="probe"):
+        NoProbe()
+
+
+def test_wait_for_log_gives_up_when_the_output_stalls():
+    def _follow_logs(timeout):
+        yield "starting"
+        raise TimeoutError
+
+    container = _container(follow_logs=_follow_logs)
+
+    assert WaitForLog("ready", timeout=5).wait(container) is False
+
+
+def test_wait_for_log_streams_through_the_api(fake_docker_engine):
+    fake_docker_engine.add_container("svc")
+    fake_docker_engine.logs["svc"] = ["booting", "Ready to accept connections tcp"]
+    container = DockerContainer(
+        container_name="svc", image="redis:7", socket_path=fake_docker_engine.socket_path
+    )
+
+    assert list(container.follow_logs(timeout=1)) == fake_docker_engine.logs["svc"]
+    assert WaitForLog("Ready to accept connections", timeout=1).wait(container) is True
+
+
+def test_start_container_waits_for_every_strategy(monkeypatch, capsys):
+    waited = []
+
+    class Recording(WaitStrategy):
+        def __init__(self, name, ready):
+            super().__init__()
+            self.name, self.ready = name, ready
+
+        def probe(self, container):
+            return self.ready
+
+        def wait(self, container):
+            waited.append(self.name)
+            return self.ready
+
+    container = DockerContainer(
+        container_name="svc",
+        image="redis:7",
+        transport="cli",
+        wait_for=[Recording("first", True), Recording("second", False), Recording("third", True)],
+    )
+    monkeypatch.setattr(
+        container,
+        "get_state",
+        lambda refresh=False: ContainerState(name="svc", exists=True, running=True),
+    )
+    monkeypatch.setattr(container, "recreate_on_drift", False)
+
+    with pytest.raises(SystemExit):
+        container.start_container()
+
+    assert waited == ["first", "second"]
+    assert "svc is not ready" in capsys.readouterr().out
@@ -0,0 +1,23 @@
+from testing_containers import workers
+
+
+def test_names_are_unchanged_outside_xdist(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_WORKER", raising=False)
+    assert workers.worker_id() is None
+    assert workers.run_scoped_name("db") == "db"
+    assert workers.worker_scoped_name("db") == "db"
+
+
+def test_names_are_scoped_by_run_and_worker(monkeypatch):
+    monkeypatch.setenv("PYTEST_XDIST_WORKER", "gw0")
+    monkeypatch.setenv("PYTEST_XDIST_TESTRUNUID", "cafebabe00112233")
+    assert workers.worker_id() == "gw0"
+    assert workers.run_id() == "cafebabe00112233"
+    assert workers.run_scoped_name("db") == "db_cafebabe"
+    assert workers.worker_scoped_name("db") == "db_cafebabe_gw0"
+
+
+def test_run_id_falls_back_to_process_id(monkeypatch):
+    monkeypatch.delenv("PYTEST_XDIST_TESTRUNUID", raising=False)
+    assert workers.run_id() == workers.run_id()
+    assert len(workers.run_id()) == 32